@@ -17,12 +17,15 @@ import os
 import json
 
 from utils.database import Database
+from utils.db_executor import DbExecutor
 from utils.autocomplete import AutocompleteLineEdit
 from utils.jira_client import JiraClient
+from utils.issue_cache import IssueCache
+from utils.ticket_titles import refresh_due
 from ui.ticket_combo import TicketComboBox
 from ui.project_combo import ProjectComboBox
-from ui.config_dialog import ConfigDialog
-from ui.sync_dialog import SyncDialog
+from ui.config_dialog import ConfigDialog, TicketTitleRefreshThread
+from ui.sync_dialog import SyncDialog, OutboxDrainThread
 from ui.entry_dialog import EntryDialog
 from ui.entry_dialog_v2 import EntryDialogV2
 from ui.entries_dialog import EntriesDialog
@@ -42,6 +45,8 @@ class LogTrackerApp(QMainWindow):
         self.sync_dialog = None
         self.projects_dialog = None
         self.jira_client = None  # Sera initialisé lors de la configuration
+        self.outbox_thread = None
+        self.title_refresh_thread = None
         self.last_entry_time = None
         self.total_duration = 0
         
@@ -51,18 +56,29 @@ class LogTrackerApp(QMainWindow):
         self.load_config()
         self.setup_ui()
         self.setup_timer()
+        self.start_outbox_drain()
+        self.start_title_refresh()
         
         # Initialise last_entry_time avec la dernière entrée
+        self.load_last_entry_time()
+            
+        # Démarre la vérification des entrées
+        self.check_entry_status()
+
+    def load_last_entry_time(self):
+        """Met à jour last_entry_time avec la dernière entrée du jour, lue en arrière-plan."""
+        task = self.db.submit(self.db.get_entries_for_day, datetime.now().date())
+        task.finished.connect(self.on_last_entry_loaded)
+        task.failed.connect(lambda error: print(f"Erreur lors de l'initialisation de last_entry_time : {error}"))
+
+    def on_last_entry_loaded(self, entries):
+        """Enregistre l'heure de la dernière entrée du jour."""
         try:
-            entries = self.db.get_entries_for_day(datetime.now().date())
             if entries:
                 last_entry = entries[0]  # La première entrée est la plus récente
                 self.last_entry_time = datetime.strptime(f"{last_entry['date']} {last_entry['time']}", "%Y-%m-%d %H:%M")
         except Exception as e:
             print(f"Erreur lors de l'initialisation de last_entry_time : {str(e)}")
-            
-        # Démarre la vérification des entrées
-        self.check_entry_status()
 
     def load_config(self):
         """Charge la configuration."""
@@ -83,9 +99,33 @@ class LogTrackerApp(QMainWindow):
             self.jira_client = JiraClient(
                 base_url=jira_config['jira_base_url'],
                 email=jira_config['jira_email'],
-                token=jira_config['jira_token']
+                token=jira_config['jira_token'],
+                issue_cache=IssueCache.for_database(self.db)
             )
 
+    def start_outbox_drain(self):
+        """Démarre l'envoi en arrière-plan des worklogs restés dans la file."""
+        if not self.jira_client:
+            return
+        self.outbox_thread = OutboxDrainThread(self.jira_client)
+        self.outbox_thread.drained.connect(lambda count: self.update_summary())
+        QApplication.instance().aboutToQuit.connect(self.outbox_thread.stop)
+        self.outbox_thread.start()
+
+    def start_title_refresh(self):
+        """Rafraîchit en arrière-plan les titres des tickets (au plus une fois par jour)."""
+        if not self.jira_client or not refresh_due(self.db):
+            return
+        self.title_refresh_thread = TicketTitleRefreshThread(self.jira_client)
+        self.title_refresh_thread.finished.connect(self.on_title_refresh_finished)
+        QApplication.instance().aboutToQuit.connect(self.title_refresh_thread.wait)
+        self.title_refresh_thread.start()
+
+    def on_title_refresh_finished(self, success, message, checked, updated):
+        """Appelé quand le rafraîchissement des titres est terminé."""
+        if not success:
+            print(f"Erreur lors du rafraîchissement des titres des tickets : {message}")
+
     def load_svg_icon(self, filename):
         """Charge une icône SVG depuis le dossier resources."""
         try:
@@ -307,10 +347,19 @@ class LogTrackerApp(QMainWindow):
 
     def check_alerts(self):
         """Vérifie les alertes et met à jour l'interface en conséquence."""
+        # Le total du jour est lu en arrière-plan
+        task = self.db.submit(self.db.get_total_minutes_for_day, datetime.now().date().isoformat())
+        task.finished.connect(self.on_alert_totals_loaded)
+        task.failed.connect(self.on_alert_totals_failed)
+
+    def on_alert_totals_failed(self, error):
+        """Appelé si la lecture du total du jour a échoué."""
+        print(f"Erreur lors de la vérification des alertes : {error}")
+        self.check_entry_status()
+
+    def on_alert_totals_loaded(self, total_minutes):
+        """Applique les règles d'alerte une fois le total du jour connu."""
         try:
-            # Récupère le total des minutes pour aujourd'hui
-            total_minutes = self.db.get_total_minutes_for_day(datetime.now().date().isoformat())
-            
             # Met à jour le total
             self.total_duration = total_minutes
             
@@ -340,13 +389,18 @@ class LogTrackerApp(QMainWindow):
 
     def update_summary(self):
         """Met à jour le résumé des entrées."""
+        # Les totaux sont lus en arrière-plan, l'affichage est mis à jour à réception
+        task = self.db.submit(self.db.get_day_summary, datetime.now().date())
+        task.finished.connect(self.on_summary_loaded)
+        task.failed.connect(lambda error: print(f"Erreur lors de la mise à jour du résumé : {error}"))
+
+    def on_summary_loaded(self, summary):
+        """Affiche le résumé calculé par update_summary."""
         try:
-            # Récupère les entrées du jour
             today = datetime.now().date()
-            entries = self.db.get_entries_for_day(today)
             
-            # Calcule le temps total
-            total_minutes = sum(entry['duration'] or 0 for entry in entries)
+            # Temps total lu dans les agrégats journaliers
+            total_minutes = summary['total_minutes']
             hours = total_minutes // 60
             minutes = total_minutes % 60
             if hours > 0:
@@ -354,9 +408,8 @@ class LogTrackerApp(QMainWindow):
             else:
                 self.total_time_label.setText(f"{minutes}m")
             
-            # Calcule le temps non synchronisé
-            unsync_entries = self.db.get_unsynchronized_entries()
-            unsync_minutes = sum(entry['duration'] or 0 for entry in unsync_entries)
+            # Temps non synchronisé lu dans les agrégats journaliers
+            unsync_minutes = summary['unsynced_minutes']
             unsync_hours = unsync_minutes // 60
             unsync_mins = unsync_minutes % 60
             if unsync_hours > 0:
@@ -368,12 +421,8 @@ class LogTrackerApp(QMainWindow):
             start_time = datetime.strptime(self.db.get_setting('start_time', '08:30'), '%H:%M').time()
             next_slot = datetime.combine(today, start_time)
 
-            if entries:
-                # Trie les entrées par date et heure décroissantes pour avoir la plus récente en premier
-                sorted_entries = sorted(entries, key=lambda x: (x['date'], x['time']), reverse=True)
-                
-                # Prend la dernière entrée (la plus récente)
-                last_entry = sorted_entries[0]
+            last_entry = summary['last_entry']
+            if last_entry:
                 entry_time = datetime.strptime(f"{last_entry['date']} {last_entry['time']}", "%Y-%m-%d %H:%M")
                 
                 # Le prochain créneau est après la fin de la dernière entrée
@@ -426,9 +475,22 @@ class LogTrackerApp(QMainWindow):
             
     def check_entry_status(self):
         """Vérifie le temps écoulé depuis la dernière entrée et met à jour l'état d'alerte."""
+        task = self.db.submit(self.db.get_entries_for_day, datetime.now().date())
+        task.finished.connect(self.on_entry_status_loaded)
+        task.failed.connect(self.on_entry_status_failed)
+        
+        # Vérifie à nouveau dans 5 minutes
+        QTimer.singleShot(5 * 60 * 1000, self.check_entry_status)
+
+    def on_entry_status_failed(self, error):
+        """Appelé si la lecture des entrées du jour a échoué."""
+        print(f"Erreur lors de la vérification des entrées : {error}")
+        self.set_alert_state("normal")
+
+    def on_entry_status_loaded(self, entries):
+        """Met à jour l'état d'alerte à partir des entrées du jour."""
         try:
             now = datetime.now()
-            entries = self.db.get_entries_for_day(now.date())
             
             if not entries:
                 self.set_alert_state("danger")
@@ -463,9 +525,6 @@ class LogTrackerApp(QMainWindow):
             print(f"Erreur lors de la vérification des entrées : {str(e)}")
             self.set_alert_state("normal")
         
-        # Vérifie à nouveau dans 5 minutes
-        QTimer.singleShot(5 * 60 * 1000, self.check_entry_status)
-        
     def on_add_clicked(self):
         """Ouvre la fenêtre de saisie appropriée selon le paramètre."""
         entry_type = self.db.get_setting('entry_screen_type', 'time_only')
@@ -482,10 +541,7 @@ class LogTrackerApp(QMainWindow):
 
         if self.entry_dialog.exec() == QDialog.DialogCode.Accepted:
             # Met à jour last_entry_time avec la nouvelle entrée
-            entries = self.db.get_entries_for_day(datetime.now().date())
-            if entries:
-                last_entry = entries[0]  # La première entrée est la plus récente
-                self.last_entry_time = datetime.strptime(f"{last_entry['date']} {last_entry['time']}", "%Y-%m-%d %H:%M")
+            self.load_last_entry_time()
             self.update_summary()
             self.check_alerts()  # Force la vérification des alertes
 
@@ -594,6 +650,7 @@ class LogTrackerApp(QMainWindow):
 def main():
     """Point d'entrée de l'application."""
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(DbExecutor.shutdown_all)
     window = LogTrackerApp()
     window.show()
     sys.exit(app.exec())
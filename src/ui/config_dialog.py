@@ -13,17 +13,23 @@ import json
 from datetime import datetime
 from utils.database import Database
 from utils.jira_client import JiraClient
+from utils.jira_import import HierarchyImporter, MODE_ALL, MODE_PROJECTS, MODE_SUBTASKS
+from utils.worklog_sync import COALESCE_SETTING
+from utils.ticket_titles import refresh_ticket_titles
 from ui.theme import Theme
 import time
 
 class JiraImportThread(QThread):
     """Thread pour l'import des tickets Jira."""
     finished = pyqtSignal(bool, str, float, int)  # success, message, time, count
+    progress = pyqtSignal(int, int, int)  # tickets reçus, total attendu, lignes écrites
     
-    def __init__(self, jira_client, jql):
+    def __init__(self, jira_client, jql, mode=MODE_ALL, incremental=True):
         super().__init__()
         self.jira = jira_client
         self.jql = jql
+        self.mode = mode
+        self.incremental = incremental
         self.db = Database()
         
     def run(self):
@@ -31,62 +37,46 @@ class JiraImportThread(QThread):
         try:
             start_time = time.time()
             
-            # Récupère les tickets
-            issues = self.jira.get_issue_hierarchy(self.jql)
+            # Import en flux : les pages sont écrites au fur et à mesure
+            importer = HierarchyImporter(
+                self.jira, self.db, mode=self.mode,
+                progress=lambda fetched, total, written: self.progress.emit(fetched, total, written)
+            )
+            fetched, written = importer.run(self.jql, incremental=self.incremental)
             
-            if not issues:
+            if not fetched and importer.full:
                 self.finished.emit(False, "Aucun ticket trouvé avec ce JQL", 0, 0)
                 return
-                
-            # Dictionnaire pour stocker les chemins
-            paths = {}
-            
-            # Premier passage : construire le dictionnaire des tickets
-            tickets_dict = {issue['key']: issue for issue in issues}
             
-            # Deuxième passage : construire les chemins
-            for issue in issues:
-                if issue['type'].lower() == 'sub-task':
-                    continue
-                path = ConfigDialog.build_path(issue, tickets_dict)
-                if path:
-                    paths[issue['key']] = path
-                    
-            # Enregistre dans la base
-            try:
-                self.db.connect()
-                self.db.cursor.execute("DELETE FROM jira_paths")
-                self.db.cursor.execute("DELETE FROM jira_subtasks")
-                
-                # Insère les chemins
-                for issue in issues:
-                    if issue['type'].lower() != 'sub-task' and issue['key'] in paths:
-                        self.db.cursor.execute(
-                            "INSERT INTO jira_paths (path, ticket_key) VALUES (?, ?)",
-                            (paths[issue['key']], issue['key'])
-                        )
-                
-                # Insère les sous-tâches
-                for issue in issues:
-                    if issue['type'].lower() == 'sub-task' and issue['parent_key'] in paths:
-                        self.db.cursor.execute(
-                            "INSERT INTO jira_subtasks (path, title, ticket_key) VALUES (?, ?, ?)",
-                            (paths[issue['parent_key']], issue['title'], issue['key'])
-                        )
-                
-                self.db.conn.commit()
-                time_elapsed = time.time() - start_time
-                self.finished.emit(True, "Import terminé", time_elapsed, len(issues))
-                
-            except Exception as e:
-                if self.db.conn:
-                    self.db.conn.rollback()
-                self.finished.emit(False, str(e), 0, 0)
-            finally:
-                self.db.disconnect()
+            time_elapsed = time.time() - start_time
+            message = "Import complet terminé" if importer.full else "Import incrémental terminé"
+            self.finished.emit(True, message, time_elapsed, written)
                 
         except Exception as e:
             self.finished.emit(False, str(e), 0, 0)
+        finally:
+            # Libère la connexion propre à ce thread
+            self.db.close()
+
+class TicketTitleRefreshThread(QThread):
+    """Thread pour le rafraîchissement des titres des tickets."""
+    finished = pyqtSignal(bool, str, int, int)  # success, message, tickets vérifiés, titres mis à jour
+    
+    def __init__(self, jira_client):
+        super().__init__()
+        self.jira = jira_client
+        self.db = Database()
+        
+    def run(self):
+        """Exécute le rafraîchissement."""
+        try:
+            checked, updated = refresh_ticket_titles(self.jira, self.db)
+            self.finished.emit(True, "Titres des tickets rafraîchis", checked, updated)
+        except Exception as e:
+            self.finished.emit(False, str(e), 0, 0)
+        finally:
+            # Libère la connexion propre à ce thread
+            self.db.close()
 
 class ConfigDialog(QDialog):
     """Fenêtre de configuration pour les paramètres de l'application."""
@@ -191,6 +181,13 @@ class ConfigDialog(QDialog):
         project_jql_layout.addWidget(load_projects_button)
         jira_layout.addRow("JQL Projets:", project_jql_layout)
         
+        self.coalesce_worklogs = QCheckBox("Regrouper les entrées d'un même ticket et d'un même jour")
+        jira_layout.addRow(self.coalesce_worklogs)
+        
+        self.refresh_titles_button = QPushButton("Rafraîchir les titres des tickets")
+        self.refresh_titles_button.clicked.connect(self.refresh_ticket_titles)
+        jira_layout.addRow(self.refresh_titles_button)
+        
         
         
         jira_group.setLayout(jira_layout)
@@ -241,27 +238,35 @@ class ConfigDialog(QDialog):
         # JQL configuration
         self.ticket_jql.setText(self.db.get_setting('ticket_selection_jql', ''))
         self.project_jql.setText(self.db.get_setting('project_selection_jql', ''))
+        
+        coalesce = self.db.get_setting(COALESCE_SETTING, '0')
+        self.coalesce_worklogs.setChecked(coalesce == '1')
 
     def save_config(self):
         """Enregistre la configuration dans la base de données."""
         try:
-            # Paramètres généraux
-            self.db.save_setting('start_time', self.start_time.time().toString("HH:mm"))
-            self.db.save_setting('end_time', self.end_time.time().toString("HH:mm"))
-            self.db.save_setting('hours_per_day', self.hours_per_day.text())
-            self.db.save_setting('use_sequential_time', '1' if self.use_sequential_time.isChecked() else '0')
-            self.db.save_setting('time_increment', str(self.time_increment_combo.currentData()))
-            self.db.save_setting('theme', self.theme_combo.currentText())
-            self.db.save_setting('entry_screen_type', self.entry_type_combo.currentData())
-            
-            # Configuration Jira
-            self.db.save_setting('jira_base_url', self.jira_url.text())
-            self.db.save_setting('jira_token', self.jira_token.text())
-            self.db.save_setting('jira_email', self.jira_user.text())
-            
-            # JQL configuration
-            self.db.save_setting('ticket_selection_jql', self.ticket_jql.text())
-            self.db.save_setting('project_selection_jql', self.project_jql.text())
+            self.db.save_settings({
+                # Paramètres généraux
+                'start_time': self.start_time.time().toString("HH:mm"),
+                'end_time': self.end_time.time().toString("HH:mm"),
+                'hours_per_day': self.hours_per_day.text(),
+                'use_sequential_time': '1' if self.use_sequential_time.isChecked() else '0',
+                'time_increment': str(self.time_increment_combo.currentData()),
+                'theme': self.theme_combo.currentText(),
+                'entry_screen_type': self.entry_type_combo.currentData(),
+                
+                # Configuration Jira
+                'jira_base_url': self.jira_url.text(),
+                'jira_token': self.jira_token.text(),
+                'jira_email': self.jira_user.text(),
+                
+                # JQL configuration
+                'ticket_selection_jql': self.ticket_jql.text(),
+                'project_selection_jql': self.project_jql.text(),
+                
+                # Synchronisation
+                COALESCE_SETTING: '1' if self.coalesce_worklogs.isChecked() else '0',
+            })
             
             QMessageBox.information(self, "Succès", "Configuration enregistrée avec succès")
             self.accept()
@@ -269,251 +274,100 @@ class ConfigDialog(QDialog):
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Erreur lors de l'enregistrement : {str(e)}")
 
-    @staticmethod
-    def build_path(issue, tickets_dict):
-        """Construit le chemin projet/epic/fonctionnalité."""
-        if not issue:
-            return None
-            
-        path_parts = []
-        current_key = issue['key']
-        
-        # Remonter la hiérarchie pour construire le chemin
-        while current_key:
-            current = tickets_dict.get(current_key)
-            if not current:
-                break
-                
-            path_parts.insert(0, current['title'])
-            current_key = current['parent_key']
-        
-        # Si on n'a pas de chemin du tout
-        if not path_parts:
-            return None
-            
-        # Si c'est une fonctionnalité (ni projet, ni epic)
-        if issue['type'].lower() not in ['project', 'epic']:
-            if len(path_parts) >= 3:
-                return f"{path_parts[0]}/{path_parts[1]}/{path_parts[2]}"
-            elif len(path_parts) == 2:
-                return f"{path_parts[0]}/{path_parts[1]}/"
-            else:
-                return f"{path_parts[0]}//"
-                
-        # Si c'est un epic
-        elif issue['type'].lower() == 'epic':
-            if len(path_parts) >= 2:
-                return f"{path_parts[0]}/{path_parts[1]}//"
-            else:
-                return f"{path_parts[0]}//"
-                
-        # Si c'est un projet
-        else:  # project
-            return f"{path_parts[0]}//"
-
     def load_projects_hierarchy(self):
         """Charge la hiérarchie des projets depuis Jira."""
-        try:
-            if not self.check_jira_config():
-                return
-                
-            jql = self.project_jql.text()
-            if not jql:
-                QMessageBox.warning(self, "Attention", "Veuillez entrer un JQL pour les projets")
-                return
-                
-            # Crée une simple fenêtre d'attente
-            progress = QDialog(self)
-            progress.setWindowTitle("Import des projets")
-            progress.setFixedSize(300, 100)
-            progress.setWindowModality(Qt.WindowModality.ApplicationModal)
-            progress.setStyleSheet("""
-                QDialog {
-                    background-color: #2b2b2b;
-                }
-                QLabel {
-                    color: #ffffff;
-                    font-size: 12px;
-                    margin: 10px;
-                }
-            """)
-            
-            layout = QVBoxLayout(progress)
-            label = QLabel("Import des projets en cours...\nVeuillez patienter", progress)
-            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            layout.addWidget(label)
+        if not self.check_jira_config():
+            return
             
-            progress.show()
-            QApplication.processEvents()
-            time.sleep(0.5)
-            
-            try:
-                start_time = time.time()
-                
-                # Initialise le client Jira
-                jira = JiraClient(self.jira_url.text(), self.jira_token.text(), self.jira_user.text())
-                
-                # Récupère les projets
-                issues = jira.get_issue_hierarchy(jql)
-                
-                if not issues:
-                    progress.close()
-                    QMessageBox.warning(self, "Aucun résultat", "Aucun projet trouvé avec ce JQL")
-                    return
-                    
-                # Dictionnaire pour stocker les chemins
-                paths = {}
-                
-                # Construit les chemins des projets
-                tickets_dict = {issue['key']: issue for issue in issues}
-                for issue in issues:
-                    path = ConfigDialog.build_path(issue, tickets_dict)
-                    if path:
-                        paths[issue['key']] = path
-                        
-                # Enregistre dans la base
-                self.db.connect()
-                self.db.cursor.execute("DELETE FROM jira_paths")
-                
-                # Insère uniquement les chemins de projets
-                for issue in issues:
-                    if issue['key'] in paths:
-                        self.db.cursor.execute(
-                            "INSERT INTO jira_paths (path, ticket_key) VALUES (?, ?)",
-                            (paths[issue['key']], issue['key'])
-                        )
-                
-                self.db.conn.commit()
-                time_elapsed = time.time() - start_time
-                
-                progress.close()
-                QMessageBox.information(self, "Succès", 
-                    f"{len(paths)} projets chargés avec succès\nTemps écoulé : {time_elapsed:.1f}s")
-                
-            except Exception as e:
-                progress.close()
-                if self.db.conn:
-                    self.db.conn.rollback()
-                QMessageBox.critical(self, "Erreur", f"Échec du chargement des projets : {str(e)}")
-            finally:
-                self.db.disconnect()
-                
-        except Exception as e:
-            if 'progress' in locals():
-                progress.close()
-            QMessageBox.critical(self, "Erreur", f"Échec du chargement des projets : {str(e)}")
+        jql = self.project_jql.text()
+        if not jql:
+            QMessageBox.warning(self, "Attention", "Veuillez entrer un JQL pour les projets")
+            return
+        
+        self.start_import(jql, MODE_PROJECTS, "Import des projets", "projets")
             
     def load_tickets_hierarchy(self):
         """Charge la hiérarchie des tickets depuis Jira."""
+        if not self.check_jira_config():
+            return
+            
+        jql = self.ticket_jql.text()
+        if not jql:
+            QMessageBox.warning(self, "Attention", "Veuillez entrer un JQL pour les tickets")
+            return
+        
+        self.start_import(jql, MODE_SUBTASKS, "Import des tickets", "sous-tâches")
+
+    def start_import(self, jql, mode, title, item_label):
+        """Lance un import Jira en arrière-plan avec une fenêtre de progression.
+        
+        Args:
+            jql: Requête JQL
+            mode: Mode d'import (voir utils.jira_import)
+            title: Titre de la fenêtre de progression
+            item_label: Nom des éléments importés, pour le message final
+        """
         try:
-            if not self.check_jira_config():
-                return
-                
-            jql = self.ticket_jql.text()
-            if not jql:
-                QMessageBox.warning(self, "Attention", "Veuillez entrer un JQL pour les tickets")
-                return
-                
-            # Crée une simple fenêtre d'attente
-            progress = QDialog(self)
-            progress.setWindowTitle("Import des tickets")
-            progress.setFixedSize(300, 100)
-            progress.setWindowModality(Qt.WindowModality.ApplicationModal)
-            progress.setStyleSheet("""
-                QDialog {
-                    background-color: #2b2b2b;
-                }
-                QLabel {
-                    color: #ffffff;
-                    font-size: 12px;
-                    margin: 10px;
-                }
-            """)
+            # Initialise le client Jira
+            jira = JiraClient(self.jira_url.text(), self.jira_token.text(), self.jira_user.text())
             
-            layout = QVBoxLayout(progress)
-            label = QLabel("Import des tickets en cours...\nVeuillez patienter", progress)
-            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            layout.addWidget(label)
+            # Fenêtre de progression (pas d'annulation : l'import écrit par lots)
+            self.import_progress = QProgressDialog(f"{title} en cours...\nVeuillez patienter", None, 0, 0, self)
+            self.import_progress.setWindowTitle(title)
+            self.import_progress.setWindowModality(Qt.WindowModality.ApplicationModal)
+            self.import_progress.setMinimumDuration(0)
+            self.import_progress.show()
             
-            progress.show()
-            QApplication.processEvents()
-            time.sleep(0.5)
+            self.import_item_label = item_label
+            self.import_thread = JiraImportThread(jira, jql, mode)
+            self.import_thread.progress.connect(self.on_import_progress)
+            self.import_thread.finished.connect(self.on_import_finished)
+            self.import_thread.start()
             
-            try:
-                start_time = time.time()
-                
-                # Initialise le client Jira
-                jira = JiraClient(self.jira_url.text(), self.jira_token.text(), self.jira_user.text())
-                
-                # Récupère les tickets
-                issues = jira.get_issue_hierarchy(jql)
-                
-                if not issues:
-                    progress.close()
-                    QMessageBox.warning(self, "Aucun résultat", "Aucun ticket trouvé avec ce JQL")
-                    return
-                    
-                # Dictionnaire pour stocker les chemins des parents
-                parent_paths = {}
-                subtasks_count = 0
-                
-                # Récupère d'abord tous les chemins existants de la table jira_paths
-                self.db.connect()
-                self.db.cursor.execute("SELECT path, ticket_key FROM jira_paths")
-                for row in self.db.cursor.fetchall():
-                    parent_paths[row[1]] = row[0]
-                
-                # Nettoie la table des sous-tâches
-                self.db.cursor.execute("DELETE FROM jira_subtasks")
-                
-                # Insère uniquement les sous-tâches
-                for issue in issues:
-                    # Vérifie si c'est une sous-tâche et si son parent existe
-                    if issue['type'].lower() in ['sous-tâche', 'sub-task'] and issue.get('parent_key'):
-                        parent_key = issue['parent_key']
-                        if parent_key in parent_paths:
-                            self.db.cursor.execute(
-                                "INSERT INTO jira_subtasks (path, title, ticket_key) VALUES (?, ?, ?)",
-                                (parent_paths[parent_key], issue['title'], issue['key'])
-                            )
-                            subtasks_count += 1
-                
-                self.db.conn.commit()
-                time_elapsed = time.time() - start_time
-                
-                progress.close()
-                QMessageBox.information(self, "Succès", 
-                    f"{subtasks_count} sous-tâches chargées avec succès\nTemps écoulé : {time_elapsed:.1f}s")
-                
-            except Exception as e:
-                progress.close()
-                if self.db.conn:
-                    self.db.conn.rollback()
-                QMessageBox.critical(self, "Erreur", f"Échec du chargement des tickets : {str(e)}")
-            finally:
-                self.db.disconnect()
-                
         except Exception as e:
-            if 'progress' in locals():
-                progress.close()
-            QMessageBox.critical(self, "Erreur", f"Échec du chargement des tickets : {str(e)}")
+            QMessageBox.critical(self, "Erreur", f"Échec du chargement des {item_label} : {str(e)}")
 
-    def get_issue_project(self, issue, tickets_dict):
-        """Récupère le projet d'un ticket en remontant la hiérarchie."""
-        current = issue
-        while current and current.get('parent_key'):
-            parent_key = current['parent_key']
-            current = tickets_dict.get(parent_key)
-        return current if current else issue
+    def on_import_progress(self, fetched, total, written):
+        """Met à jour la fenêtre de progression de l'import."""
+        self.import_progress.setMaximum(total)
+        self.import_progress.setValue(min(fetched, total))
+        self.import_progress.setLabelText(
+            f"{fetched} / {total} tickets reçus\n{self.import_item_label.capitalize()} en base : {written}"
+        )
 
     def on_import_finished(self, success, message, time_elapsed, count):
         """Appelé quand l'import est terminé."""
+        if getattr(self, 'import_progress', None):
+            self.import_progress.close()
+        item_label = getattr(self, 'import_item_label', "éléments")
         if success:
             QMessageBox.information(self, "Succès", 
-                f"{count} éléments chargés avec succès\nTemps écoulé : {time_elapsed:.1f}s")
+                f"{message} : {count} {item_label}\nTemps écoulé : {time_elapsed:.1f}s")
         else:
             QMessageBox.warning(self, "Erreur", f"Échec du chargement : {message}")
 
+    def refresh_ticket_titles(self):
+        """Rafraîchit en arrière-plan le titre des tickets actifs depuis Jira."""
+        if not self.check_jira_config():
+            return
+        
+        jira = JiraClient(self.jira_url.text(), self.jira_token.text(), self.jira_user.text())
+        self.refresh_titles_button.setEnabled(False)
+        self.refresh_titles_button.setText("Rafraîchissement en cours...")
+        self.refresh_thread = TicketTitleRefreshThread(jira)
+        self.refresh_thread.finished.connect(self.on_refresh_titles_finished)
+        self.refresh_thread.start()
+
+    def on_refresh_titles_finished(self, success, message, checked, updated):
+        """Appelé quand le rafraîchissement des titres est terminé."""
+        self.refresh_titles_button.setEnabled(True)
+        self.refresh_titles_button.setText("Rafraîchir les titres des tickets")
+        if success:
+            QMessageBox.information(self, "Succès",
+                f"{message} : {updated} titre(s) mis à jour sur {checked} ticket(s)")
+        else:
+            QMessageBox.warning(self, "Erreur", f"Échec du rafraîchissement : {message}")
+
     def check_jira_config(self):
         """Vérifie que la configuration Jira est complète."""
         if not self.jira_url.text() or not self.jira_token.text() or not self.jira_user.text():
@@ -59,13 +59,24 @@ class CreateTicketDialog(QDialog):
         self.setLayout(layout)
     
     def load_paths(self):
-        """Charge les chemins depuis jira_paths."""
-        try:
-            paths = self.db.get_jira_paths()
-            self.parent_combo.set_tickets(paths)
-            
-        except Exception as e:
-            QMessageBox.warning(self, "Erreur", f"Erreur lors du chargement des chemins : {str(e)}")
+        """Charge les tickets parents et leur chemin depuis jira_issues, en arrière-plan."""
+        task = self.db.submit(self.db.get_parent_tickets)
+        task.finished.connect(self.on_parent_tickets_loaded)
+        task.failed.connect(self.on_paths_failed)
+    
+    def on_parent_tickets_loaded(self, paths):
+        """Affiche les tickets parents chargés par load_paths."""
+        if not paths:
+            # Hiérarchie pas encore importée dans jira_issues
+            task = self.db.submit(self.db.get_jira_paths)
+            task.finished.connect(self.parent_combo.set_tickets)
+            task.failed.connect(self.on_paths_failed)
+            return
+        self.parent_combo.set_tickets(paths)
+    
+    def on_paths_failed(self, error):
+        """Appelé si la lecture des chemins a échoué."""
+        QMessageBox.warning(self, "Erreur", f"Erreur lors du chargement des chemins : {error}")
     
     def create_ticket(self):
         """Crée le ticket dans Jira."""
@@ -99,6 +99,22 @@ class EntriesDialog(QDialog):
         remaining_minutes = minutes % 60
         return f"{hours:02d}h{remaining_minutes:02d}"
 
+    def add_entry_item(self, parent_item, entry):
+        """Ajoute une ligne d'entrée sous un élément de l'arbre."""
+        entry_item = QTreeWidgetItem(parent_item)
+        entry_item.setText(0, entry.get('project_name') or '')
+        entry_item.setText(1, entry.get('ticket_number') or '')
+        entry_item.setText(2, self.minutes_to_hhmm(entry.get('duration', 0)))
+        entry_item.setText(3, entry.get('ticket_title') or '')
+        entry_item.setText(4, entry.get('description') or '')
+        entry_item.setText(5, entry.get('todo') or '')
+        entry_item.setText(6, entry.get('date') or '')
+        entry_item.setText(7, entry.get('time') or '')
+
+        for col in range(8):
+            entry_item.setTextAlignment(col, Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
+        return entry_item
+
     def update_entries_view(self):
         """Met à jour l'affichage des entrées."""
         self.tree.clear()
@@ -114,57 +130,25 @@ class EntriesDialog(QDialog):
 
         try:
             if self.period_day.isChecked():
-                # Vue journée groupée par projet
-                entries = self.db.get_entries_by_date_range(start_date, end_date)
-                if not entries:
-                    return
-
-                # Organise les entrées par projet
-                entries_by_project = {}
-                for entry in entries:
-                    project = entry.get('project_name', 'Sans projet')
-                    if project not in entries_by_project:
-                        entries_by_project[project] = []
-                    entries_by_project[project].append(entry)
-
-                # Crée les éléments de l'arbre
-                for project, project_entries in entries_by_project.items():
-                    project_item = QTreeWidgetItem(self.tree)
-                    project_item.setText(0, project)
-                    total_duration = sum(entry.get('duration', 0) for entry in project_entries)
+                # Vue journée groupée par projet, construite au fil de la lecture
+                project_items = {}
+                for entry in self.db.iter_entries({'start_date': start_date, 'end_date': end_date}):
+                    project = entry['project_name'] or 'Sans projet'
+                    if project not in project_items:
+                        project_item = QTreeWidgetItem(self.tree)
+                        project_item.setText(0, project)
+                        project_items[project] = [project_item, 0]
+                    project_items[project][1] += entry.get('duration', 0)
+                    self.add_entry_item(project_items[project][0], entry)
+
+                # Totaux par projet
+                for project_item, total_duration in project_items.values():
                     project_item.setText(2, self.minutes_to_hhmm(total_duration))
 
-                    for entry in project_entries:
-                        entry_item = QTreeWidgetItem(project_item)
-                        entry_item.setText(0, entry.get('project_name', ''))
-                        entry_item.setText(1, entry.get('ticket_number', ''))
-                        entry_item.setText(2, self.minutes_to_hhmm(entry.get('duration', 0)))
-                        entry_item.setText(3, entry.get('ticket_title', ''))
-                        entry_item.setText(4, entry.get('description', ''))
-                        entry_item.setText(5, entry.get('todo', ''))
-                        entry_item.setText(6, entry.get('date', ''))
-                        entry_item.setText(7, entry.get('time', ''))
-
-                        for col in range(8):
-                            entry_item.setTextAlignment(col, Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
-
                 self.tree.expandAll()
 
             elif self.view_by_day.isChecked():
-                # Vue sur 8 jours chronologique
-                entries = self.db.get_entries_by_date_range(start_date, end_date)
-                if not entries:
-                    return
-
-                # Organise les entrées par date
-                entries_by_date = {}
-                for entry in entries:
-                    entry_timestamp = datetime.strptime(f"{entry.get('date', '')} {entry.get('time', '')}", "%Y-%m-%d %H:%M")
-                    entry_date = entry_timestamp.date()
-                    if entry_date not in entries_by_date:
-                        entries_by_date[entry_date] = []
-                    entries_by_date[entry_date].append(entry)
-
+                # Vue sur 8 jours chronologique ; les entrées arrivent triées par date décroissante
                 # Noms des jours en français
                 jours = {
                     0: 'Lundi',
@@ -176,30 +160,22 @@ class EntriesDialog(QDialog):
                     6: 'Dimanche'
                 }
 
-                # Crée les éléments de l'arbre
-                for date in sorted(entries_by_date.keys(), reverse=True):
-                    date_entries = entries_by_date[date]
-                    jour = jours[date.weekday()]
-                    date_item = QTreeWidgetItem(self.tree)
-                    date_item.setText(0, f"{jour} {date.strftime('%d/%m/%Y')}")
-                    total_duration = sum(entry.get('duration', 0) for entry in date_entries)
+                date_items = []
+                current_date = None
+                for entry in self.db.iter_entries({'start_date': start_date, 'end_date': end_date}):
+                    entry_date = datetime.strptime(entry['date'], "%Y-%m-%d").date()
+                    if entry_date != current_date:
+                        current_date = entry_date
+                        date_item = QTreeWidgetItem(self.tree)
+                        date_item.setText(0, f"{jours[entry_date.weekday()]} {entry_date.strftime('%d/%m/%Y')}")
+                        date_items.append([date_item, 0])
+                    date_items[-1][1] += entry.get('duration', 0)
+                    self.add_entry_item(date_items[-1][0], entry)
+
+                # Totaux par jour
+                for date_item, total_duration in date_items:
                     date_item.setText(2, self.minutes_to_hhmm(total_duration))
 
-                    for entry in date_entries:
-                        entry_timestamp = datetime.strptime(f"{entry.get('date', '')} {entry.get('time', '')}", "%Y-%m-%d %H:%M")
-                        entry_item = QTreeWidgetItem(date_item)
-                        entry_item.setText(0, entry.get('project_name', ''))
-                        entry_item.setText(1, entry.get('ticket_number', ''))
-                        entry_item.setText(2, self.minutes_to_hhmm(entry.get('duration', 0)))
-                        entry_item.setText(3, entry.get('ticket_title', ''))
-                        entry_item.setText(4, entry.get('description', ''))
-                        entry_item.setText(5, entry.get('todo', ''))
-                        entry_item.setText(6, entry.get('date', ''))
-                        entry_item.setText(7, entry.get('time', ''))
-
-                        for col in range(8):
-                            entry_item.setTextAlignment(col, Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
-
                 self.tree.expandAll()
 
             else:  # Vue par projet sur 8 jours
@@ -29,6 +29,8 @@ class EntryDialog(QDialog):
         super().__init__(parent)
         self.db = db
         self.jira_client = None
+        self.title_task = None  # Requête Jira du titre en file ou en cours
+        self.saving = False  # Enregistrement en cours dans le thread de la base
         self.setup_jira_client()
         self.setWindowFlags(self.windowFlags() | Qt.WindowType.WindowStaysOnTopHint)
         self.setup_ui()
@@ -51,25 +53,32 @@ class EntryDialog(QDialog):
             
             if base_url and token and email:
                 from utils.jira_client import JiraClient
-                self.jira_client = JiraClient(base_url, token, email)
+                from utils.issue_cache import IssueCache
+                self.jira_client = JiraClient(base_url, token, email,
+                                              issue_cache=IssueCache.for_database(self.db))
         except Exception as e:
             pass
 
-    def update_remaining_time(self, info_button):
+    def update_remaining_time(self):
         """Met à jour le tooltip avec le temps restant à saisir."""
+        # Récupère la date sélectionnée
+        selected_date = self.date_input.date().toString('yyyy-MM-dd')
+        
+        # Le temps déjà saisi est lu en arrière-plan. Les slots sont des
+        # méthodes du dialogue : PyQt les déconnecte s'il est détruit avant
+        # la réponse
+        task = self.db.submit(self.db.get_total_minutes_for_day, selected_date)
+        task.finished.connect(self.on_used_minutes_loaded)
+        task.failed.connect(self.on_used_minutes_failed)
+
+    def on_used_minutes_loaded(self, used_minutes):
+        """Affiche le temps restant une fois le temps saisi du jour connu."""
         try:
             # Récupère le nombre d'heures par jour depuis les paramètres
             daily_hours = int(self.db.get_setting('daily_hours', '8'))
-            total_minutes = daily_hours * 60
-            
-            # Récupère la date sélectionnée
-            selected_date = self.date_input.date().toString('yyyy-MM-dd')
-            
-            # Calcule le temps déjà saisi
-            used_minutes = self.db.get_total_minutes_for_day(selected_date)
             
             # Calcule le temps restant
-            remaining_minutes = total_minutes - used_minutes
+            remaining_minutes = daily_hours * 60 - used_minutes
             
             # Formate le message
             if remaining_minutes > 0:
@@ -79,10 +88,14 @@ class EntryDialog(QDialog):
                 message = f"Dépassement du temps journalier de {surplus} minutes"
             
             # Met à jour le tooltip
-            info_button.setToolTip(message)
+            self.info_button.setToolTip(message)
             
         except Exception as e:
-            info_button.setToolTip(f"Erreur lors du calcul du temps restant : {str(e)}")
+            self.on_used_minutes_failed(str(e))
+
+    def on_used_minutes_failed(self, error):
+        """Signale l'échec du calcul du temps restant."""
+        self.info_button.setToolTip(f"Erreur lors du calcul du temps restant : {error}")
 
     def setup_ui(self):
         """Configure l'interface utilisateur."""
@@ -102,11 +115,7 @@ class EntryDialog(QDialog):
         self.date_input.setDate(QDate.currentDate())
         
         self.time_input = TimeSelector()
-        if self.db.get_setting('use_sequential_time', '0') == '1':
-            sequential_time = self.db.get_sequential_time(self.date_input.date().toString("yyyy-MM-dd"))
-            self.time_input.setTime(sequential_time)
-        else:
-            self.time_input.setTime(QTime.currentTime())
+        self.time_input.setTime(QTime.currentTime())
         
         date_time_layout.addWidget(self.date_input)
         date_time_layout.addWidget(self.time_input)
@@ -154,10 +163,10 @@ class EntryDialog(QDialog):
         duration_top_layout.addWidget(self.duration_input)
 
         # Icône d'information pour le temps restant
-        info_button = QToolButton()
-        info_button.setIcon(QIcon("src/resources/info.svg"))
-        info_button.setToolTip("Chargement...")
-        duration_top_layout.addWidget(info_button)
+        self.info_button = QToolButton()
+        self.info_button.setIcon(QIcon("src/resources/info.svg"))
+        self.info_button.setToolTip("Chargement...")
+        duration_top_layout.addWidget(self.info_button)
         duration_top_layout.addStretch()
         
         # Créer un label temporaire pour mesurer la largeur
@@ -194,37 +203,42 @@ class EntryDialog(QDialog):
         form_layout.addRow(duration_label_container, slider_container)
         
         # Mise à jour du tooltip quand la date change
-        self.date_input.dateChanged.connect(lambda: self.update_remaining_time(info_button))
+        self.date_input.dateChanged.connect(self.update_remaining_time)
         
         # Mise à jour initiale du tooltip
-        QTimer.singleShot(0, lambda: self.update_remaining_time(info_button))
+        QTimer.singleShot(0, self.update_remaining_time)
         
         main_layout.addLayout(form_layout)
 
         # Boutons
         buttons_layout = QHBoxLayout()
-        save_button = QPushButton("Sauvegarder")
-        save_button.clicked.connect(self.accept)
+        self.save_button = QPushButton("Sauvegarder")
+        self.save_button.clicked.connect(self.accept)
         cancel_button = QPushButton("Annuler")
         cancel_button.clicked.connect(self.reject)
         clear_button = QPushButton("Effacer")
         clear_button.clicked.connect(self.clear_all)
-        buttons_layout.addWidget(save_button)
+        buttons_layout.addWidget(self.save_button)
         buttons_layout.addWidget(cancel_button)
         buttons_layout.addWidget(clear_button)
 
         main_layout.addLayout(buttons_layout)
         self.setLayout(main_layout)
 
+    def load_start_time(self):
+        """Positionne l'heure de début, calculée en arrière-plan en mode séquentiel."""
+        self.time_input.setTime(QTime.currentTime())
+        if self.db.get_setting('use_sequential_time', '0') != '1':
+            return
+        task = self.db.submit(self.db.get_sequential_time, self.date_input.date().toString("yyyy-MM-dd"))
+        task.finished.connect(self.time_input.setTime)
+        task.failed.connect(lambda error: print(f"Erreur lors du calcul de l'heure séquentielle : {error}"))
+
     def clear_all(self, init=False):
         """Efface tous les champs."""
         # Remet la date et l'heure actuelles
         self.date_input.setDate(QDate.currentDate())
-        if self.db.get_setting('use_sequential_time', '0') == '1':
-            sequential_time = self.db.get_sequential_time(self.date_input.date().toString("yyyy-MM-dd"))
-            self.time_input.setTime(sequential_time)
-        else:
-            self.time_input.setTime(QTime.currentTime())
+        self.load_start_time()
         
         # Efface les autres champs
         self.project_input.clear()
@@ -243,11 +257,9 @@ class EntryDialog(QDialog):
 
     def setup_suggestions(self):
         """Initialise les suggestions pour les projets."""
-        try:
-            projects = self.db.get_project_suggestions()
-            self.project_input.set_projects(projects)
-        except Exception as e:
-            print(f"Erreur lors de l'initialisation des suggestions : {str(e)}")
+        task = self.db.submit(self.db.get_project_suggestions)
+        task.finished.connect(self.project_input.set_projects)
+        task.failed.connect(lambda error: print(f"Erreur lors de l'initialisation des suggestions : {error}"))
 
     def on_project_changed(self, project_name):
         """Appelé lorsque le projet sélectionné change."""
@@ -255,13 +267,21 @@ class EntryDialog(QDialog):
             self.ticket_input.set_tickets([])
             return
 
-        # Récupère l'ID du projet
-        project = self.db.get_project_by_name(project_name)
-        if not project:
+        # Récupère les tickets du projet en arrière-plan
+        task = self.db.submit(self.db.get_tickets_for_project_name, project_name)
+        task.finished.connect(lambda tickets, name=project_name: self.on_project_tickets_loaded(name, tickets))
+        task.failed.connect(lambda error: print(f"Erreur lors du chargement des tickets : {error}"))
+
+    def on_project_tickets_loaded(self, project_name, tickets):
+        """Met à jour la liste des tickets une fois chargée."""
+        # Ignore le résultat si le projet a changé entre-temps
+        if project_name != self.project_input.text():
+            return
+
+        # Projet inconnu
+        if tickets is None:
             return
 
-        # Récupère les tickets du projet
-        tickets = self.db.get_project_tickets(project['id'])
         if tickets:
             # Met à jour la liste des tickets
             self.ticket_input.set_tickets(tickets)
@@ -291,13 +311,19 @@ class EntryDialog(QDialog):
         if not project_name:
             return
 
-        # Récupère l'ID du projet
-        project = self.db.get_project_by_name(project_name)
-        if not project:
+        # Récupère les informations du ticket en arrière-plan
+        task = self.db.submit(self.db.get_ticket_info_for_project_name, project_name, ticket_text)
+        task.finished.connect(
+            lambda ticket_info, name=project_name, text=ticket_text:
+            self.on_ticket_info_loaded(name, text, ticket_info))
+        task.failed.connect(lambda error: print(f"Erreur lors du chargement du ticket : {error}"))
+
+    def on_ticket_info_loaded(self, project_name, ticket_text, ticket_info):
+        """Affiche le titre stocké du ticket une fois chargé."""
+        # Ignore le résultat si la saisie a changé entre-temps
+        if project_name != self.project_input.text() or ticket_text != self.ticket_input.text():
             return
 
-        # Récupère les informations du ticket
-        ticket_info = self.db.get_ticket_info(project['id'], ticket_text)
         if ticket_info:
             # Si le ticket existe, on utilise son titre stocké
             if ticket_info[2]:  # ticket_info[2] est le titre
@@ -308,27 +334,39 @@ class EntryDialog(QDialog):
             pass
 
     def fetch_ticket_title_from_jira(self, ticket_number):
-        """Récupère le titre du ticket depuis Jira"""
+        """Récupère le titre du ticket depuis Jira, en arrière-plan.
+
+        L'appel Jira et le cache des tickets s'exécutent dans le thread de la
+        base : l'interface reste réactive si Jira tarde à répondre.
+        """
         if not self.jira_client:
             return
 
-        try:
-            issue = self.jira_client.get_issue_details(ticket_number)
-            if issue and issue.get('summary'):
-                self.ticket_title.setText(issue['summary'])
-                
-                # Sauvegarde le titre dans la base de données
-                project_name = self.project_input.text()
-                if project_name:
-                    project = self.db.get_project_by_name(project_name)
-                    if project:
-                        ticket_info = self.db.get_ticket_info(project['id'], ticket_number)
-                        if ticket_info:
-                            self.db.update_ticket_title(ticket_info[0], issue['summary'])
-                        else:
-                            self.db.add_ticket(project['id'], ticket_number, issue['summary'])
-        except Exception as e:
-            print(f"Erreur lors de la récupération du titre du ticket {ticket_number}: {str(e)}")
+        # Une seule requête à la fois : la précédente n'a plus d'intérêt
+        if self.title_task:
+            self.title_task.cancel()
+        task = self.db.submit(self.jira_client.get_issue_details, ticket_number)
+        # Méthode du dialogue : déconnectée par PyQt s'il est fermé avant la réponse
+        task.finished.connect(self.on_jira_title_loaded)
+        task.failed.connect(
+            lambda error, number=ticket_number:
+            print(f"Erreur lors de la récupération du titre du ticket {number}: {error}"))
+        self.title_task = task
+
+    def on_jira_title_loaded(self, issue):
+        """Affiche et enregistre le titre reçu de Jira."""
+        self.title_task = None
+        # Ignore le résultat si le ticket a changé entre-temps
+        if not issue or issue['key'] != self.ticket_input.text() or not issue.get('summary'):
+            return
+
+        self.ticket_title.setText(issue['summary'])
+
+        # Sauvegarde le titre dans la base de données, en arrière-plan
+        project_name = self.project_input.text()
+        if project_name:
+            task = self.db.submit(self.db.save_ticket_title, project_name, issue['key'], issue['summary'])
+            task.failed.connect(lambda error: print(f"Erreur lors de l'enregistrement du titre : {error}"))
 
     def on_title_focus(self, event):
         """Appelé lorsque le champ titre reçoit le focus."""
@@ -357,48 +395,32 @@ class EntryDialog(QDialog):
             QMessageBox.warning(self, "Erreur", "Le projet est obligatoire.")
             return
 
-        try:
-            # Récupère ou crée le projet
-            project = self.db.get_project_by_name(project_name)
-            if project_name and not project:
-                project_id = self.db.add_project(project_name)
-            else:
-                project_id = project['id'] if project else None
-
-            # Récupère ou crée le ticket
-            ticket_id = None
-            if project_id and ticket_number:
-                # Vérifie si le ticket existe déjà dans le projet
-                existing_tickets = self.db.get_project_tickets(project_id, include_inactive=True)
-                ticket_exists = any(t['ticket_number'] == ticket_number for t in existing_tickets)
-                
-                if not ticket_exists:
-                    # Nouveau ticket, on le crée
-                    ticket_id = self.db.add_ticket(project_id, ticket_number, ticket_title)
-                else:
-                    # Le ticket existe déjà, on récupère ses infos
-                    ticket_info = self.db.get_ticket_info(project_id, ticket_number)
-                    if ticket_info:
-                        ticket_id = ticket_info[0]
-                        # Met à jour le titre si nécessaire
-                        if ticket_title != ticket_info[2]:
-                            self.db.update_ticket_title(ticket_id, ticket_title)
-
-            # Ajoute l'entrée
-            self.db.add_entry(
-                description=description,
-                project_id=project_id,
-                ticket_id=ticket_id,
-                ticket_title=ticket_title,
-                duration=duration,
-                date=date,
-                time=time
-            )
-
-            super().accept()
+        # Un enregistrement est déjà en cours (double validation)
+        if self.saving:
+            return
 
-        except Exception as e:
-            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'enregistrement : {str(e)}")
+        # Projet, ticket et entrée sont enregistrés en arrière-plan ; la fenêtre
+        # se ferme à la fin de l'enregistrement
+        self.saving = True
+        self.save_button.setEnabled(False)
+        task = self.db.submit(
+            self.db.save_entry, project_name, ticket_number, ticket_title,
+            description, duration, date, time
+        )
+        task.finished.connect(self.on_entry_saved)
+        task.failed.connect(self.on_entry_save_failed)
+
+    def on_entry_saved(self, entry_id):
+        """Ferme la fenêtre une fois l'entrée enregistrée."""
+        self.saving = False
+        self.save_button.setEnabled(True)
+        super().accept()
+
+    def on_entry_save_failed(self, error):
+        """Affiche l'erreur d'enregistrement et laisse la saisie en place."""
+        self.saving = False
+        self.save_button.setEnabled(True)
+        QMessageBox.critical(self, "Erreur", f"Erreur lors de l'enregistrement : {error}")
 
     def _open_ticket_search(self):
         """Ouvre la fenêtre de recherche de tickets."""
@@ -39,6 +39,7 @@ class EntryDialogV2(QDialog):
         self.db = db
         self.theme = theme
         self.jira_client = None
+        self.title_task = None  # Requête Jira du titre en file ou en cours
         self.setup_jira_client()
         self.total_duration = 0
         self.setWindowFlags(self.windowFlags() | Qt.WindowType.WindowStaysOnTopHint)
@@ -57,7 +58,9 @@ class EntryDialogV2(QDialog):
             
             if base_url and token and email:
                 from utils.jira_client import JiraClient
-                self.jira_client = JiraClient(base_url, token, email)
+                from utils.issue_cache import IssueCache
+                self.jira_client = JiraClient(base_url, token, email,
+                                              issue_cache=IssueCache.for_database(self.db))
         except Exception as e:
             pass
 
@@ -117,11 +120,12 @@ class EntryDialogV2(QDialog):
         self.date_input.setFixedHeight(25)
         
         self.time_input = QTimeEdit()
+        self.time_input.setTime(QTime.currentTime())
         if self.db and self.db.get_setting('use_sequential_time', '0') == '1':
-            sequential_time = self.db.get_sequential_time(self.date_input.date().toString("yyyy-MM-dd"))
-            self.time_input.setTime(QTime.fromString(sequential_time, "HH:mm"))
-        else:
-            self.time_input.setTime(QTime.currentTime())
+            # L'heure séquentielle est calculée en arrière-plan
+            task = self.db.submit(self.db.get_sequential_time, self.date_input.date().toString("yyyy-MM-dd"))
+            task.finished.connect(lambda sequential_time: self.time_input.setTime(QTime.fromString(sequential_time, "HH:mm")))
+            task.failed.connect(lambda error: print(f"Erreur lors du calcul de l'heure séquentielle : {error}"))
         self.time_input.setDisplayFormat("HH:mm")
         self.time_input.setFixedHeight(25)
         
@@ -271,12 +275,9 @@ class EntryDialogV2(QDialog):
     def setup_suggestions(self):
         """Initialise les suggestions pour les projets."""
         if self.db:
-            try:
-                projects = self.db.get_project_suggestions()
-                self.project_combo.set_projects(projects)
-                self.ticket_combo.set_tickets([])
-            except Exception as e:
-                pass
+            self.ticket_combo.set_tickets([])
+            task = self.db.submit(self.db.get_project_suggestions)
+            task.finished.connect(self.project_combo.set_projects)
 
     def on_project_changed(self, project_name):
         """Appelé lorsque le projet sélectionné change."""
@@ -285,21 +286,24 @@ class EntryDialogV2(QDialog):
                 self.ticket_combo.set_tickets([])
                 return
 
-            # Récupère l'ID du projet
-            project = self.db.get_project_by_name(project_name)
-            if not project:
-                return
+            # Récupère les tickets du projet en arrière-plan
+            task = self.db.submit(self.db.get_tickets_for_project_name, project_name)
+            task.finished.connect(lambda tickets, name=project_name: self.on_project_tickets_loaded(name, tickets))
 
-            # Récupère les tickets du projet
-            tickets = self.db.get_project_tickets(project['id'])
-            if tickets:
-                # Met à jour la liste des tickets
-                self.ticket_combo.set_tickets(tickets)
-                # Sélectionne le premier ticket mais sans déclencher la recherche du titre
-                first_ticket = tickets[0]['ticket_number']
-                self.ticket_combo.setText(first_ticket)
-            else:
-                self.ticket_combo.set_tickets([])
+    def on_project_tickets_loaded(self, project_name, tickets):
+        """Met à jour la liste des tickets une fois chargée."""
+        # Ignore le résultat si le projet a changé entre-temps, ou s'il est inconnu
+        if project_name != self.project_combo.text() or tickets is None:
+            return
+
+        if tickets:
+            # Met à jour la liste des tickets
+            self.ticket_combo.set_tickets(tickets)
+            # Sélectionne le premier ticket mais sans déclencher la recherche du titre
+            first_ticket = tickets[0]['ticket_number']
+            self.ticket_combo.setText(first_ticket)
+        else:
+            self.ticket_combo.set_tickets([])
 
     def on_ticket_selected(self, ticket_number):
         """Appelé lorsqu'un ticket est sélectionné."""
@@ -307,14 +311,27 @@ class EntryDialogV2(QDialog):
             self.fetch_ticket_title_from_jira(ticket_number)
 
     def fetch_ticket_title_from_jira(self, ticket_number):
-        """Récupère le titre du ticket depuis Jira."""
-        if self.jira_client:
-            try:
-                issue = self.jira_client.get_issue_details(ticket_number)
-                if issue:
-                    self.title_input.setText(issue['summary'])
-            except Exception as e:
-                pass
+        """Récupère le titre du ticket depuis Jira, en arrière-plan."""
+        if not self.jira_client:
+            return
+
+        # L'appel Jira et le cache des tickets passent par le thread de la base
+        if self.title_task:
+            self.title_task.cancel()
+        task = self.db.submit(self.jira_client.get_issue_details, ticket_number)
+        # Méthode du dialogue : déconnectée par PyQt s'il est fermé avant la réponse
+        task.finished.connect(self.on_jira_title_loaded)
+        task.failed.connect(
+            lambda error, number=ticket_number:
+            print(f"Erreur lors de la récupération du titre du ticket {number}: {error}"))
+        self.title_task = task
+
+    def on_jira_title_loaded(self, issue):
+        """Affiche le titre reçu de Jira."""
+        self.title_task = None
+        # Ignore le résultat si le ticket a changé entre-temps
+        if issue and issue['key'] == self.ticket_combo.text() and issue.get('summary'):
+            self.title_input.setText(issue['summary'])
 
     def on_title_focus(self, event):
         """Appelé lorsque le champ titre reçoit le focus."""
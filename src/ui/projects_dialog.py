@@ -50,10 +50,14 @@ class ProjectsDialog(QDialog):
         
     def load_data(self):
         """Charge les projets et tickets dans l'arbre."""
-        self.tree.clear()
+        # Récupère tous les projets avec leurs tickets en arrière-plan
+        task = self.db.submit(self.db.get_all_projects, include_inactive=self.show_inactive.isChecked())
+        task.finished.connect(self.populate_tree)
+        task.failed.connect(lambda error: print(f"Erreur lors du chargement des projets : {error}"))
         
-        # Récupère tous les projets avec leurs tickets
-        projects = self.db.get_all_projects(include_inactive=self.show_inactive.isChecked())
+    def populate_tree(self, projects):
+        """Remplit l'arbre avec les projets chargés par load_data."""
+        self.tree.clear()
         
         for project in projects:
             # Crée l'élément projet
@@ -91,10 +95,12 @@ class ProjectsDialog(QDialog):
         
     def toggle_project(self, project_id, state):
         """Active ou désactive un projet."""
-        self.db.toggle_project_active(project_id, state == Qt.CheckState.Checked.value)
-        self.load_data()  # Recharge pour refléter les changements
+        task = self.db.submit(self.db.toggle_project_active, project_id, state == Qt.CheckState.Checked.value)
+        task.finished.connect(lambda _result: self.load_data())  # Recharge pour refléter les changements
+        task.failed.connect(lambda error: print(f"Erreur lors de la mise à jour du projet : {error}"))
         
     def toggle_ticket(self, project_id, ticket_number, state):
         """Active ou désactive un ticket."""
-        self.db.toggle_ticket_active(project_id, ticket_number, state == Qt.CheckState.Checked.value)
-        self.load_data()  # Recharge pour refléter les changements
+        task = self.db.submit(self.db.toggle_ticket_active, project_id, ticket_number, state == Qt.CheckState.Checked.value)
+        task.finished.connect(lambda _result: self.load_data())  # Recharge pour refléter les changements
+        task.failed.connect(lambda error: print(f"Erreur lors de la mise à jour du ticket : {error}"))
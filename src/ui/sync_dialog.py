@@ -1,19 +1,105 @@
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QTreeWidget, QTreeWidgetItem,
-    QPushButton, QMessageBox, QLabel, QProgressBar
+    QPushButton, QMessageBox, QLabel, QProgressBar, QCheckBox
 )
-from PyQt6.QtCore import Qt, QDateTime
+import threading
+from PyQt6.QtCore import Qt, QDateTime, QThread, pyqtSignal
 from PyQt6.QtGui import QColor
 from utils.database import Database
 from utils.jira_client import JiraClient
+from utils.worklog_sync import WorklogSyncEngine, COALESCE_SETTING, RECONCILE_SETTING
+
+
+class SyncThread(QThread):
+    """Thread pour l'envoi des worklogs vers Jira."""
+    progress = pyqtSignal(int, int)  # entrées traitées, total
+    finished = pyqtSignal(list, list, bool)  # ids synchronisés, erreurs, annulé
+    
+    def __init__(self, jira_client, entries, reconcile=False):
+        super().__init__()
+        self.entries = entries
+        self.reconcile = reconcile
+        self.db = Database()
+        self.engine = WorklogSyncEngine(
+            jira_client, self.db,
+            progress=lambda done, total: self.progress.emit(done, total),
+            coalesce=self.db.get_setting(COALESCE_SETTING, '0') == '1'
+        )
+        
+    def cancel(self):
+        """Demande l'arrêt de la synchronisation."""
+        self.engine.cancel()
+        
+    def run(self):
+        """Exécute la synchronisation."""
+        try:
+            synced_ids, errors = self.engine.run(self.entries, reconcile=self.reconcile)
+            self.finished.emit(synced_ids, errors, self.engine.cancelled)
+        except Exception as e:
+            self.finished.emit([], [str(e)], self.engine.cancelled)
+        finally:
+            # Libère la connexion propre à ce thread
+            self.db.close()
+
+
+class OutboxDrainThread(QThread):
+    """Thread d'arrière-plan qui vide la file d'envoi des worklogs.
+
+    À chaque passage, les envois interrompus (réservés depuis plus de
+    IN_FLIGHT_LEASE secondes, par exemple lors de la session précédente)
+    sont vérifiés auprès de Jira, puis les éléments dus sont envoyés. Une
+    synchronisation lancée depuis la fenêtre peut tourner en même temps :
+    ses envois en cours sont trop récents pour être repris.
+    """
+    drained = pyqtSignal(int)  # nombre d'entrées synchronisées
+    
+    # Intervalle entre deux passages (secondes)
+    INTERVAL = 60
+    
+    def __init__(self, jira_client, interval=INTERVAL):
+        super().__init__()
+        self.jira_client = jira_client
+        self.interval = interval
+        self._stop = threading.Event()
+        self.engine = None
+        
+    def stop(self):
+        """Demande l'arrêt du thread et attend sa fin."""
+        self._stop.set()
+        if self.engine:
+            self.engine.cancel()
+        self.wait()
+        
+    def run(self):
+        """Boucle de vidage de la file."""
+        db = Database()
+        try:
+            self.engine = WorklogSyncEngine(self.jira_client, db)
+            while not self._stop.is_set():
+                try:
+                    self.engine.coalesce = db.get_setting(COALESCE_SETTING, '0') == '1'
+                    # Les éléments non vérifiés (Jira injoignable) restent in_flight
+                    # et seront repris au passage suivant
+                    self.engine.recover()
+                    synced_ids, _ = self.engine.drain()
+                    if synced_ids:
+                        self.drained.emit(len(synced_ids))
+                except Exception as e:
+                    print(f"Erreur lors de l'envoi des worklogs en attente : {str(e)}")
+                self._stop.wait(self.interval)
+        finally:
+            # Libère la connexion propre à ce thread
+            db.close()
 
 
 class SyncDialog(QDialog):
     """Fenêtre de synchronisation avec Jira."""
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, db=None):
         super().__init__(parent)
-        self.db = Database()
+        self.db = db or Database()
+        self.entries = []
+        self.sync_thread = None
         self.setup_ui()
         self.load_entries()
 
@@ -30,6 +116,12 @@ class SyncDialog(QDialog):
         header_label.setStyleSheet("font-weight: bold; font-size: 14px;")
         layout.addWidget(header_label)
 
+        # État de la file d'envoi (affiché s'il reste des envois en attente ou en échec)
+        self.outbox_label = QLabel()
+        self.outbox_label.setStyleSheet("color: #FF8C00;")
+        self.outbox_label.hide()
+        layout.addWidget(self.outbox_label)
+
         # Liste des entrées
         self.tree = QTreeWidget()
         self.tree.setHeaderLabels(["Date", "Projet", "Ticket", "Fait", "Durée"])
@@ -63,6 +155,11 @@ class SyncDialog(QDialog):
         legend_label.setStyleSheet("color: #FF8C00;")
         layout.addWidget(legend_label)
 
+        # Recherche des worklogs déjà présents (réinstallation, restauration...)
+        self.reconcile_check = QCheckBox("Ne pas renvoyer le temps déjà saisi dans Jira")
+        self.reconcile_check.setChecked(self.db.get_setting(RECONCILE_SETTING, '1') == '1')
+        layout.addWidget(self.reconcile_check)
+
         # Bouton de synchronisation
         self.sync_button = QPushButton("Synchroniser avec Jira")
         self.sync_button.clicked.connect(self.sync_with_jira)
@@ -71,11 +168,44 @@ class SyncDialog(QDialog):
         self.setLayout(layout)
 
     def load_entries(self):
-        """Charge les entrées non synchronisées."""
+        """Charge les entrées non synchronisées en arrière-plan."""
+        # La synchronisation attend la liste à jour
+        self.sync_button.setEnabled(False)
+        task = self.db.submit(self.db.get_unsynchronized_entries)
+        task.finished.connect(self.on_entries_loaded)
+        task.failed.connect(self.on_entries_failed)
+        self.load_outbox_counts()
+
+    def load_outbox_counts(self):
+        """Charge en arrière-plan le nombre d'envois en attente et en échec."""
+        task = self.db.submit(self.db.get_sync_outbox_counts)
+        task.finished.connect(self.on_outbox_counts_loaded)
+        task.failed.connect(lambda error: print(f"Erreur lors de la lecture de la file d'envoi : {error}"))
+
+    def on_outbox_counts_loaded(self, counts):
+        """Affiche l'état de la file d'envoi chargé par load_outbox_counts."""
+        waiting = counts.get('pending', 0) + counts.get('in_flight', 0)
+        failed = counts.get('failed', 0)
+        parts = []
+        if waiting:
+            parts.append(f"{waiting} envoi(s) en attente de nouvel essai")
+        if failed:
+            parts.append(f"{failed} envoi(s) en échec")
+        self.outbox_label.setText("File d'envoi : " + ", ".join(parts))
+        self.outbox_label.setVisible(bool(parts))
+
+    def on_entries_failed(self, error):
+        """Appelé si la lecture des entrées non synchronisées a échoué."""
+        self.sync_button.setEnabled(True)
+        QMessageBox.warning(self, "Erreur", f"Erreur lors du chargement des entrées : {error}")
+
+    def on_entries_loaded(self, entries):
+        """Affiche les entrées chargées par load_entries."""
         self.tree.clear()
-        entries = self.db.get_unsynchronized_entries()
+        self.entries = entries
+        self.sync_button.setEnabled(True)
 
-        for entry in entries:
+        for entry in self.entries:
             item = QTreeWidgetItem()
 
             # Date et heure
@@ -130,6 +260,13 @@ class SyncDialog(QDialog):
 
     def sync_with_jira(self):
         """Synchronise les entrées avec Jira."""
+        # Un second clic pendant la synchronisation l'annule
+        if self.sync_thread and self.sync_thread.isRunning():
+            self.sync_thread.cancel()
+            self.sync_button.setEnabled(False)
+            self.sync_button.setText("Annulation en cours...")
+            return
+        
         # Vérifie la configuration Jira
         base_url = self.db.get_setting('jira_base_url')
         token = self.db.get_setting('jira_token')
@@ -145,49 +282,31 @@ class SyncDialog(QDialog):
         
         # Initialise le client Jira
         jira = JiraClient(base_url, token, email)
+        reconcile = self.reconcile_check.isChecked()
+        self.db.save_setting(RECONCILE_SETTING, '1' if reconcile else '0')
         
         # Prépare la synchronisation
-        entries_count = self.tree.topLevelItemCount()
-        self.progress.setMaximum(entries_count)
+        self.progress.setMaximum(len(self.entries))
         self.progress.setValue(0)
         self.progress.show()
-        self.sync_button.setEnabled(False)
-        
-        # Synchronise chaque entrée
-        synced_ids = []
-        errors = []
-        
-        for i in range(entries_count):
-            item = self.tree.topLevelItem(i)
-            entry_id = item.data(0, Qt.ItemDataRole.UserRole)
-            ticket = item.text(2)
-            description = item.text(3)
-            duration = float(item.text(4).rstrip('h').split('h')[0]) * 60 + float(item.text(4).rstrip('h').split('h')[1].rstrip('m'))  # Convertit en minutes
-            
-            # Récupère la date et l'heure de l'entrée depuis la base de données
-            entry = self.db.get_entry_by_id(entry_id)
-            entry_datetime = QDateTime.fromString(f"{entry['date']} {entry['time']}", "yyyy-MM-dd HH:mm").toPyDateTime()
-            
-            # Si pas de ticket, marque comme synchronisé et continue
-            if not ticket:
-                synced_ids.append(entry_id)
-                self.progress.setValue(i + 1)
-                continue
-            
-            # Tente d'ajouter le worklog
-            if jira.add_worklog(ticket, int(duration), description, entry_datetime):
-                synced_ids.append(entry_id)
-            else:
-                errors.append(f"Erreur lors de la synchronisation du ticket {ticket}")
-            
-            self.progress.setValue(i + 1)
-        
-        # Marque les entrées comme synchronisées
-        if synced_ids:
-            self.db.mark_entries_as_synced(synced_ids)
+        self.sync_button.setText("Annuler la synchronisation")
         
+        # Les worklogs sont envoyés en arrière-plan
+        self.sync_thread = SyncThread(jira, self.entries, reconcile)
+        self.sync_thread.progress.connect(self.on_sync_progress)
+        self.sync_thread.finished.connect(self.on_sync_finished)
+        self.sync_thread.start()
+
+    def on_sync_progress(self, done, total):
+        """Met à jour la barre de progression."""
+        self.progress.setMaximum(total)
+        self.progress.setValue(done)
+
+    def on_sync_finished(self, synced_ids, errors, cancelled):
+        """Appelé quand la synchronisation est terminée."""
         # Masque la barre de progression
         self.progress.hide()
+        self.sync_button.setText("Synchroniser avec Jira")
         self.sync_button.setEnabled(True)
         
         # Affiche le résultat
@@ -197,6 +316,12 @@ class SyncDialog(QDialog):
                 "Erreurs de synchronisation",
                 "Des erreurs sont survenues lors de la synchronisation :\n\n" + "\n".join(errors)
             )
+        elif cancelled:
+            QMessageBox.information(
+                self,
+                "Synchronisation annulée",
+                f"{len(synced_ids)} entrée(s) synchronisée(s) avant l'annulation."
+            )
         else:
             QMessageBox.information(
                 self,
@@ -206,3 +331,10 @@ class SyncDialog(QDialog):
         
         # Recharge les entrées
         self.load_entries()
+
+    def reject(self):
+        """Annule la synchronisation en cours avant de fermer la fenêtre."""
+        if self.sync_thread and self.sync_thread.isRunning():
+            self.sync_thread.cancel()
+            self.sync_thread.wait()
+        super().reject()
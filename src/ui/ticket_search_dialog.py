@@ -5,7 +5,7 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QLineEdit, QTreeWidget, QTreeWidgetItem,
     QLabel, QHBoxLayout
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 
 class TicketSearchDialog(QDialog):
     """Fenêtre de recherche de tickets dans jira_subtasks."""
@@ -13,10 +13,22 @@ class TicketSearchDialog(QDialog):
     # Signal émis quand un ticket est sélectionné
     ticketSelected = pyqtSignal(str, str)  # ticket_number, title
     
+    # Délai sans frappe avant d'interroger l'index plein texte (ms)
+    SEARCH_DELAY = 150
+    # Nombre maximum de résultats demandés à l'index plein texte
+    SEARCH_LIMIT = 200
+    
     def __init__(self, parent=None, db=None):
         super().__init__(parent)
         self.db = db
         self.all_items = []  # Initialisation de la liste
+        self.items_by_key = {}  # Éléments de l'arbre par numéro de ticket
+        self.search_texts = []  # Texte en minuscules de chaque élément, pour le filtre
+        self.search_task = None  # Recherche plein texte en file ou en cours
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY)
+        self.search_timer.timeout.connect(self._search_index)
         self.setup_ui()
         self.load_tickets()
         
@@ -51,21 +63,42 @@ class TicketSearchDialog(QDialog):
         self.setLayout(layout)
     
     def load_tickets(self):
-        """Charge tous les tickets depuis la table jira_subtasks."""
-        try:
-            tickets = self.db.get_all_subtasks()
-            
-            for ticket in tickets:
-                item = QTreeWidgetItem([
-                    ticket['ticket_number'],
-                    ticket['title'] or '',
-                    ticket['path'] or ''
-                ])
-                self.all_items.append(item)
-                self.tree.addTopLevelItem(item)
-                
-        except Exception as e:
-            print(f"Erreur lors du chargement des tickets : {str(e)}")
+        """Charge toutes les sous-tâches depuis la table jira_issues, en arrière-plan."""
+        task = self.db.submit(self.db.get_subtask_issues)
+        task.finished.connect(self._on_subtask_issues_loaded)
+        task.failed.connect(self._on_load_failed)
+    
+    def _on_subtask_issues_loaded(self, tickets):
+        """Affiche les sous-tâches chargées par load_tickets."""
+        if not tickets:
+            # Hiérarchie pas encore importée dans jira_issues
+            task = self.db.submit(self.db.get_all_subtasks)
+            task.finished.connect(self._on_tickets_loaded)
+            task.failed.connect(self._on_load_failed)
+            return
+        self._on_tickets_loaded(tickets)
+    
+    def _on_load_failed(self, error):
+        """Appelé si la lecture des tickets a échoué."""
+        print(f"Erreur lors du chargement des tickets : {error}")
+    
+    def _on_tickets_loaded(self, tickets):
+        """Remplit l'arbre avec les tickets chargés."""
+        for ticket in tickets:
+            item = QTreeWidgetItem([
+                ticket['ticket_number'],
+                ticket['title'] or '',
+                ticket['path'] or ''
+            ])
+            self.all_items.append(item)
+            self.search_texts.append(' '.join(
+                item.text(column).lower() for column in range(3)))
+            self.items_by_key[ticket['ticket_number']] = item
+            self.tree.addTopLevelItem(item)
+        
+        # Applique le filtre déjà saisi pendant le chargement
+        if self.search_input.text():
+            self._filter_tickets(self.search_input.text())
     
     def _filter_tickets(self, text):
         """Filtre les tickets selon le texte saisi."""
@@ -75,23 +108,50 @@ class TicketSearchDialog(QDialog):
         
         # Si le texte est vide, montre tout
         if not text.strip():
+            self.search_timer.stop()
+            self._cancel_search()
             for item in self.all_items:
                 item.setHidden(False)
             return
         
-        # Sinon, filtre selon le texte
+        # Sinon, affiche les tickets contenant tous les termes saisis, y compris
+        # au milieu d'un mot ("23" trouve PROJ-1234)
         search_terms = text.lower().split()
-        for item in self.all_items:
-            # Combine tous les champs pour la recherche
-            item_text = ' '.join([
-                item.text(0).lower(),  # Numéro
-                item.text(1).lower(),  # Titre
-                item.text(2).lower()   # Chemin
-            ])
-            
-            # Vérifie si tous les termes de recherche sont présents
-            matches = all(term in item_text for term in search_terms)
-            item.setHidden(not matches)
+        for item, item_text in zip(self.all_items, self.search_texts):
+            if all(term in item_text for term in search_terms):
+                item.setHidden(False)
+        
+        # Complète avec l'index plein texte (accents ignorés), interrogé en
+        # arrière-plan une fois la saisie interrompue
+        self.search_timer.start()
+    
+    def _cancel_search(self):
+        """Annule la recherche plein texte précédente si elle n'est pas terminée."""
+        if self.search_task:
+            self.search_task.cancel()
+            self.search_task = None
+    
+    def _search_index(self):
+        """Interroge l'index plein texte avec la saisie courante."""
+        self._cancel_search()
+        text = self.search_input.text()
+        if not text.strip():
+            return
+        task = self.db.submit(self.db.search, text, limit=self.SEARCH_LIMIT, kinds=['subtask'])
+        task.finished.connect(lambda results, searched=text: self._on_search_results(searched, results))
+        task.failed.connect(lambda error: print(f"Erreur lors de la recherche des tickets : {error}"))
+        self.search_task = task
+    
+    def _on_search_results(self, text, results):
+        """Affiche les tickets trouvés par l'index plein texte."""
+        self.search_task = None
+        # Ignore le résultat si la saisie a changé entre-temps
+        if text != self.search_input.text():
+            return
+        for result in results:
+            item = self.items_by_key.get(result['ticket_key'])
+            if item:
+                item.setHidden(False)
     
     def _on_item_double_clicked(self, item, column):
         """Appelé quand un ticket est double-cliqué."""
@@ -5,173 +5,117 @@ import logging
 from datetime import datetime
 import os
 import json
+import re
+import threading
+import unicodedata
 from PyQt6.QtCore import QDate
+from utils.db_connection import ConnectionManager, PRAGMA_PROFILES
+from utils.db_executor import DbExecutor
+from utils.migrations import ensure_schema, REBUILD_DAILY_TOTALS_SQL, REBUILD_SEARCH_INDEX_SQL
+from utils.jira_hierarchy import format_path
+from utils.jira_import import SUBTASK_TYPES
+
+
+# Diacritiques séparés des lettres par la décomposition NFKD
+_COMBINING_MARKS = re.compile(r'[\u0300-\u036f]')
+
+
+def _search_text(text):
+    """Texte en minuscules et sans accents, comme dans l'index plein texte."""
+    if not text or text.isascii():
+        return (text or '').lower()
+    return _COMBINING_MARKS.sub('', unicodedata.normalize('NFKD', text)).casefold()
+
 
 class Database:
     """Gestionnaire de la base de données SQLite."""
     
-    def __init__(self):
-        """Initialise la connexion à la base de données."""
-        self.db_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data')
+    # Cache des paramètres par fichier de base, partagé entre les instances
+    _settings_cache = {}
+    _settings_lock = threading.Lock()
+    
+    # Recherche plein texte : index par type de résultat, nombre de lignes
+    # retenues et lues au plus par index, longueur maximale des index de
+    # préfixes (migration 14) et poids du numéro de ticket, du titre et du corps
+    SEARCH_TABLES = {'entry': 'entries_search', 'subtask': 'subtasks_search'}
+    SEARCH_WINDOW = 200
+    SEARCH_SCAN = 2000
+    SEARCH_PREFIX_LENGTH = 6
+    SEARCH_WEIGHTS = (4, 2, 1)
+    
+    def __init__(self, db_path=None):
+        """Initialise la connexion à la base de données.
+        
+        Args:
+            db_path: Chemin du fichier de base (data/logtracker.db par défaut)
+        """
+        if db_path is None:
+            self.db_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data')
+            db_path = os.path.join(self.db_dir, 'logtracker.db')
+        else:
+            self.db_dir = os.path.dirname(os.path.abspath(db_path))
         os.makedirs(self.db_dir, exist_ok=True)
-        self.db_path = os.path.join(self.db_dir, 'logtracker.db')
-        self.conn = None
-        self.cursor = None
-        self.create_tables()
-        self.migrate_database()
+        self.db_path = db_path
+        self.connections = ConnectionManager.for_path(self.db_path)
+        ensure_schema(self.conn, self.db_path)
+    
+    @property
+    def conn(self):
+        """Connexion SQLite du thread courant."""
+        return self.connections.get_connection()
+    
+    @property
+    def cursor(self):
+        """Curseur de la connexion du thread courant."""
+        return self.connections.get_cursor()
     
     def connect(self):
-        """Établit une connexion à la base de données."""
-        if self.conn is None:
-            self.conn = sqlite3.connect(self.db_path)
-            self.conn.row_factory = sqlite3.Row
-            self.cursor = self.conn.cursor()
+        """Établit la connexion du thread courant si elle n'existe pas encore."""
+        self.connections.get_connection()
     
     def disconnect(self):
-        """Ferme la connexion à la base de données."""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
-            self.cursor = None
-    
-    def create_tables(self):
-        """Crée les tables de la base de données."""
-        try:
-            self.connect()
-            
-            # Table des paramètres
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS settings (
-                    key TEXT PRIMARY KEY,
-                    value TEXT
-                )
-            """)
-            
-            # Table des projets
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS projects (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL UNIQUE,
-                    ticket_prefix TEXT,
-                    planner_id TEXT,  -- ID du plan Planner associé
-                    planner_name TEXT -- Nom du plan Planner
-                )
-            """)
-            
-            # Table des tickets
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS tickets (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    project_id INTEGER,
-                    ticket_number TEXT NOT NULL,
-                    title TEXT,
-                    is_active INTEGER DEFAULT 1,
-                    FOREIGN KEY (project_id) REFERENCES projects (id),
-                    UNIQUE(project_id, ticket_number)
-                )
-            """)
-            
-            # Table des entrées
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS entries (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date TEXT NOT NULL,
-                    time TEXT NOT NULL,
-                    project_id INTEGER,
-                    ticket_id INTEGER,
-                    ticket_number TEXT,
-                    ticket_title TEXT,
-                    description TEXT NOT NULL,
-                    duration INTEGER NOT NULL,
-                    is_synced INTEGER DEFAULT 0,
-                    planner_task_id TEXT,  -- ID de la tâche Planner si synchronisée
-                    FOREIGN KEY (project_id) REFERENCES projects (id),
-                    FOREIGN KEY (ticket_id) REFERENCES tickets (id)
-                )
-            """)
-            
-            # Suppression des anciennes tables
-            self.cursor.execute("DROP TABLE IF EXISTS jira_hierarchy")
-            self.cursor.execute("DROP TABLE IF EXISTS epic_feature_pairs")
-            self.cursor.execute("DROP TABLE IF EXISTS features")
-            self.cursor.execute("DROP TABLE IF EXISTS epics")
-            
-            # Création des nouvelles tables simplifiées
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS jira_paths (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    path TEXT NOT NULL,  -- Format: "projet/epic/fonctionnalité"
-                    ticket_key TEXT NOT NULL,  -- Numéro du ticket Jira
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS jira_subtasks (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    path TEXT NOT NULL,  -- Format: "projet/epic/fonctionnalité"
-                    title TEXT NOT NULL,  -- Titre du ticket
-                    ticket_key TEXT NOT NULL,  -- Numéro du ticket Jira
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS jira_labels (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL UNIQUE,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Création des index pour optimiser les recherches
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_jira_paths_path ON jira_paths(path)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_jira_subtasks_path ON jira_subtasks(path)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_jira_labels_name ON jira_labels(name)")
-            
-            # Ajout des paramètres par défaut
-            self.cursor.execute("""
-                INSERT OR IGNORE INTO settings (key, value) VALUES 
-                    ('jira_base_url', NULL),
-                    ('jira_token', NULL),
-                    ('jira_email', NULL),
-                    ('daily_hours', '8'),
-                    ('token_expiry', NULL),
-                    ('start_time', '08:00'),
-                    ('end_time', '18:00'),
-                    ('use_sequential_time', '0'),
-                    ('ticket_selection_jql', NULL),
-                    ('project_selection_jql', NULL)
-            """)
-            
-            self.conn.commit()
+        """Conservé pour compatibilité : la connexion reste ouverte et est réutilisée."""
+    
+    def close(self):
+        """Ferme la connexion du thread courant (à appeler en fin de thread)."""
+        self.connections.close()
+    
+    def set_performance_profile(self, profile_name):
+        """Enregistre le profil de performance SQLite et l'applique à la connexion courante.
+        
+        Args:
+            profile_name: Nom du profil ('safe', 'balanced' ou 'fast')
+        """
+        if profile_name not in PRAGMA_PROFILES:
+            raise ValueError(f"Profil de base de données inconnu : {profile_name}")
+        self.save_setting('db_profile', profile_name)
+        ConnectionManager.apply_profile(self.conn, profile_name)
+    
+    def submit(self, fn, *args, **kwargs):
+        """
+        Exécute une opération sur la base dans le thread dédié aux accès SQLite.
+        
+        Exemple:
+            task = db.submit(db.get_all_projects, True)
+            task.finished.connect(self.on_projects_loaded)
+        
+        Args:
+            fn: Fonction à exécuter (généralement une méthode de Database)
             
-        finally:
-            self.disconnect()
+        Returns:
+            DbTask: Objet dont les signaux finished(result) et failed(message)
+                    sont livrés dans le thread de l'interface
+        """
+        return DbExecutor.for_path(self.db_path).submit(fn, *args, **kwargs)
     
-    def migrate_database(self):
-        """Effectue les migrations nécessaires de la base de données."""
-        try:
-            self.connect()
-            
-            # Vérifie si la colonne planner_id existe dans la table projects
-            self.cursor.execute("PRAGMA table_info(projects)")
-            columns = [col[1] for col in self.cursor.fetchall()]
-            
-            if 'planner_id' not in columns:
-                self.cursor.execute("ALTER TABLE projects ADD COLUMN planner_id TEXT")
-                self.cursor.execute("ALTER TABLE projects ADD COLUMN planner_name TEXT")
-                
-            # Vérifie si la colonne planner_task_id existe dans la table entries
-            self.cursor.execute("PRAGMA table_info(entries)")
-            columns = [col[1] for col in self.cursor.fetchall()]
-            
-            if 'planner_task_id' not in columns:
-                self.cursor.execute("ALTER TABLE entries ADD COLUMN planner_task_id TEXT")
-                
-            self.conn.commit()
-        finally:
-            self.disconnect()
+    def transaction(self):
+        """Retourne un gestionnaire de contexte transactionnel.
+        
+        Exemple:
+            with db.transaction():
+                db.cursor.execute(...)
+        """
+        return self.connections.transaction()
     
     def add_project(self, name):
         """
@@ -183,13 +127,9 @@ class Database:
         Returns:
             ID du projet
         """
-        self.connect()
-        try:
+        with self.transaction():
             self.cursor.execute("INSERT INTO projects (name) VALUES (?)", (name,))
-            self.conn.commit()
             return self.cursor.lastrowid
-        finally:
-            self.disconnect()
     
     def add_ticket(self, project_id, ticket_number, title=None):
         """
@@ -203,16 +143,12 @@ class Database:
         Returns:
             ID du ticket
         """
-        self.connect()
-        try:
+        with self.transaction():
             self.cursor.execute("""
                 INSERT INTO tickets (project_id, ticket_number, title)
                 VALUES (?, ?, ?)
             """, (project_id, ticket_number, title))
-            self.conn.commit()
             return self.cursor.lastrowid
-        finally:
-            self.disconnect()
     
     def update_ticket_title(self, ticket_id, title):
         """
@@ -222,12 +158,36 @@ class Database:
             ticket_id: ID du ticket
             title: Nouveau titre du ticket
         """
-        self.connect()
-        try:
+        with self.transaction():
             self.cursor.execute("UPDATE tickets SET title = ? WHERE id = ?", (title, ticket_id))
-            self.conn.commit()
-        finally:
-            self.disconnect()
+    
+    def update_ticket_titles(self, titles):
+        """
+        Met à jour le titre de plusieurs tickets dans une seule transaction.
+        
+        Args:
+            titles: Liste de tuples (ticket_id, titre)
+        """
+        with self.transaction():
+            for ticket_id, title in titles:
+                self.update_ticket_title(ticket_id, title)
+    
+    def get_active_tickets(self):
+        """
+        Récupère les tickets actifs (pour le rafraîchissement de leur titre).
+        
+        Returns:
+            Liste de dicts avec id, ticket_number et title
+        """
+        self.cursor.execute("""
+            SELECT id, ticket_number, title
+            FROM tickets
+            WHERE is_active = 1 AND ticket_number IS NOT NULL AND ticket_number != ''
+        """)
+        return [
+            {'id': row[0], 'ticket_number': row[1], 'title': row[2]}
+            for row in self.cursor.fetchall()
+        ]
     
     def get_ticket_info(self, project_id, ticket_number):
         """
@@ -240,16 +200,12 @@ class Database:
         Returns:
             Tuple contenant l'ID, le numéro et le titre du ticket
         """
-        self.connect()
-        try:
-            self.cursor.execute("""
-                SELECT id, ticket_number, title
-                FROM tickets
-                WHERE project_id = ? AND ticket_number = ?
-            """, (project_id, ticket_number))
-            return self.cursor.fetchone()
-        finally:
-            self.disconnect()
+        self.cursor.execute("""
+            SELECT id, ticket_number, title
+            FROM tickets
+            WHERE project_id = ? AND ticket_number = ?
+        """, (project_id, ticket_number))
+        return self.cursor.fetchone()
     
     def get_tickets_for_project(self, project_id):
         """
@@ -261,22 +217,17 @@ class Database:
         Returns:
             Liste de tuples contenant l'ID, le numéro et le titre de chaque ticket
         """
-        self.connect()
-        try:
-            self.cursor.execute("""
-                SELECT id, ticket_number, title
-                FROM tickets
-                WHERE project_id = ?
-                ORDER BY ticket_number DESC
-            """, (project_id,))
-            return self.cursor.fetchall()
-        finally:
-            self.disconnect()
+        self.cursor.execute("""
+            SELECT id, ticket_number, title
+            FROM tickets
+            WHERE project_id = ?
+            ORDER BY ticket_number DESC
+        """, (project_id,))
+        return self.cursor.fetchall()
     
     def add_entry(self, description, project_id=None, ticket_id=None, duration=60, ticket_title=None, date=None, time=None):
         """Ajoute une nouvelle entrée."""
-        self.connect()
-        try:
+        with self.transaction():
             self.cursor.execute("""
                 INSERT INTO entries (
                     date, time, project_id, ticket_id, ticket_title,
@@ -288,41 +239,96 @@ class Database:
                 project_id, ticket_id, ticket_title,
                 description, duration
             ))
-            self.conn.commit()
             return self.cursor.lastrowid
-        finally:
-            self.disconnect()
     
     def get_entries(self, days=None):
         """Récupère les entrées."""
-        try:
-            self.connect()
-            
-            query = """
-                SELECT 
-                    e.id,
-                    e.description,
-                    e.duration,
-                    e.date,
-                    e.time,
-                    e.ticket_title,
-                    p.name as project_name,
-                    t.ticket_number
-                FROM entries e
-                LEFT JOIN projects p ON e.project_id = p.id
-                LEFT JOIN tickets t ON e.ticket_id = t.id
-            """
+        return list(self.iter_entries({'days': days} if days else None))
+    
+    def iter_entries(self, filters=None, page_size=500):
+        """
+        Parcourt les entrées page par page, de la plus récente à la plus ancienne.
+        
+        La pagination se fait par clé (date, time, id) : chaque page reprend
+        après la dernière ligne de la précédente, sans OFFSET, et seule une
+        page est en mémoire à la fois.
+        
+        Args:
+            filters: Dictionnaire optionnel de filtres :
+                start_date / end_date (datetime.date ou 'YYYY-MM-DD'),
+                days (nombre de jours glissants), project_id, ticket_id,
+                is_synced (bool)
+            page_size: Nombre de lignes lues par requête
             
-            if days:
-                query += f" WHERE date >= date('now', '-{days} days')"
+        Yields:
+            dict: Une entrée avec le nom du projet et le numéro du ticket
+        """
+        filters = filters or {}
+        conditions = []
+        params = []
+        
+        if filters.get('start_date'):
+            conditions.append("e.date >= ?")
+            params.append(str(filters['start_date']))
+        if filters.get('end_date'):
+            conditions.append("e.date <= ?")
+            params.append(str(filters['end_date']))
+        if filters.get('days'):
+            conditions.append("e.date >= date('now', ?)")
+            params.append(f"-{int(filters['days'])} days")
+        if filters.get('project_id') is not None:
+            conditions.append("e.project_id = ?")
+            params.append(filters['project_id'])
+        if filters.get('ticket_id') is not None:
+            conditions.append("e.ticket_id = ?")
+            params.append(filters['ticket_id'])
+        if filters.get('is_synced') is not None:
+            # Valeur littérale pour que SQLite puisse utiliser l'index partiel idx_entries_unsynced
+            conditions.append("e.is_synced = 1" if filters['is_synced'] else "e.is_synced = 0")
+        
+        query = """
+            SELECT 
+                e.id,
+                e.description,
+                e.duration,
+                e.date,
+                e.time,
+                e.ticket_title,
+                e.project_id,
+                e.ticket_id,
+                e.is_synced,
+                p.name as project_name,
+                t.ticket_number
+            FROM entries e
+            LEFT JOIN projects p ON e.project_id = p.id
+            LEFT JOIN tickets t ON e.ticket_id = t.id
+            WHERE {conditions}
+            ORDER BY e.date DESC, e.time DESC, e.id DESC
+            LIMIT ?
+        """
+        
+        last_key = None
+        while True:
+            page_conditions = list(conditions)
+            page_params = list(params)
+            if last_key:
+                page_conditions.append("(e.date, e.time, e.id) < (?, ?, ?)")
+                page_params.extend(last_key)
+            page_params.append(page_size)
             
-            query += " ORDER BY date DESC, time DESC"
+            # Curseur dédié : le générateur peut être consommé entre deux autres appels
+            cursor = self.conn.execute(
+                query.format(conditions=" AND ".join(page_conditions) or "1"),
+                page_params
+            )
+            rows = cursor.fetchall()
+            for row in rows:
+                yield dict(row)
             
-            self.cursor.execute(query)
-            columns = [col[0] for col in self.cursor.description]
-            return [dict(zip(columns, row)) for row in self.cursor.fetchall()]
-        finally:
-            self.disconnect()
+            if len(rows) < page_size:
+                return
+            last_row = rows[-1]
+            last_key = (last_row['date'], last_row['time'], last_row['id'])
     
     def get_projects(self):
         """
@@ -331,12 +337,8 @@ class Database:
         Returns:
             Liste des projets
         """
-        self.connect()
-        try:
-            self.cursor.execute("SELECT * FROM projects ORDER BY name")
-            return [dict(row) for row in self.cursor.fetchall()]
-        finally:
-            self.disconnect()
+        self.cursor.execute("SELECT * FROM projects ORDER BY name")
+        return [dict(row) for row in self.cursor.fetchall()]
     
     def get_tickets(self, project_id):
         """
@@ -348,12 +350,8 @@ class Database:
         Returns:
             Liste des tickets
         """
-        self.connect()
-        try:
-            self.cursor.execute("SELECT * FROM tickets WHERE project_id = ?", (project_id,))
-            return [dict(row) for row in self.cursor.fetchall()]
-        finally:
-            self.disconnect()
+        self.cursor.execute("SELECT * FROM tickets WHERE project_id = ?", (project_id,))
+        return [dict(row) for row in self.cursor.fetchall()]
     
     def get_entries_for_day(self, date):
         """
@@ -365,17 +363,13 @@ class Database:
         Returns:
             Liste des entrées pour ce jour
         """
-        self.connect()
-        try:
-            query = """
-                SELECT * FROM entries 
-                WHERE date = ?
-                ORDER BY time DESC
-            """
-            self.cursor.execute(query, (date.isoformat(),))
-            return [dict(row) for row in self.cursor.fetchall()]
-        finally:
-            self.disconnect()
+        query = """
+            SELECT * FROM entries 
+            WHERE date = ?
+            ORDER BY time DESC
+        """
+        self.cursor.execute(query, (date.isoformat(),))
+        return [dict(row) for row in self.cursor.fetchall()]
     
     def get_entries_by_date_range(self, start_date, end_date):
         """
@@ -388,20 +382,16 @@ class Database:
         Returns:
             Liste des entrées avec les informations de projet
         """
-        self.connect()
-        try:
-            query = """
-                SELECT e.*, p.name as project_name, t.ticket_number, t.title as ticket_title
-                FROM entries e
-                LEFT JOIN projects p ON e.project_id = p.id
-                LEFT JOIN tickets t ON e.ticket_id = t.id
-                WHERE date BETWEEN ? AND ?
-                ORDER BY date DESC, time DESC
-            """
-            self.cursor.execute(query, (start_date.isoformat(), end_date.isoformat()))
-            return [dict(row) for row in self.cursor.fetchall()]
-        finally:
-            self.disconnect()
+        query = """
+            SELECT e.*, p.name as project_name, t.ticket_number, t.title as ticket_title
+            FROM entries e
+            LEFT JOIN projects p ON e.project_id = p.id
+            LEFT JOIN tickets t ON e.ticket_id = t.id
+            WHERE date BETWEEN ? AND ?
+            ORDER BY date DESC, time DESC
+        """
+        self.cursor.execute(query, (start_date.isoformat(), end_date.isoformat()))
+        return [dict(row) for row in self.cursor.fetchall()]
     
     def get_entries_by_project(self, start_date, end_date):
         """
@@ -414,31 +404,27 @@ class Database:
         Returns:
             Dictionnaire avec les projets comme clés et leurs entrées comme valeurs
         """
-        self.connect()
-        try:
-            query = """
-                SELECT e.*, p.name as project_name, t.ticket_number, t.title as ticket_title,
-                       date as entry_date
-                FROM entries e
-                LEFT JOIN projects p ON e.project_id = p.id
-                LEFT JOIN tickets t ON e.ticket_id = t.id
-                WHERE date BETWEEN ? AND ?
-                ORDER BY COALESCE(p.name, ''), date DESC, time DESC
-            """
-            self.cursor.execute(query, (start_date.isoformat(), end_date.isoformat()))
-            
-            # Organise les résultats par projet
-            entries_by_project = {}
-            for row in self.cursor.fetchall():
-                entry = dict(row)
-                project_name = entry['project_name'] or 'Sans projet'
-                if project_name not in entries_by_project:
-                    entries_by_project[project_name] = []
-                entries_by_project[project_name].append(entry)
-            
-            return entries_by_project
-        finally:
-            self.disconnect()
+        query = """
+            SELECT e.*, p.name as project_name, t.ticket_number, t.title as ticket_title,
+                   date as entry_date
+            FROM entries e
+            LEFT JOIN projects p ON e.project_id = p.id
+            LEFT JOIN tickets t ON e.ticket_id = t.id
+            WHERE date BETWEEN ? AND ?
+            ORDER BY COALESCE(p.name, ''), date DESC, time DESC
+        """
+        self.cursor.execute(query, (start_date.isoformat(), end_date.isoformat()))
+        
+        # Organise les résultats par projet
+        entries_by_project = {}
+        for row in self.cursor.fetchall():
+            entry = dict(row)
+            project_name = entry['project_name'] or 'Sans projet'
+            if project_name not in entries_by_project:
+                entries_by_project[project_name] = []
+            entries_by_project[project_name].append(entry)
+        
+        return entries_by_project
 
     def get_project_by_name(self, name):
         """
@@ -450,17 +436,111 @@ class Database:
         Returns:
             Dict avec les informations du projet ou None si pas trouvé
         """
-        self.connect()
-        try:
-            self.cursor.execute("SELECT * FROM projects WHERE name = ?", (name,))
-            row = self.cursor.fetchone()
-            return dict(row) if row else None
-        finally:
-            self.disconnect()
+        self.cursor.execute("SELECT * FROM projects WHERE name = ?", (name,))
+        row = self.cursor.fetchone()
+        return dict(row) if row else None
+    
+    def get_tickets_for_project_name(self, name):
+        """
+        Récupère les tickets d'un projet à partir de son nom.
+        
+        Args:
+            name: Nom du projet
+            
+        Returns:
+            Liste des tickets du projet ou None si le projet n'existe pas
+        """
+        project = self.get_project_by_name(name)
+        if not project:
+            return None
+        return self.get_project_tickets(project['id'])
+    
+    def get_ticket_info_for_project_name(self, project_name, ticket_number):
+        """
+        Récupère les informations d'un ticket à partir du nom de son projet.
+        
+        Args:
+            project_name: Nom du projet
+            ticket_number: Numéro du ticket
+            
+        Returns:
+            Tuple (id, numéro, titre) du ticket, ou None si le projet ou le
+            ticket n'existe pas
+        """
+        project = self.get_project_by_name(project_name)
+        if not project:
+            return None
+        return self.get_ticket_info(project['id'], ticket_number)
+    
+    def save_ticket_title(self, project_name, ticket_number, title):
+        """
+        Enregistre le titre d'un ticket, en créant le ticket s'il n'existe pas.
+        
+        Args:
+            project_name: Nom du projet (rien n'est fait s'il n'existe pas)
+            ticket_number: Numéro du ticket
+            title: Titre du ticket
+        """
+        with self.transaction():
+            project = self.get_project_by_name(project_name)
+            if not project:
+                return
+            ticket_info = self.get_ticket_info(project['id'], ticket_number)
+            if ticket_info:
+                self.update_ticket_title(ticket_info[0], title)
+            else:
+                self.add_ticket(project['id'], ticket_number, title)
+    
+    def save_entry(self, project_name, ticket_number, ticket_title, description, duration, date, time):
+        """
+        Enregistre une entrée saisie, en créant au besoin son projet et son ticket.
+        
+        Le projet, le ticket et l'entrée sont écrits dans une seule transaction.
+        
+        Args:
+            project_name: Nom du projet
+            ticket_number: Numéro du ticket (optionnel)
+            ticket_title: Titre du ticket ; remplace le titre enregistré s'il diffère
+            description: Description de l'entrée
+            duration: Durée en minutes
+            date: Date au format YYYY-MM-DD
+            time: Heure au format HH:MM
+            
+        Returns:
+            ID de l'entrée
+        """
+        with self.transaction():
+            # Récupère ou crée le projet
+            project = self.get_project_by_name(project_name)
+            if project_name and not project:
+                project_id = self.add_project(project_name)
+            else:
+                project_id = project['id'] if project else None
+            
+            # Récupère ou crée le ticket
+            ticket_id = None
+            if project_id and ticket_number:
+                ticket_info = self.get_ticket_info(project_id, ticket_number)
+                if not ticket_info:
+                    ticket_id = self.add_ticket(project_id, ticket_number, ticket_title)
+                else:
+                    ticket_id = ticket_info[0]
+                    # Met à jour le titre si nécessaire
+                    if ticket_title != ticket_info[2]:
+                        self.update_ticket_title(ticket_id, ticket_title)
+            
+            return self.add_entry(
+                description=description,
+                project_id=project_id,
+                ticket_id=ticket_id,
+                ticket_title=ticket_title,
+                duration=duration,
+                date=date,
+                time=time
+            )
     
     def get_project_suggestions(self):
         """Retourne la liste des noms de projets pour l'auto-complétion."""
-        self.connect()
         try:
             self.cursor.execute("""
                 SELECT DISTINCT name 
@@ -473,12 +553,9 @@ class Database:
         except Exception as e:
             print(f"Erreur lors de la récupération des suggestions de projets : {str(e)}")
             return []
-        finally:
-            self.disconnect()
 
     def get_ticket_suggestions(self):
         """Retourne la liste des numéros de tickets pour l'auto-complétion."""
-        self.connect()
         try:
             self.cursor.execute("""
                 SELECT DISTINCT ticket_number 
@@ -491,70 +568,269 @@ class Database:
         except Exception as e:
             print(f"Erreur lors de la récupération des suggestions de tickets : {str(e)}")
             return []
-        finally:
-            self.disconnect()
+
+    def _get_settings_cache(self):
+        """Retourne le cache des paramètres, chargé en une requête au premier accès.
+        
+        Le cache est partagé par toutes les instances de Database du processus
+        pointant vers le même fichier : une écriture via une instance est
+        visible par les autres dès la validation de sa transaction.
+        """
+        cache = Database._settings_cache.get(self.db_path)
+        if cache is None:
+            self.cursor.execute("SELECT key, value FROM settings")
+            cache = {row[0]: row[1] for row in self.cursor.fetchall()}
+            # Lu dans une transaction en cours, le contenu peut encore être annulé
+            if self.conn.in_transaction:
+                return cache
+            with Database._settings_lock:
+                cache = Database._settings_cache.setdefault(self.db_path, cache)
+        return cache
+    
+    def invalidate_settings_cache(self):
+        """Vide le cache des paramètres (ex: base modifiée hors de l'application)."""
+        with Database._settings_lock:
+            Database._settings_cache.pop(self.db_path, None)
 
     def save_setting(self, key, value):
         """Sauvegarde un paramètre."""
-        try:
-            self.connect()
-            self.cursor.execute("""
+        self.save_settings({key: value})
+
+    def save_settings(self, settings):
+        """
+        Sauvegarde plusieurs paramètres dans une seule transaction.
+        
+        Appelé dans une transaction, le cache partagé n'est mis à jour
+        qu'à la validation de la transaction la plus externe.
+        
+        Args:
+            settings: Dictionnaire {clé: valeur}
+        """
+        settings = dict(settings)
+        with self.transaction():
+            self.cursor.executemany("""
                 INSERT OR REPLACE INTO settings (key, value)
                 VALUES (?, ?)
-            """, (key, value))
-            self.conn.commit()
-        finally:
-            self.disconnect()
+            """, list(settings.items()))
+            # Le cache n'est modifié qu'après la validation de la transaction la
+            # plus externe : dans une transaction annulée ensuite, il reste intact
+            self.connections.on_commit(lambda: self._update_settings_cache(settings))
+
+    def _update_settings_cache(self, settings):
+        """Reporte des paramètres enregistrés dans le cache, s'il est chargé."""
+        cache = Database._settings_cache.get(self.db_path)
+        if cache is not None:
+            with Database._settings_lock:
+                cache.update(settings)
 
     def get_setting(self, key, default=None):
         """Récupère un paramètre."""
-        try:
-            self.connect()
-            self.cursor.execute("SELECT value FROM settings WHERE key = ?", (key,))
-            result = self.cursor.fetchone()
-            return result[0] if result else default
-        finally:
-            self.disconnect()
+        cache = self._get_settings_cache()
+        return cache[key] if key in cache else default
 
     def get_unsynchronized_entries(self):
         """Récupère les entrées non synchronisées."""
-        try:
-            self.connect()
-            self.cursor.execute("""
-                SELECT 
-                    e.id, 
-                    e.date, 
-                    e.time, 
-                    e.project_id, 
-                    e.ticket_id, 
-                    e.description, 
-                    e.duration, 
-                    e.ticket_title,
-                    p.name as project_name,
-                    t.ticket_number as ticket_number
-                FROM entries e
-                LEFT JOIN projects p ON e.project_id = p.id
-                LEFT JOIN tickets t ON e.ticket_id = t.id
-                WHERE e.is_synced = 0
-                ORDER BY e.date DESC, e.time DESC
-            """)
-            columns = [col[0] for col in self.cursor.description]
-            return [dict(zip(columns, row)) for row in self.cursor.fetchall()]
-        finally:
-            self.disconnect()
+        self.cursor.execute("""
+            SELECT 
+                e.id, 
+                e.date, 
+                e.time, 
+                e.project_id, 
+                e.ticket_id, 
+                e.description, 
+                e.duration, 
+                e.ticket_title,
+                p.name as project_name,
+                t.ticket_number as ticket_number
+            FROM entries e
+            LEFT JOIN projects p ON e.project_id = p.id
+            LEFT JOIN tickets t ON e.ticket_id = t.id
+            WHERE e.is_synced = 0
+            ORDER BY e.date DESC, e.time DESC
+        """)
+        columns = [col[0] for col in self.cursor.description]
+        return [dict(zip(columns, row)) for row in self.cursor.fetchall()]
 
     def mark_entries_as_synced(self, entry_ids):
         """Marque les entrées comme synchronisées."""
-        try:
-            self.connect()
+        with self.transaction():
             self.cursor.executemany("""
                 UPDATE entries
                 SET is_synced = 1
                 WHERE id = ?
             """, [(id,) for id in entry_ids])
-            self.conn.commit()
-        finally:
-            self.disconnect()
+
+    def enqueue_sync(self, entry_ids):
+        """
+        Place des entrées dans la file d'envoi des worklogs.
+        
+        Les entrées déjà envoyées (état 'done') ou en cours d'envoi ne sont pas
+        touchées ; les autres repartent de zéro.
+        
+        Args:
+            entry_ids: IDs des entrées à synchroniser
+        """
+        with self.transaction():
+            self.cursor.executemany("""
+                INSERT INTO sync_outbox (entry_id, ticket_number, state, attempts, next_attempt_at)
+                SELECT e.id, COALESCE(t.ticket_number, ''), 'pending', 0, datetime('now')
+                FROM entries e
+                LEFT JOIN tickets t ON e.ticket_id = t.id
+                WHERE e.id = ?
+                ON CONFLICT(entry_id) DO UPDATE SET
+                    ticket_number = excluded.ticket_number,
+                    state = 'pending',
+                    attempts = 0,
+                    last_error = NULL,
+                    next_attempt_at = excluded.next_attempt_at,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE sync_outbox.state IN ('pending', 'failed')
+            """, [(id,) for id in entry_ids])
+    
+    def get_due_sync_items(self, limit=None):
+        """
+        Récupère les éléments de la file prêts à être envoyés.
+        
+        Args:
+            limit: Nombre maximal d'éléments (tous par défaut)
+            
+        Returns:
+            Liste de dicts : colonnes de l'entrée (comme get_unsynchronized_entries)
+            plus attempts
+        """
+        self.cursor.execute("""
+            SELECT 
+                e.id, 
+                e.date, 
+                e.time, 
+                e.project_id, 
+                e.ticket_id, 
+                e.description, 
+                e.duration, 
+                e.ticket_title,
+                p.name as project_name,
+                o.ticket_number as ticket_number,
+                o.attempts
+            FROM sync_outbox o
+            JOIN entries e ON e.id = o.entry_id
+            LEFT JOIN projects p ON e.project_id = p.id
+            WHERE o.state = 'pending' AND o.next_attempt_at <= datetime('now')
+            ORDER BY o.next_attempt_at, e.date, e.time
+            LIMIT ?
+        """, (limit if limit is not None else -1,))
+        columns = [col[0] for col in self.cursor.description]
+        return [dict(zip(columns, row)) for row in self.cursor.fetchall()]
+    
+    def get_in_flight_sync_items(self, older_than=None):
+        """
+        Récupère les éléments dont l'envoi a été interrompu.
+        
+        Args:
+            older_than: Ne renvoie que les éléments réservés depuis plus de
+                        older_than secondes (tous par défaut)
+        
+        Returns:
+            Liste de dicts : colonnes de l'entrée plus attempts
+        """
+        self.cursor.execute("""
+            SELECT e.id, e.date, e.time, e.description, e.duration, e.ticket_title,
+                   o.ticket_number, o.attempts
+            FROM sync_outbox o
+            JOIN entries e ON e.id = o.entry_id
+            WHERE o.state = 'in_flight' AND o.updated_at <= datetime('now', ?)
+        """, (f"-{int(older_than or 0)} seconds",))
+        columns = [col[0] for col in self.cursor.description]
+        return [dict(zip(columns, row)) for row in self.cursor.fetchall()]
+    
+    def get_sync_outbox_counts(self):
+        """
+        Compte les éléments de la file par état.
+        
+        Returns:
+            Dict {état: nombre}
+        """
+        self.cursor.execute("SELECT state, COUNT(*) FROM sync_outbox GROUP BY state")
+        return dict(self.cursor.fetchall())
+    
+    def claim_sync_item(self, entry_id):
+        """
+        Réserve un élément de la file avant son envoi.
+        
+        Le passage à l'état 'in_flight' est enregistré avant l'appel à Jira :
+        après un arrêt brutal, l'élément sera vérifié au lieu d'être renvoyé.
+        
+        Returns:
+            bool: True si l'élément a été réservé, False s'il n'était plus en attente
+        """
+        with self.transaction():
+            self.cursor.execute("""
+                UPDATE sync_outbox
+                SET state = 'in_flight', attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+                WHERE entry_id = ? AND state = 'pending'
+            """, (entry_id,))
+            return self.cursor.rowcount == 1
+    
+    def complete_sync_item(self, entry_id, worklog_id=None):
+        """
+        Marque un élément comme envoyé et son entrée comme synchronisée.
+        
+        Args:
+            entry_id: ID de l'entrée
+            worklog_id: Identifiant du worklog créé dans Jira
+        """
+        self.complete_sync_items([entry_id], worklog_id)
+    
+    def complete_sync_items(self, entry_ids, worklog_id=None):
+        """
+        Marque des éléments envoyés dans un même worklog et leurs entrées comme synchronisées.
+        
+        Args:
+            entry_ids: IDs des entrées
+            worklog_id: Identifiant du worklog créé dans Jira
+        """
+        with self.transaction():
+            self.cursor.executemany("""
+                UPDATE sync_outbox
+                SET state = 'done', worklog_id = ?, last_error = NULL, updated_at = CURRENT_TIMESTAMP
+                WHERE entry_id = ?
+            """, [(worklog_id, id) for id in entry_ids])
+            self.cursor.executemany("UPDATE entries SET is_synced = 1 WHERE id = ?",
+                                    [(id,) for id in entry_ids])
+    
+    def fail_sync_item(self, entry_id, error, retry_in=None):
+        """
+        Enregistre l'échec de l'envoi d'un élément.
+        
+        Args:
+            entry_id: ID de l'entrée
+            error: Message d'erreur
+            retry_in: Délai en secondes avant la prochaine tentative
+                      (None : échec définitif, l'élément passe à l'état 'failed')
+        """
+        with self.transaction():
+            if retry_in is None:
+                self.cursor.execute("""
+                    UPDATE sync_outbox
+                    SET state = 'failed', last_error = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE entry_id = ?
+                """, (error, entry_id))
+            else:
+                self.cursor.execute("""
+                    UPDATE sync_outbox
+                    SET state = 'pending', last_error = ?,
+                        next_attempt_at = datetime('now', ?),
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE entry_id = ?
+                """, (error, f"+{int(retry_in)} seconds", entry_id))
+    
+    def reset_sync_item(self, entry_id):
+        """Remet un élément interrompu dans la file, à envoyer immédiatement."""
+        with self.transaction():
+            self.cursor.execute("""
+                UPDATE sync_outbox
+                SET state = 'pending', next_attempt_at = datetime('now'), updated_at = CURRENT_TIMESTAMP
+                WHERE entry_id = ? AND state = 'in_flight'
+            """, (entry_id,))
 
     def get_last_ticket(self, project_id):
         """
@@ -566,7 +842,6 @@ class Database:
         Returns:
             Dict avec les informations du ticket ou None si pas de ticket
         """
-        self.connect()
         try:
             query = """
                 SELECT t.* 
@@ -592,9 +867,17 @@ class Database:
         except Exception as e:
             print(f"Erreur lors de la récupération du dernier ticket : {str(e)}")
             return None
-        finally:
-            self.disconnect()
     
+    # Date et heure de dernière utilisation d'un ticket, lues via l'index
+    # idx_entries_ticket_date (une seule ligne par ticket)
+    LAST_USED_SQL = """
+        (SELECT e.date || ' ' || e.time
+         FROM entries e
+         WHERE e.ticket_id = t.id
+         ORDER BY e.date DESC, e.time DESC
+         LIMIT 1)
+    """
+
     def get_project_tickets(self, project_id, include_inactive=False):
         """
         Récupère tous les tickets associés à un projet, triés par date d'utilisation.
@@ -606,55 +889,60 @@ class Database:
         Returns:
             Liste des tickets, triée par date d'utilisation décroissante
         """
-        self.connect()
-        try:
-            query = """
-                SELECT DISTINCT t.ticket_number, t.title, COALESCE(t.is_active, 1) as is_active
-                FROM tickets t
-                LEFT JOIN entries e ON e.ticket_id = t.id
-                WHERE t.project_id = ?
-            """
-            if not include_inactive:
-                query += " AND COALESCE(t.is_active, 1) = 1"
-            query += """
-                GROUP BY t.ticket_number
-                ORDER BY MAX(e.date || ' ' || e.time) DESC NULLS LAST
-            """
-            self.cursor.execute(query, (project_id,))
-            return [{'ticket_number': row['ticket_number'], 'title': row['title'], 'is_active': row['is_active']} for row in self.cursor.fetchall()]
-        finally:
-            self.disconnect()
+        query = f"""
+            SELECT t.ticket_number, t.title, COALESCE(t.is_active, 1) as is_active,
+                   {self.LAST_USED_SQL} as last_used
+            FROM tickets t
+            WHERE t.project_id = ?
+        """
+        if not include_inactive:
+            query += " AND COALESCE(t.is_active, 1) = 1"
+        query += " ORDER BY last_used DESC NULLS LAST"
+        self.cursor.execute(query, (project_id,))
+        return [{'ticket_number': row['ticket_number'], 'title': row['title'], 'is_active': row['is_active']} for row in self.cursor.fetchall()]
 
     def get_all_projects(self, include_inactive=False):
         """
         Récupère tous les projets avec leurs tickets.
         
+        Les projets et leurs tickets sont lus en une seule requête, puis
+        regroupés en Python.
+        
         Args:
             include_inactive: Si True, inclut aussi les projets inactifs
             
         Returns:
             Liste des projets avec leurs tickets
         """
-        self.connect()
-        try:
-            query = "SELECT id, name, is_active FROM projects"
-            if not include_inactive:
-                query += " WHERE is_active = 1"
-            query += " ORDER BY name"
-            
-            self.cursor.execute(query)
-            projects = []
-            for row in self.cursor.fetchall():
-                project = {
+        ticket_filter = "" if include_inactive else " AND COALESCE(t.is_active, 1) = 1"
+        project_filter = "" if include_inactive else " WHERE COALESCE(p.is_active, 1) = 1"
+        self.cursor.execute(f"""
+            SELECT p.id, p.name, COALESCE(p.is_active, 1) as is_active,
+                   t.ticket_number, t.title as ticket_title,
+                   COALESCE(t.is_active, 1) as ticket_is_active,
+                   {self.LAST_USED_SQL} as last_used
+            FROM projects p
+            LEFT JOIN tickets t ON t.project_id = p.id{ticket_filter}
+            {project_filter}
+            ORDER BY p.name, p.id, last_used DESC NULLS LAST
+        """)
+        
+        projects = []
+        for row in self.cursor.fetchall():
+            if not projects or projects[-1]['id'] != row['id']:
+                projects.append({
                     'id': row['id'],
                     'name': row['name'],
                     'is_active': row['is_active'],
-                    'tickets': self.get_project_tickets(row['id'], include_inactive)
-                }
-                projects.append(project)
-            return projects
-        finally:
-            self.disconnect()
+                    'tickets': []
+                })
+            if row['ticket_number'] is not None:
+                projects[-1]['tickets'].append({
+                    'ticket_number': row['ticket_number'],
+                    'title': row['ticket_title'],
+                    'is_active': row['ticket_is_active']
+                })
+        return projects
 
     def toggle_project_active(self, project_id, is_active):
         """
@@ -664,15 +952,11 @@ class Database:
             project_id: ID du projet
             is_active: True pour activer, False pour désactiver
         """
-        self.connect()
-        try:
+        with self.transaction():
             self.cursor.execute(
                 "UPDATE projects SET is_active = ? WHERE id = ?",
                 (1 if is_active else 0, project_id)
             )
-            self.conn.commit()
-        finally:
-            self.disconnect()
 
     def toggle_ticket_active(self, project_id, ticket_number, is_active):
         """
@@ -683,47 +967,119 @@ class Database:
             ticket_number: Numéro du ticket
             is_active: True pour activer, False pour désactiver
         """
-        self.connect()
-        try:
+        with self.transaction():
             self.cursor.execute(
                 "UPDATE tickets SET is_active = ? WHERE project_id = ? AND ticket_number = ?",
                 (1 if is_active else 0, project_id, ticket_number)
             )
-            self.conn.commit()
-        finally:
-            self.disconnect()
 
     def get_entry_by_id(self, entry_id):
         """Récupère une entrée par son ID."""
-        self.connect()
-        try:
-            self.cursor.execute("SELECT * FROM entries WHERE id = ?", (entry_id,))
-            row = self.cursor.fetchone()
-            return dict(row) if row else None
-        finally:
-            self.disconnect()
+        self.cursor.execute("SELECT * FROM entries WHERE id = ?", (entry_id,))
+        row = self.cursor.fetchone()
+        return dict(row) if row else None
 
     def get_total_minutes_for_day(self, date):
         """
         Calcule le total des minutes saisies pour une journée donnée.
         
+        Lit la table d'agrégats daily_totals (une ligne par projet) au lieu
+        de parcourir les entrées.
+        
         Args:
             date: Date pour laquelle calculer le total (format 'YYYY-MM-DD')
             
         Returns:
             Total des minutes saisies
         """
-        self.connect()
-        try:
-            self.cursor.execute("""
-                SELECT SUM(duration) as total_minutes
+        self.cursor.execute("""
+            SELECT SUM(total_minutes) as total_minutes
+            FROM daily_totals
+            WHERE date = ?
+        """, (date,))
+        result = self.cursor.fetchone()
+        return result['total_minutes'] or 0
+
+    def get_day_summary(self, date):
+        """
+        Récupère en une fois les informations du résumé de la fenêtre principale.
+        
+        Args:
+            date: Jour concerné (datetime.date)
+            
+        Returns:
+            dict: total_minutes, unsynced_minutes et last_entry (dernière entrée du jour ou None)
+        """
+        self.cursor.execute("""
+            SELECT * FROM entries
+            WHERE date = ?
+            ORDER BY time DESC
+            LIMIT 1
+        """, (date.isoformat(),))
+        last_entry = self.cursor.fetchone()
+        return {
+            'total_minutes': self.get_total_minutes_for_day(date.isoformat()),
+            'unsynced_minutes': self.get_unsynced_minutes(),
+            'last_entry': dict(last_entry) if last_entry else None
+        }
+
+    def get_unsynced_minutes(self):
+        """
+        Calcule le total des minutes non encore synchronisées.
+        
+        Returns:
+            Total des minutes non synchronisées, toutes dates confondues
+        """
+        self.cursor.execute("""
+            SELECT SUM(unsynced_minutes) as unsynced_minutes
+            FROM daily_totals
+            WHERE unsynced_minutes > 0
+        """)
+        result = self.cursor.fetchone()
+        return result['unsynced_minutes'] or 0
+
+    def check_daily_totals(self, repair=False):
+        """
+        Vérifie la cohérence de daily_totals avec la table entries.
+        
+        Args:
+            repair: Si True, reconstruit les agrégats en cas d'écart
+            
+        Returns:
+            Liste des écarts (date, project_id, agrégat, valeur recalculée)
+        """
+        self.cursor.execute("""
+            WITH expected AS (
+                SELECT date, COALESCE(project_id, 0) AS project_id,
+                       SUM(duration) AS total_minutes,
+                       SUM(CASE WHEN COALESCE(is_synced, 0) = 0 THEN duration ELSE 0 END) AS unsynced_minutes
                 FROM entries
-                WHERE date = ?
-            """, (date,))
-            result = self.cursor.fetchone()
-            return result['total_minutes'] or 0
-        finally:
-            self.disconnect()
+                GROUP BY date, COALESCE(project_id, 0)
+            ),
+            keys AS (
+                SELECT date, project_id FROM expected
+                UNION
+                SELECT date, project_id FROM daily_totals
+            )
+            SELECT k.date, k.project_id,
+                   d.total_minutes, d.unsynced_minutes,
+                   e.total_minutes AS expected_total, e.unsynced_minutes AS expected_unsynced
+            FROM keys k
+            LEFT JOIN daily_totals d ON d.date = k.date AND d.project_id = k.project_id
+            LEFT JOIN expected e ON e.date = k.date AND e.project_id = k.project_id
+            WHERE COALESCE(d.total_minutes, 0) != COALESCE(e.total_minutes, 0)
+               OR COALESCE(d.unsynced_minutes, 0) != COALESCE(e.unsynced_minutes, 0)
+        """)
+        mismatches = [dict(row) for row in self.cursor.fetchall()]
+        if mismatches and repair:
+            self.rebuild_daily_totals()
+        return mismatches
+
+    def rebuild_daily_totals(self):
+        """Reconstruit entièrement la table daily_totals à partir des entrées."""
+        with self.transaction():
+            self.cursor.execute("DELETE FROM daily_totals")
+            self.cursor.execute(REBUILD_DAILY_TOTALS_SQL)
 
     def get_jira_config(self):
         """
@@ -762,7 +1118,6 @@ class Database:
             ORDER BY time DESC
             LIMIT 1
         """
-        self.connect()
         self.cursor.execute(query, (date,))
         last_entry = self.cursor.fetchone()
         
@@ -808,7 +1163,6 @@ class Database:
             ORDER BY p.last_used DESC
             LIMIT ?
         """
-        self.connect()
         self.cursor.execute(query, (project_name, limit))
         return self.cursor.fetchall()
 
@@ -822,13 +1176,11 @@ class Database:
         """
         project_id = self.get_project_id(project_name)
         if project_id:
-            self.connect()
-            self.cursor.execute("""
-                INSERT OR REPLACE INTO epics (key, name, project_id, last_used)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-            """, (key, name, project_id))
-            self.conn.commit()
-            self.disconnect()
+            with self.transaction():
+                self.cursor.execute("""
+                    INSERT OR REPLACE INTO epics (key, name, project_id, last_used)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                """, (key, name, project_id))
 
     def add_feature(self, key, name, project_name):
         """Ajoute ou met à jour une fonctionnalité.
@@ -840,13 +1192,11 @@ class Database:
         """
         project_id = self.get_project_id(project_name)
         if project_id:
-            self.connect()
-            self.cursor.execute("""
-                INSERT OR REPLACE INTO features (key, name, project_id, last_used)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-            """, (key, name, project_id))
-            self.conn.commit()
-            self.disconnect()
+            with self.transaction():
+                self.cursor.execute("""
+                    INSERT OR REPLACE INTO features (key, name, project_id, last_used)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                """, (key, name, project_id))
 
     def add_epic_feature_pair(self, epic_key, feature_key, project_name):
         """Ajoute ou met à jour une paire Epic/Fonctionnalité.
@@ -869,13 +1219,11 @@ class Database:
                 (feature_key, project_id)
             ).fetchone()[0]
             
-            self.connect()
-            self.cursor.execute("""
-                INSERT OR REPLACE INTO epic_feature_pairs (epic_id, feature_id, project_id, last_used)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-            """, (epic_id, feature_id, project_id))
-            self.conn.commit()
-            self.disconnect()
+            with self.transaction():
+                self.cursor.execute("""
+                    INSERT OR REPLACE INTO epic_feature_pairs (epic_id, feature_id, project_id, last_used)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                """, (epic_id, feature_id, project_id))
 
     def set_epic_visibility(self, epic_key, project_name, visible):
         """Change la visibilité d'un epic.
@@ -887,14 +1235,12 @@ class Database:
         """
         project_id = self.get_project_id(project_name)
         if project_id:
-            self.connect()
-            self.cursor.execute("""
-                UPDATE epics
-                SET visible = ?
-                WHERE key = ? AND project_id = ?
-            """, (1 if visible else 0, epic_key, project_id))
-            self.conn.commit()
-            self.disconnect()
+            with self.transaction():
+                self.cursor.execute("""
+                    UPDATE epics
+                    SET visible = ?
+                    WHERE key = ? AND project_id = ?
+                """, (1 if visible else 0, epic_key, project_id))
 
     def set_feature_visibility(self, feature_key, project_name, visible):
         """Change la visibilité d'une fonctionnalité.
@@ -906,27 +1252,22 @@ class Database:
         """
         project_id = self.get_project_id(project_name)
         if project_id:
-            self.connect()
-            self.cursor.execute("""
-                UPDATE features
-                SET visible = ?
-                WHERE key = ? AND project_id = ?
-            """, (1 if visible else 0, feature_key, project_id))
-            self.conn.commit()
-            self.disconnect()
+            with self.transaction():
+                self.cursor.execute("""
+                    UPDATE features
+                    SET visible = ?
+                    WHERE key = ? AND project_id = ?
+                """, (1 if visible else 0, feature_key, project_id))
 
     def get_project_id(self, project_name):
         """Récupère l'ID d'un projet par son nom."""
-        self.connect()
         self.cursor.execute("SELECT id FROM projects WHERE name = ?", (project_name,))
         row = self.cursor.fetchone()
         project_id = row[0] if row else None
-        self.disconnect()
         return project_id
 
     def get_all_subtasks(self):
         """Récupère tous les tickets de la table jira_subtasks."""
-        self.connect()
         self.cursor.execute("""
             SELECT ticket_key, title, path
             FROM jira_subtasks
@@ -942,12 +1283,10 @@ class Database:
             }
             for row in rows
         ]
-        self.disconnect()
         return result
 
     def get_jira_paths(self):
         """Récupère tous les chemins de la table jira_paths."""
-        self.connect()
         self.cursor.execute("""
             SELECT DISTINCT path, ticket_key
             FROM jira_paths
@@ -962,9 +1301,235 @@ class Database:
             }
             for row in rows
         ]
-        self.disconnect()
         return result
 
+    # Profondeur maximale parcourue dans la hiérarchie Jira (protège des cycles)
+    MAX_ISSUE_DEPTH = 32
+
+    # Condition SQL identifiant les sous-tâches dans jira_issues
+    SUBTASK_SQL = "lower({type_column}) IN (" + ", ".join("?" * len(SUBTASK_TYPES)) + ")"
+
+    def get_issue_paths(self, keys=None):
+        """
+        Récupère le chemin projet/epic/fonctionnalité de tickets de jira_issues.
+        
+        Les chemins sont lus dans le cache jira_issue_paths ; ceux qui n'y
+        sont pas sont calculés par une requête récursive sur jira_issues
+        puis mis en cache.
+        
+        Args:
+            keys: Clés des tickets (tous les tickets si None)
+            
+        Returns:
+            dict: Clé du ticket -> chemin
+        """
+        if keys is None:
+            self.cursor.execute("SELECT key, path FROM jira_issue_paths")
+            paths = {row[0]: row[1] for row in self.cursor.fetchall()}
+            self.cursor.execute("""
+                SELECT key FROM jira_issues
+                WHERE key NOT IN (SELECT key FROM jira_issue_paths)
+            """)
+            missing = [row[0] for row in self.cursor.fetchall()]
+        else:
+            keys = list(dict.fromkeys(keys))
+            self.cursor.execute("""
+                SELECT key, path FROM jira_issue_paths
+                WHERE key IN (SELECT value FROM json_each(?))
+            """, (json.dumps(keys),))
+            paths = {row[0]: row[1] for row in self.cursor.fetchall()}
+            missing = [key for key in keys if key not in paths]
+        
+        if not missing:
+            return paths
+        
+        # Lignée de chaque ticket manquant, de la racine jusqu'au ticket
+        self.cursor.execute("""
+            WITH RECURSIVE lineage(key, type, ancestor_key, title, depth) AS (
+                SELECT key, type, parent_key, title, 0
+                FROM jira_issues
+                WHERE key IN (SELECT value FROM json_each(?))
+                UNION ALL
+                SELECT l.key, l.type, p.parent_key, p.title, l.depth + 1
+                FROM lineage l
+                JOIN jira_issues p ON p.key = l.ancestor_key
+                WHERE l.depth < ?
+            )
+            SELECT key, type, title FROM lineage
+            ORDER BY key, depth DESC
+        """, (json.dumps(missing), self.MAX_ISSUE_DEPTH))
+        
+        lineages = {}
+        for key, issue_type, title in self.cursor.fetchall():
+            lineage = lineages.setdefault(key, {'type': issue_type or '', 'parts': []})
+            lineage['parts'].append(title)
+        
+        computed = {
+            key: format_path({'type': lineage['type']}, lineage['parts'])
+            for key, lineage in lineages.items()
+        }
+        with self.transaction():
+            self.cursor.executemany(
+                "INSERT OR REPLACE INTO jira_issue_paths (key, path) VALUES (?, ?)",
+                computed.items()
+            )
+        paths.update(computed)
+        return paths
+
+    def get_issue_subtree(self, keys):
+        """
+        Récupère des tickets de jira_issues et tous leurs descendants.
+        
+        Args:
+            keys: Clé ou liste de clés des tickets racines
+            
+        Returns:
+            Liste des tickets (key, parent_key, type, title, status, depth),
+            depth valant 0 pour les racines
+        """
+        if isinstance(keys, str):
+            keys = [keys]
+        self.cursor.execute("""
+            WITH RECURSIVE subtree(key, depth) AS (
+                SELECT key, 0 FROM jira_issues
+                WHERE key IN (SELECT value FROM json_each(?))
+                UNION
+                SELECT i.key, s.depth + 1
+                FROM jira_issues i
+                JOIN subtree s ON i.parent_key = s.key
+                WHERE s.depth < ?
+            )
+            SELECT i.key, i.parent_key, i.type, i.title, i.status, MIN(s.depth) AS depth
+            FROM subtree s
+            JOIN jira_issues i ON i.key = s.key
+            GROUP BY i.key
+            ORDER BY depth, i.key
+        """, (json.dumps(list(keys)), self.MAX_ISSUE_DEPTH))
+        return [dict(row) for row in self.cursor.fetchall()]
+
+    def get_parent_tickets(self):
+        """
+        Récupère les tickets pouvant recevoir une sous-tâche, avec leur chemin.
+        
+        Returns:
+            Liste de dicts avec 'ticket_key' et 'path', triée par chemin
+        """
+        self.cursor.execute(
+            f"SELECT key FROM jira_issues WHERE NOT {self.SUBTASK_SQL.format(type_column='type')}",
+            SUBTASK_TYPES
+        )
+        keys = [row[0] for row in self.cursor.fetchall()]
+        paths = self.get_issue_paths(keys)
+        tickets = [{'path': paths[key], 'ticket_key': key} for key in keys if paths.get(key)]
+        tickets.sort(key=lambda ticket: (ticket['path'], ticket['ticket_key']))
+        return tickets
+
+    def get_subtask_issues(self):
+        """
+        Récupère les sous-tâches de jira_issues avec le chemin de leur parent.
+        
+        Returns:
+            Liste de dicts avec 'ticket_number', 'title' et 'path', triée par numéro
+        """
+        self.cursor.execute(f"""
+            SELECT s.key, s.title, s.parent_key
+            FROM jira_issues s
+            JOIN jira_issues p ON p.key = s.parent_key
+            WHERE {self.SUBTASK_SQL.format(type_column='s.type')}
+              AND NOT {self.SUBTASK_SQL.format(type_column='p.type')}
+            ORDER BY s.key
+        """, SUBTASK_TYPES + SUBTASK_TYPES)
+        rows = self.cursor.fetchall()
+        paths = self.get_issue_paths({row[2] for row in rows})
+        return [
+            {
+                'ticket_number': row[0],
+                'title': row[1],
+                'path': paths.get(row[2])
+            }
+            for row in rows
+        ]
+
+    def search(self, query, limit=50, kinds=None):
+        """
+        Recherche plein texte dans les entrées et les sous-tâches Jira.
+        
+        Chaque mot saisi est recherché en préfixe (« secu » trouve « sécurité »),
+        tous les mots devant être présents. Seules les SEARCH_WINDOW lignes
+        les plus récentes de chaque index sont retenues (lecture dans l'ordre
+        des rowid, interrompue par LIMIT), puis classées : un mot trouvé dans
+        le numéro de ticket compte plus que dans le titre, lui-même plus que
+        dans la description ou le chemin ; à score égal, la plus récente
+        d'abord. bm25 n'est pas utilisé : il relit toutes les occurrences de
+        chaque mot pour en calculer la fréquence, soit des centaines de
+        millisecondes pour un préfixe courant.
+        
+        Un mot plus long que les index de préfixes (SEARCH_PREFIX_LENGTH
+        caractères) est cherché par son début indexé, puis vérifié en entier
+        sur le texte des lignes lues, dans la limite de SEARCH_SCAN lignes.
+        
+        Args:
+            query: Texte saisi par l'utilisateur
+            limit: Nombre maximum de résultats (plafonné à SEARCH_WINDOW)
+            kinds: Types de résultats à inclure ('entry', 'subtask'), tous par défaut
+            
+        Returns:
+            Liste de dicts avec les clés kind, id, ticket_key, title et body
+        """
+        terms = re.findall(r"\w+", query or "")
+        if not terms:
+            return []
+        # Chaque terme est mis entre guillemets pour neutraliser la syntaxe FTS5
+        match = " ".join(f'"{term[:self.SEARCH_PREFIX_LENGTH]}"*' for term in terms)
+        # Début de mot dans le texte normalisé, pour la vérification et le classement
+        prefixes = [re.compile(r'(?<!\w)' + re.escape(_search_text(term))) for term in terms]
+        truncated = any(len(term) > self.SEARCH_PREFIX_LENGTH for term in terms)
+        
+        scored = []
+        for kind, table in self.SEARCH_TABLES.items():
+            if kinds and kind not in kinds:
+                continue
+            self.cursor.execute(f"""
+                SELECT rowid, ticket_key, title, body
+                FROM {table}
+                WHERE {table} MATCH ?
+                ORDER BY rowid DESC
+                LIMIT ?
+            """, (match, self.SEARCH_SCAN if truncated else self.SEARCH_WINDOW))
+            kept = 0
+            for row in self.cursor:
+                columns = [_search_text(row[column]) for column in ('ticket_key', 'title', 'body')]
+                weights = [
+                    max((weight for text, weight in zip(columns, self.SEARCH_WEIGHTS)
+                         if prefix.search(text)), default=0)
+                    for prefix in prefixes
+                ]
+                if not all(weights):
+                    # Ne contient que le début indexé d'un mot plus long
+                    continue
+                scored.append((sum(weights), row['rowid'], kind, row))
+                kept += 1
+                if kept == self.SEARCH_WINDOW:
+                    break
+        
+        scored.sort(key=lambda item: (-item[0], -item[1]))
+        return [
+            {
+                'kind': kind,
+                'id': row['rowid'],
+                'ticket_key': row['ticket_key'],
+                'title': row['title'],
+                'body': row['body']
+            }
+            for _, _, kind, row in scored[:min(limit, self.SEARCH_WINDOW)]
+        ]
+
+    def rebuild_search_index(self):
+        """Reconstruit entièrement l'index plein texte."""
+        with self.transaction():
+            for statement in REBUILD_SEARCH_INDEX_SQL:
+                self.cursor.execute(statement)
+
     def save_jira_labels(self, labels):
         """
         Sauvegarde les étiquettes Jira dans la base.
@@ -972,8 +1537,7 @@ class Database:
         Args:
             labels: Liste des étiquettes
         """
-        self.connect()
-        try:
+        with self.transaction():
             # Vide la table
             self.cursor.execute("DELETE FROM jira_labels")
             
@@ -983,10 +1547,50 @@ class Database:
                     "INSERT INTO jira_labels (name) VALUES (?)",
                     (label,)
                 )
-            self.conn.commit()
-        finally:
-            self.disconnect()
     
+    def get_cached_issue(self, key):
+        """
+        Lit l'entrée du cache persistant d'un ticket Jira.
+        
+        Args:
+            key: Clé du ticket
+            
+        Returns:
+            dict: data (dict, None pour un ticket inexistant), etag,
+                  last_modified et expires_at ; None si absent du cache
+        """
+        self.cursor.execute("""
+            SELECT data, etag, last_modified, expires_at
+            FROM jira_issue_cache
+            WHERE key = ?
+        """, (key,))
+        row = self.cursor.fetchone()
+        if row is None:
+            return None
+        return {
+            'data': json.loads(row[0]) if row[0] is not None else None,
+            'etag': row[1],
+            'last_modified': row[2],
+            'expires_at': row[3]
+        }
+    
+    def save_cached_issue(self, key, data, etag, last_modified, expires_at):
+        """
+        Enregistre un ticket dans le cache persistant.
+        
+        Args:
+            key: Clé du ticket
+            data: Détails du ticket (None pour un ticket inexistant)
+            etag: En-tête ETag de la réponse
+            last_modified: En-tête Last-Modified de la réponse
+            expires_at: Date d'expiration (timestamp)
+        """
+        with self.transaction():
+            self.cursor.execute("""
+                INSERT OR REPLACE INTO jira_issue_cache (key, data, etag, last_modified, expires_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (key, json.dumps(data) if data is not None else None, etag, last_modified, expires_at))
+
     def get_jira_labels(self):
         """
         Récupère toutes les étiquettes Jira.
@@ -994,9 +1598,5 @@ class Database:
         Returns:
             list: Liste des étiquettes
         """
-        self.connect()
-        try:
-            self.cursor.execute("SELECT name FROM jira_labels ORDER BY name")
-            return [row[0] for row in self.cursor.fetchall()]
-        finally:
-            self.disconnect()
\ No newline at end of file
+        self.cursor.execute("SELECT name FROM jira_labels ORDER BY name")
+        return [row[0] for row in self.cursor.fetchall()]
\ No newline at end of file
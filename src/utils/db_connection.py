@@ -0,0 +1,201 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# Profils de performance appliqués à l'ouverture de chaque connexion.
+# Le profil actif est lu dans la table settings (clé 'db_profile').
+# En mode WAL, les lectures du thread UI ne sont jamais bloquées par
+# l'écriture d'un import en cours.
+DEFAULT_PROFILE = 'balanced'
+PRAGMA_PROFILES = {
+    'safe': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'busy_timeout': 5000,
+        'cache_size': -8000,  # En Kio (valeur négative)
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+    },
+    'balanced': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'cache_size': -16000,
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+    },
+    'fast': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 10000,
+        'cache_size': -64000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+    },
+}
+
+
+class ConnectionManager:
+    """Gestionnaire de connexions SQLite persistantes (une connexion par thread).
+
+    Les connexions sqlite3 ne peuvent pas être partagées entre threads : chaque
+    thread (thread Qt principal, QThread d'import...) obtient donc sa propre
+    connexion, ouverte à la première utilisation puis réutilisée jusqu'à
+    l'appel de close().
+    """
+
+    _managers = {}
+    _managers_lock = threading.Lock()
+
+    def __init__(self, db_path):
+        """Initialise le gestionnaire.
+
+        Args:
+            db_path: Chemin du fichier de base de données
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+
+    @classmethod
+    def for_path(cls, db_path):
+        """Retourne le gestionnaire partagé pour un fichier de base de données.
+
+        Toutes les instances de Database d'un même processus partagent ainsi
+        la même connexion dans un thread donné.
+        """
+        with cls._managers_lock:
+            manager = cls._managers.get(db_path)
+            if manager is None:
+                manager = cls(db_path)
+                cls._managers[db_path] = manager
+            return manager
+
+    def _open(self):
+        """Ouvre une nouvelle connexion pour le thread courant."""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        self.apply_profile(conn, self._read_profile_name(conn))
+        return conn
+
+    @staticmethod
+    def _read_profile_name(conn):
+        """Lit le nom du profil de performance dans la table settings."""
+        try:
+            row = conn.execute(
+                "SELECT value FROM settings WHERE key = 'db_profile'"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            # Table settings pas encore créée (première ouverture)
+            return DEFAULT_PROFILE
+        return row[0] if row and row[0] in PRAGMA_PROFILES else DEFAULT_PROFILE
+
+    @staticmethod
+    def apply_profile(conn, profile_name):
+        """Applique un profil de PRAGMA à une connexion.
+
+        Args:
+            conn: Connexion SQLite
+            profile_name: Nom du profil (voir PRAGMA_PROFILES)
+        """
+        profile = PRAGMA_PROFILES.get(profile_name, PRAGMA_PROFILES[DEFAULT_PROFILE])
+        # busy_timeout en premier pour que le passage en WAL attende un éventuel verrou
+        conn.execute(f"PRAGMA busy_timeout = {int(profile['busy_timeout'])}")
+        conn.execute(f"PRAGMA journal_mode = {profile['journal_mode']}")
+        conn.execute(f"PRAGMA synchronous = {profile['synchronous']}")
+        conn.execute(f"PRAGMA cache_size = {int(profile['cache_size'])}")
+        conn.execute(f"PRAGMA mmap_size = {int(profile['mmap_size'])}")
+        conn.execute(f"PRAGMA temp_store = {profile['temp_store']}")
+
+    def get_connection(self):
+        """Retourne la connexion du thread courant, en l'ouvrant si nécessaire."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            self._local.cursor = conn.cursor()
+            self._local.depth = 0
+            self._local.on_commit = []
+        return conn
+
+    def get_cursor(self):
+        """Retourne le curseur associé à la connexion du thread courant."""
+        self.get_connection()
+        return self._local.cursor
+
+    @contextmanager
+    def transaction(self):
+        """Exécute un bloc dans une transaction.
+
+        Le bloc le plus externe ouvre la transaction, la valide à sa sortie
+        et l'annule en cas d'exception (ou si la validation échoue). Chaque
+        bloc imbriqué pose un SAVEPOINT : une exception ne défait que ses
+        propres écritures, même si l'appelant l'intercepte ensuite. Les
+        fonctions enregistrées par on_commit dans un bloc annulé sont
+        oubliées avec ses écritures.
+
+        Yields:
+            sqlite3.Connection: Connexion du thread courant
+        """
+        conn = self.get_connection()
+        depth = self._local.depth
+        savepoint = f"sp_{depth}"
+        callbacks = self._local.on_commit
+        mark = len(callbacks)
+        if depth == 0:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+        else:
+            conn.execute(f"SAVEPOINT {savepoint}")
+        self._local.depth = depth + 1
+        try:
+            yield conn
+        except BaseException:
+            self._local.depth = depth
+            del callbacks[mark:]
+            if depth == 0:
+                conn.rollback()
+            else:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+            raise
+        self._local.depth = depth
+        if depth == 0:
+            try:
+                conn.commit()
+            except BaseException:
+                # Ne laisse pas une transaction ouverte (ex: SQLITE_BUSY)
+                callbacks.clear()
+                conn.rollback()
+                raise
+            committed = callbacks[:]
+            callbacks.clear()
+            for callback in committed:
+                callback()
+        else:
+            conn.execute(f"RELEASE {savepoint}")
+
+    def on_commit(self, callback):
+        """Appelle callback une fois la transaction en cours validée.
+
+        Hors transaction, callback est appelé immédiatement. Si la
+        transaction, ou le bloc imbriqué dans lequel callback a été
+        enregistré, est annulée, callback n'est jamais appelé.
+
+        Args:
+            callback: Fonction sans argument
+        """
+        self.get_connection()
+        if self._local.depth == 0:
+            callback()
+        else:
+            self._local.on_commit.append(callback)
+
+    def close(self):
+        """Ferme la connexion du thread courant."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+            self._local.cursor = None
+            self._local.depth = 0
+            self._local.on_commit = []
@@ -0,0 +1,128 @@
+import queue
+import threading
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from utils.db_connection import ConnectionManager
+
+
+class DbTask(QObject):
+    """Résultat d'une opération exécutée par le DbExecutor.
+
+    Les signaux sont émis depuis le thread de l'exécuteur et livrés aux
+    slots dans le thread de l'interface (connexion en file d'attente).
+    """
+    finished = pyqtSignal(object)  # Valeur de retour de la fonction
+    failed = pyqtSignal(str)  # Message d'erreur
+
+    def __init__(self, fn, args, kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.cancelled = False
+        self._on_cancel = None
+
+    def cancel(self):
+        """Annule la tâche (depuis le thread de l'interface).
+
+        Une tâche encore en file n'est pas exécutée ; une tâche déjà en
+        cours se termine, mais n'émet ni finished ni failed.
+        """
+        if self.cancelled:
+            return
+        self.cancelled = True
+        if self._on_cancel:
+            self._on_cancel()
+
+
+class DbExecutor:
+    """Exécute les accès à la base dans un thread dédié.
+
+    Le thread de l'exécuteur possède sa propre connexion SQLite (voir
+    ConnectionManager). Les fenêtres y envoient leurs lectures et écritures
+    sur les entrées, projets et tickets : l'interface reste fluide même si
+    une requête est lente ou si un import détient le verrou d'écriture.
+    
+    Restent sur le thread principal les lectures et écritures de paramètres
+    (table settings, quelques lignes lues par clé) et la vue des entrées
+    (EntriesDialog), qui lit au plus huit jours page par page.
+    """
+
+    _executors = {}
+    _executors_lock = threading.Lock()
+
+    def __init__(self, db_path):
+        """Initialise l'exécuteur et démarre son thread.
+
+        Args:
+            db_path: Chemin du fichier de base de données
+        """
+        self.db_path = db_path
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._thread = threading.Thread(target=self._run, name="DbExecutor", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def for_path(cls, db_path):
+        """Retourne l'exécuteur partagé pour un fichier de base de données."""
+        with cls._executors_lock:
+            executor = cls._executors.get(db_path)
+            if executor is None:
+                executor = cls(db_path)
+                cls._executors[db_path] = executor
+            return executor
+
+    def submit(self, fn, *args, **kwargs):
+        """Programme l'exécution de fn(*args, **kwargs) dans le thread de l'exécuteur.
+
+        Doit être appelé depuis le thread de l'interface.
+
+        Returns:
+            DbTask: Objet dont les signaux finished/failed portent le résultat
+        """
+        task = DbTask(fn, args, kwargs)
+        # Garde une référence jusqu'à la livraison des signaux
+        self._pending.add(task)
+        task.finished.connect(lambda _result, t=task: self._release(t))
+        task.failed.connect(lambda _error, t=task: self._release(t))
+        task._on_cancel = lambda t=task: self._release(t)
+        # La tâche n'est mise en file qu'au retour dans la boucle d'événements :
+        # l'appelant a ainsi connecté ses slots avant que le résultat soit émis
+        QTimer.singleShot(0, lambda: self._queue.put(task))
+        return task
+
+    def _release(self, task):
+        """Libère la tâche une fois tous ses slots appelés."""
+        QTimer.singleShot(0, lambda: self._pending.discard(task))
+
+    def _run(self):
+        """Boucle du thread de l'exécuteur."""
+        while True:
+            task = self._queue.get()
+            if task is None:
+                break
+            if task.cancelled:
+                continue
+            try:
+                result = task.fn(*task.args, **task.kwargs)
+            except Exception as e:
+                if not task.cancelled:
+                    task.failed.emit(str(e))
+            else:
+                if not task.cancelled:
+                    task.finished.emit(result)
+        ConnectionManager.for_path(self.db_path).close()
+
+    def shutdown(self, wait=True):
+        """Arrête le thread après les tâches déjà soumises."""
+        self._queue.put(None)
+        if wait:
+            self._thread.join()
+        with DbExecutor._executors_lock:
+            DbExecutor._executors.pop(self.db_path, None)
+
+    @classmethod
+    def shutdown_all(cls):
+        """Arrête tous les exécuteurs (à la fermeture de l'application)."""
+        for executor in list(cls._executors.values()):
+            executor.shutdown()
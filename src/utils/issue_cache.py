@@ -0,0 +1,109 @@
+"""Cache à deux niveaux des détails de tickets Jira (get_issue_details).
+
+Un LRU en mémoire, partagé par tous les clients d'un même fichier de base,
+sert les tickets fréquents sans accès disque ; la table jira_issue_cache
+conserve les entrées d'une session à l'autre avec leur date d'expiration
+et les en-têtes ETag / Last-Modified utilisés pour les revalider. Les
+tickets inexistants (404) sont aussi mis en cache, pour une durée plus
+courte.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+# Durée de validité d'un ticket en cache (secondes)
+ISSUE_CACHE_TTL = 3600
+# Durée de validité d'un ticket inexistant (404)
+MISSING_ISSUE_TTL = 600
+# Nombre de tickets conservés en mémoire
+ISSUE_CACHE_SIZE = 500
+
+
+class IssueCache:
+    """Cache LRU en mémoire adossé à la table jira_issue_cache.
+
+    Chaque entrée est un dict (data, etag, last_modified, expires_at), data
+    valant None pour un ticket inexistant.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db, size=ISSUE_CACHE_SIZE, ttl=ISSUE_CACHE_TTL, missing_ttl=MISSING_ISSUE_TTL):
+        """Initialise le cache.
+
+        Args:
+            db: Base de données (Database)
+            size: Nombre de tickets conservés en mémoire
+            ttl: Durée de validité d'un ticket (secondes)
+            missing_ttl: Durée de validité d'un ticket inexistant (secondes)
+        """
+        self.db = db
+        self.size = size
+        self.ttl = ttl
+        self.missing_ttl = missing_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_database(cls, db):
+        """Renvoie le cache partagé d'un fichier de base (créé au premier appel)."""
+        with cls._instances_lock:
+            cache = cls._instances.get(db.db_path)
+            if cache is None:
+                cache = cls(db)
+                cls._instances[db.db_path] = cache
+            return cache
+
+    def _remember(self, key, entry):
+        """Place une entrée en tête du LRU en mémoire."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def lookup(self, key):
+        """Cherche un ticket en mémoire puis dans la base, même expiré.
+
+        Returns:
+            dict: Entrée du cache ou None si le ticket n'y est pas
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        try:
+            entry = self.db.get_cached_issue(key)
+        except Exception as e:
+            print(f"Erreur lors de la lecture du cache du ticket {key}: {str(e)}")
+            return None
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    @staticmethod
+    def is_fresh(entry):
+        """Indique si une entrée peut être servie sans interroger Jira."""
+        return entry['expires_at'] > time.time()
+
+    def store(self, key, data, etag=None, last_modified=None):
+        """Enregistre un ticket (data=None pour un ticket inexistant) dans les deux niveaux."""
+        ttl = self.ttl if data is not None else self.missing_ttl
+        entry = {
+            'data': data,
+            'etag': etag,
+            'last_modified': last_modified,
+            'expires_at': time.time() + ttl
+        }
+        self._remember(key, entry)
+        try:
+            self.db.save_cached_issue(key, data, etag, last_modified, entry['expires_at'])
+        except Exception as e:
+            print(f"Erreur lors de l'enregistrement du cache du ticket {key}: {str(e)}")
+        return entry
+
+    def revalidate(self, key, entry):
+        """Prolonge une entrée confirmée par Jira (réponse 304)."""
+        return self.store(key, entry['data'], entry['etag'], entry['last_modified'])
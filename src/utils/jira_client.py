@@ -1,20 +1,91 @@
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 import base64
+import itertools
 import os
 import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from utils.rate_limiter import JiraRateLimiter
+
+# Codes HTTP pour lesquels une requête est retentée.
+# 429 et 503 signifient que Jira n'a pas traité la requête : on peut les
+# retenter quelle que soit la méthode. 502 et 504 ne sont retentés que pour
+# les méthodes idempotentes (le serveur a pu traiter la requête).
+RETRY_ALWAYS_STATUSES = {429, 503}
+RETRY_IDEMPOTENT_STATUSES = {502, 504}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+# Décalage horaire appliqué à l'heure de début des worklogs envoyés
+WORKLOG_UTC_OFFSET = '+0100'
+# Durée de validité des worklogs déjà lus (secondes)
+WORKLOG_CACHE_TTL = 300
+
+# Format d'une clé de ticket Jira (ex: PROJ-123)
+ISSUE_KEY_PATTERN = re.compile(r'^[A-Z][A-Z0-9_]*-\d+$', re.IGNORECASE)
+
+# Profils de projection : seuls les champs lus par chaque appelant sont
+# demandés à Jira, sans expansion (names, schema, transitions...) coûteuse
+# à calculer et à sérialiser côté serveur.
+FIELD_PROFILES = {
+    # Import de la hiérarchie (iter_search_pages / search_issues)
+    'hierarchy': {
+        'fields': [
+            'summary',
+            'issuetype',
+            'parent',
+            'customfield_10014',  # Epic link
+            'project',
+            'issuelinks',
+            'status'
+        ],
+        'expand': []
+    },
+    # Recherche du titre d'un ticket (get_issue_details)
+    'title': {
+        'fields': ['summary', 'description'],
+        'expand': []
+    },
+    # Rafraîchissement des titres en masse (get_issue_titles)
+    'summary': {
+        'fields': ['summary'],
+        'expand': []
+    },
+    # Collecte des étiquettes (get_labels)
+    'labels': {
+        'fields': ['labels'],
+        'expand': []
+    },
+}
 
 
 class JiraClient:
     """Client pour l'API Jira."""
     
-    def __init__(self, base_url, token, email):
+    def __init__(self, base_url, token, email, pool_size=10, timeout=(5, 30),
+                 max_retries=3, backoff_factor=0.5, max_backoff=30, max_workers=8,
+                 rate_limiter=None, issue_cache=None):
         """Initialise le client Jira.
         
         Args:
             base_url: URL de base de l'instance Jira (ex: mycompany.atlassian.net)
             token: Token d'accès à l'API Jira
             email: Email associé au compte Jira
+            pool_size: Nombre de connexions HTTP conservées ouvertes
+            timeout: Délai (connexion, lecture) en secondes de chaque requête
+            max_retries: Nombre de tentatives supplémentaires en cas d'échec temporaire
+            backoff_factor: Délai de base en secondes du backoff exponentiel
+            max_backoff: Délai d'attente maximal en secondes entre deux tentatives
+            max_workers: Nombre maximal de requêtes envoyées en parallèle
+            rate_limiter: Limiteur du trafic (JiraRateLimiter) ; par défaut celui
+                          partagé par tous les clients de la même instance Jira
+            issue_cache: Cache des détails de tickets (IssueCache), optionnel
         """
         # Nettoie l'URL de base
         base_url = base_url.strip().rstrip('/')
@@ -29,6 +100,117 @@ class JiraClient:
             'Content-Type': 'application/json',
             'Accept': 'application/json'
         }
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_workers = max(1, min(max_workers, pool_size))
+        self.rate_limiter = rate_limiter or JiraRateLimiter.for_host(base_url)
+        self.issue_cache = issue_cache
+        
+        # Epic de chaque ticket déjà résolu via l'API agile (None si aucun)
+        self._epic_cache = {}
+        self._epic_cache_lock = threading.Lock()
+        
+        # Worklogs déjà lus par ticket : clé -> (instant de lecture, worklogs)
+        self._worklog_cache = {}
+        self._worklog_cache_lock = threading.Lock()
+        self._myself = None
+        
+        # Session partagée : les connexions (TCP + TLS) sont réutilisées
+        # d'une requête à l'autre au lieu d'être renégociées à chaque appel
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def close(self):
+        """Ferme les connexions HTTP de la session."""
+        self.session.close()
+    
+    def metrics(self):
+        """Métriques du limiteur de trafic (débits, attentes, 429 reçus, concurrence)."""
+        return self.rate_limiter.metrics()
+    
+    def _retry_delay(self, attempt, response=None):
+        """Calcule le délai avant la prochaine tentative.
+        
+        Utilise l'en-tête Retry-After s'il est présent, sinon un backoff
+        exponentiel avec gigue.
+        
+        Args:
+            attempt: Numéro de la tentative échouée (0 pour la première)
+            response: Réponse HTTP reçue, le cas échéant
+            
+        Returns:
+            float: Délai en secondes
+        """
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                # Format date HTTP
+                try:
+                    delay = (parsedate_to_datetime(retry_after) - datetime.now().astimezone()).total_seconds()
+                except (TypeError, ValueError):
+                    delay = None
+            if delay is not None:
+                return min(max(delay, 0), self.max_backoff)
+        
+        delay = self.backoff_factor * (2 ** attempt)
+        return min(delay + random.uniform(0, delay), self.max_backoff)
+    
+    def _request(self, method, path, **kwargs):
+        """Exécute une requête HTTP avec la session partagée.
+        
+        Les erreurs temporaires (429, 503, erreurs réseau...) sont retentées
+        jusqu'à max_retries fois. Chaque tentative passe par le limiteur de
+        trafic partagé, qui ralentit toutes les requêtes après un 429.
+        
+        Args:
+            method: Méthode HTTP (GET, POST...)
+            path: Chemin de l'API (ex: /rest/api/3/search)
+            **kwargs: Arguments transmis à requests.Session.request
+            
+        Returns:
+            requests.Response: Dernière réponse obtenue
+        """
+        method = method.upper()
+        kwargs.setdefault('timeout', self.timeout)
+        idempotent = method in IDEMPOTENT_METHODS
+        url = f"{self.base_url}{path}"
+        
+        attempt = 0
+        while True:
+            try:
+                with self.rate_limiter.slot(method, path):
+                    response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                # Une erreur de connexion peut survenir après l'envoi de la requête :
+                # on ne retente que les méthodes idempotentes
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+                time.sleep(self._retry_delay(attempt))
+                attempt += 1
+                continue
+            
+            delay = None
+            if response.status_code == 429:
+                # Jira limite le débit : toutes les requêtes vers l'instance ralentissent
+                delay = self._retry_delay(attempt, response)
+                self.rate_limiter.throttled(method, delay, path)
+            else:
+                self.rate_limiter.succeeded(method, path)
+            
+            retryable = (response.status_code in RETRY_ALWAYS_STATUSES or
+                         (idempotent and response.status_code in RETRY_IDEMPOTENT_STATUSES))
+            if not retryable or attempt >= self.max_retries:
+                return response
+            
+            time.sleep(delay if delay is not None else self._retry_delay(attempt, response))
+            attempt += 1
     
     def _encode_credentials(self, email, token):
         """Encode les identifiants en Base64 pour l'authentification Basic."""
@@ -38,6 +220,11 @@ class JiraClient:
     def get_issue_details(self, issue_key):
         """Récupère les détails d'un ticket.
         
+        Avec un cache (issue_cache), un ticket encore valide est servi sans
+        appel réseau ; une entrée expirée est revalidée par une requête
+        conditionnelle (If-None-Match / If-Modified-Since) et un ticket
+        inexistant n'est pas redemandé avant l'expiration du cache négatif.
+        
         Args:
             issue_key: Identifiant du ticket (ex: PROJ-123)
             
@@ -45,31 +232,99 @@ class JiraClient:
             dict: Détails du ticket ou None si erreur
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/rest/api/3/issue/{issue_key}",
-                headers=self.headers
-            )
+            cached = self.issue_cache.lookup(issue_key) if self.issue_cache else None
+            if cached is not None and self.issue_cache.is_fresh(cached):
+                return cached['data']
+            
+            profile = FIELD_PROFILES['title']
+            params = {'fields': ','.join(profile['fields'])}
+            if profile['expand']:
+                params['expand'] = ','.join(profile['expand'])
+            headers = {}
+            if cached is not None and cached['data'] is not None:
+                if cached['etag']:
+                    headers['If-None-Match'] = cached['etag']
+                if cached['last_modified']:
+                    headers['If-Modified-Since'] = cached['last_modified']
+            response = self._request('GET', f"/rest/api/3/issue/{issue_key}", params=params,
+                                     headers=headers or None)
+            
+            # Ticket inchangé depuis la mise en cache
+            if response.status_code == 304 and cached is not None:
+                self.issue_cache.revalidate(issue_key, cached)
+                return cached['data']
             
             # Si le ticket n'existe pas, on retourne silencieusement None
             if response.status_code == 404:
+                if self.issue_cache:
+                    self.issue_cache.store(issue_key, None)
                 return None
                 
             response.raise_for_status()
             data = response.json()
             
-            return {
+            issue = {
                 'key': data['key'],
                 'summary': data['fields']['summary'],
                 'description': data['fields'].get('description', '')
             }
+            if self.issue_cache:
+                self.issue_cache.store(issue_key, issue, response.headers.get('ETag'),
+                                       response.headers.get('Last-Modified'))
+            return issue
         except Exception as e:
-            if isinstance(e, requests.exceptions.RequestException):
+            if isinstance(e, requests.exceptions.RequestException) and e.response is not None:
                 if e.response.status_code != 404:  # On n'affiche pas les erreurs 404
                     print(f"Erreur API Jira pour {issue_key} - Status: {e.response.status_code}, Response: {e.response.text}")
             else:
                 print(f"Erreur lors de la récupération du ticket {issue_key}: {str(e)}")
             return None
     
+    def create_worklog(self, issue_key, time_spent_minutes, comment, started_datetime=None, properties=None):
+        """Crée un worklog sur un ticket.
+        
+        Args:
+            issue_key: Identifiant du ticket (ex: PROJ-123)
+            time_spent_minutes: Temps passé en minutes
+            comment: Commentaire à ajouter
+            started_datetime: Date et heure de début du travail (datetime)
+            properties: Propriétés à attacher au worklog ({clé: valeur})
+            
+        Returns:
+            str: Identifiant du worklog créé
+            
+        Raises:
+            requests.exceptions.RequestException: En cas d'erreur réseau ou HTTP
+        """
+        # Convertit les minutes en format Jira (ex: 2h 30m)
+        hours = time_spent_minutes // 60
+        minutes = time_spent_minutes % 60
+        time_spent = ""
+        if hours > 0:
+            time_spent += f"{hours}h"
+        if minutes > 0:
+            time_spent += f" {minutes}m"
+        time_spent = time_spent.strip()
+        
+        # Utilise la date fournie ou la date actuelle
+        if started_datetime is None:
+            started_datetime = datetime.now()
+        
+        data = {
+            'timeSpent': time_spent,
+            'comment': comment,
+            'started': started_datetime.strftime('%Y-%m-%dT%H:%M:%S.000') + WORKLOG_UTC_OFFSET
+        }
+        if properties:
+            data['properties'] = [{'key': key, 'value': value} for key, value in properties.items()]
+        
+        response = self._request('POST', f"/rest/api/2/issue/{issue_key}/worklog", json=data)
+        response.raise_for_status()
+        # Les worklogs du ticket en cache ne sont plus à jour
+        with self._worklog_cache_lock:
+            self._worklog_cache.pop(issue_key, None)
+        return str(response.json().get('id', ''))
+    
     def add_worklog(self, issue_key, time_spent_minutes, comment, started_datetime=None):
         """Ajoute un temps passé sur un ticket.
         
@@ -83,185 +338,364 @@ class JiraClient:
             bool: True si succès, False si erreur
         """
         try:
-            # Convertit les minutes en format Jira (ex: 2h 30m)
-            hours = time_spent_minutes // 60
-            minutes = time_spent_minutes % 60
-            time_spent = ""
-            if hours > 0:
-                time_spent += f"{hours}h"
-            if minutes > 0:
-                time_spent += f" {minutes}m"
-            time_spent = time_spent.strip()
-            
-            # Utilise la date fournie ou la date actuelle
-            if started_datetime is None:
-                started_datetime = datetime.now()
-            
-            data = {
-                'timeSpent': time_spent,
-                'comment': comment,
-                'started': started_datetime.strftime('%Y-%m-%dT%H:%M:%S.000+0100')
-            }
-            
-            response = requests.post(
-                f"{self.base_url}/rest/api/2/issue/{issue_key}/worklog",
-                headers=self.headers,
-                json=data
-            )
-            response.raise_for_status()
+            self.create_worklog(issue_key, time_spent_minutes, comment, started_datetime)
             return True
             
         except Exception as e:
             print(f"Erreur lors de l'ajout du temps sur le ticket {issue_key}: {str(e)}")
             return False
+    
+    def get_worklogs(self, issue_key, expand_properties=False):
+        """Récupère tous les worklogs d'un ticket.
+        
+        Args:
+            issue_key: Identifiant du ticket (ex: PROJ-123)
+            expand_properties: Inclut les propriétés de chaque worklog
             
-    def search_issues(self, jql, fields=None, max_results=1000):
-        """Recherche des tickets selon un JQL.
+        Returns:
+            list: Worklogs du ticket (format de l'API Jira)
+            
+        Raises:
+            requests.exceptions.RequestException: En cas d'erreur réseau ou HTTP
+        """
+        worklogs = []
+        params = {'startAt': 0, 'maxResults': 5000}
+        if expand_properties:
+            params['expand'] = 'properties'
+        
+        while True:
+            response = self._request('GET', f"/rest/api/2/issue/{issue_key}/worklog", params=params)
+            response.raise_for_status()
+            data = response.json()
+            page = data.get('worklogs', [])
+            worklogs.extend(page)
+            params['startAt'] += len(page)
+            if not page or params['startAt'] >= data.get('total', 0):
+                break
+        return worklogs
+    
+    def get_worklogs_for_issues(self, issue_keys):
+        """Récupère les worklogs (avec leurs propriétés) d'un lot de tickets.
+        
+        Les tickets lus depuis moins de WORKLOG_CACHE_TTL secondes sont servis
+        depuis le cache, les autres sont interrogés en parallèle (au plus
+        max_workers requêtes simultanées).
+        
+        Args:
+            issue_keys: Identifiants des tickets
+            
+        Returns:
+            dict: Clé du ticket -> worklogs ; les tickets dont la lecture a
+                  échoué sont absents du résultat
+        """
+        now = time.monotonic()
+        result = {}
+        with self._worklog_cache_lock:
+            for key in dict.fromkeys(issue_keys):
+                cached = self._worklog_cache.get(key)
+                if cached and now - cached[0] < WORKLOG_CACHE_TTL:
+                    result[key] = cached[1]
+        missing = [key for key in dict.fromkeys(issue_keys) if key not in result]
+        
+        def fetch(issue_key):
+            try:
+                return self.get_worklogs(issue_key, expand_properties=True)
+            except Exception as e:
+                print(f"Erreur lors de la lecture des worklogs du ticket {issue_key}: {str(e)}")
+                return None
+        
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                fetched = list(executor.map(fetch, missing))
+            with self._worklog_cache_lock:
+                for key, worklogs in zip(missing, fetched):
+                    if worklogs is not None:
+                        self._worklog_cache[key] = (now, worklogs)
+                        result[key] = worklogs
+        return result
+    
+    def get_myself(self):
+        """Récupère (une seule fois) l'utilisateur connecté.
+        
+        Returns:
+            dict: Utilisateur Jira (accountId, name, emailAddress...)
+        """
+        if self._myself is None:
+            response = self._request('GET', "/rest/api/2/myself")
+            response.raise_for_status()
+            self._myself = response.json()
+        return self._myself
+            
+    def _fetch_epic_key(self, issue_key):
+        """Interroge l'API agile pour trouver l'epic d'un ticket.
+        
+        Args:
+            issue_key: Identifiant du ticket
+            
+        Returns:
+            str: Clé de l'epic, ou None si le ticket n'a pas d'epic (404)
+            
+        Raises:
+            requests.exceptions.RequestException: Pour toute autre réponse ou
+                erreur réseau : l'epic reste alors inconnu
+        """
+        response = self._request('GET', f"/rest/agile/1.0/issue/{issue_key}/epic")
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json().get('key')
+    
+    def _resolve_epics(self, issue_keys):
+        """Résout l'epic d'un lot de tickets.
+        
+        Les tickets déjà résolus sont servis depuis le cache, les autres sont
+        interrogés en parallèle (au plus max_workers requêtes simultanées).
+        Seules les réponses définitives (200 ou 404) sont mémorisées : un
+        ticket dont la requête a échoué (429, 5xx, 403 sans Agile, erreur
+        réseau) est traité comme sans epic pour cette recherche et sera de
+        nouveau interrogé à la suivante.
+        
+        Args:
+            issue_keys: Identifiants des tickets
+            
+        Returns:
+            dict: Clé du ticket -> clé de l'epic (ou None)
+        """
+        with self._epic_cache_lock:
+            missing = [key for key in dict.fromkeys(issue_keys) if key not in self._epic_cache]
+        
+        if missing:
+            resolved = {}
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                futures = {executor.submit(self._fetch_epic_key, key): key for key in missing}
+                for future, key in futures.items():
+                    try:
+                        resolved[key] = future.result()
+                    except Exception as e:
+                        print(f"Erreur lors de la recherche de l'epic de {key}: {str(e)}")
+            with self._epic_cache_lock:
+                self._epic_cache.update(resolved)
+        
+        with self._epic_cache_lock:
+            # Epic inconnu après une erreur : None, le projet devient le parent
+            return {key: self._epic_cache.get(key) for key in issue_keys}
+    
+    def _search_page(self, jql, fields, expand, start_at, max_results, validate_query=None):
+        """Récupère une page de résultats de recherche.
         
         Args:
             jql: Requête JQL
             fields: Liste des champs à récupérer
+            expand: Liste des expansions à demander (peut être vide)
+            start_at: Index du premier résultat
+            max_results: Taille de la page
+            validate_query: Validation du JQL ('strict', 'warn' ou 'none'),
+                            valeur par défaut de Jira si None
+            
+        Returns:
+            dict: Réponse JSON de l'API (issues, total, maxResults...)
+        """
+        payload = {
+            'jql': jql,
+            'fields': fields,
+            'startAt': start_at,
+            'maxResults': max_results
+        }
+        if expand:
+            payload['expand'] = expand
+        if validate_query:
+            payload['validateQuery'] = validate_query
+        response = self._request('POST', "/rest/api/3/search", json=payload)
+        response.raise_for_status()
+        return response.json()
+    
+    def _parse_issues(self, issues):
+        """Convertit les tickets bruts de l'API et détermine leur parent.
+        
+        Args:
+            issues: Tickets tels que renvoyés par la recherche
+            
+        Returns:
+            list: Tickets (key, title, type, parent_key, status)
+        """
+        parsed = []
+        # Tickets dont l'epic doit être cherché via l'API agile
+        unresolved = []
+        
+        for issue in issues:
+            issue_type = issue['fields']['issuetype']['name'].lower()
+            parent_key = None
+            
+            # Pour les sous-tâches, le parent est dans le champ 'parent'
+            if 'parent' in issue['fields'] and issue['fields']['parent']:
+                parent_key = issue['fields']['parent']['key']
+            
+            # Pour les stories/tasks, le parent est l'epic
+            elif 'customfield_10014' in issue['fields'] and issue['fields']['customfield_10014']:
+                parent_key = issue['fields']['customfield_10014']
+            
+            # Pour les epics, on cherche un lien vers un autre epic
+            elif issue_type == 'epic' and 'issuelinks' in issue['fields']:
+                for link in issue['fields']['issuelinks']:
+                    # On cherche les liens de type "is part of" ou similaire
+                    if 'inwardIssue' in link and link.get('type', {}).get('name', '').lower() in ['is part of', 'belongs to', 'implements']:
+                        parent_key = link['inwardIssue']['key']
+                        break
+            
+            # Si aucun parent n'est trouvé et que ce n'est pas un projet
+            if parent_key is None and issue_type != 'project':
+                # Pour les epics sans parent, on met le projet comme parent
+                if issue_type == 'epic':
+                    parent_key = issue['fields']['project']['key']
+                # Pour les autres types, l'epic parent est résolu en lot ensuite
+                else:
+                    unresolved.append((len(parsed), issue))
+            
+            parsed.append({
+                'key': issue['key'],
+                'title': issue['fields']['summary'],
+                'type': issue_type,
+                'parent_key': parent_key,
+                'status': issue['fields']['status']['name']
+            })
+        
+        # Résout les epics manquants en un seul lot
+        if unresolved:
+            epics = self._resolve_epics([issue['key'] for _, issue in unresolved])
+            for index, issue in unresolved:
+                # Sans epic, le projet devient le parent
+                parsed[index]['parent_key'] = epics[issue['key']] or issue['fields']['project']['key']
+        
+        return parsed
+    
+    def iter_search_pages(self, jql, fields=None, max_results=1000, expand=None):
+        """Parcourt les résultats d'une recherche JQL page par page.
+        
+        La première page indique le nombre total de résultats : les pages
+        suivantes sont alors récupérées en parallèle (au plus max_workers
+        requêtes en cours) et restituées dans l'ordre, au fur et à mesure
+        de leur arrivée. Les erreurs de l'API sont propagées.
+        
+        Args:
+            jql: Requête JQL
+            fields: Liste des champs à récupérer (profil 'hierarchy' par défaut)
             max_results: Nombre maximum de résultats à récupérer
+            expand: Liste des expansions à demander (aucune par défaut)
+            
+        Yields:
+            tuple: (tickets de la page, nombre total de tickets attendus)
+        """
+        profile = FIELD_PROFILES['hierarchy']
+        if fields is None:
+            fields = profile['fields']
+        if expand is None:
+            expand = profile['expand']
+        
+        if max_results <= 0:
+            return
+        
+        # Première page : donne le total et la taille de page acceptée par Jira
+        data = self._search_page(jql, fields, expand, 0, min(100, max_results))
+        issues = data['issues'][:max_results]
+        if not issues:
+            return
+        
+        total = min(data.get('total', len(issues)), max_results)
+        page_size = data.get('maxResults') or len(issues)
+        yield self._parse_issues(issues), total
+        
+        # Pages suivantes : une fenêtre de max_workers requêtes reste en cours
+        starts = iter(range(len(issues), total, page_size))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            in_flight = deque()
+            for start in itertools.islice(starts, self.max_workers):
+                in_flight.append(executor.submit(self._search_page, jql, fields, expand, start, min(page_size, total - start)))
+            
+            while in_flight:
+                issues = in_flight.popleft().result()['issues']
+                start = next(starts, None)
+                if start is not None:
+                    in_flight.append(executor.submit(self._search_page, jql, fields, expand, start, min(page_size, total - start)))
+                if issues:
+                    yield self._parse_issues(issues), total
+    
+    def search_issues(self, jql, fields=None, max_results=1000, expand=None):
+        """Recherche des tickets selon un JQL.
+        
+        Args:
+            jql: Requête JQL
+            fields: Liste des champs à récupérer (profil 'hierarchy' par défaut)
+            max_results: Nombre maximum de résultats à récupérer
+            expand: Liste des expansions à demander (aucune par défaut)
             
         Returns:
             list: Liste des tickets trouvés
         """
         try:
-            if fields is None:
-                fields = [
-                    'key',
-                    'summary',
-                    'issuetype',
-                    'parent',
-                    'customfield_10014',  # Epic link
-                    'project',
-                    'issuelinks',
-                    'status'
-                ]
-                
-            start_at = 0
             all_issues = []
-            
-            while True:
-                response = requests.post(
-                    f"{self.base_url}/rest/api/3/search",
-                    headers=self.headers,
-                    json={
-                        'jql': jql,
-                        'fields': fields,
-                        'startAt': start_at,
-                        'maxResults': min(100, max_results - len(all_issues)),
-                        'expand': ['names', 'schema', 'transitions']
-                    }
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                issues = data['issues']
-                if not issues:
-                    break
-                    
-                for issue in issues:
-                    issue_type = issue['fields']['issuetype']['name'].lower()
-                    parent_key = None
-                    
-                    # Pour les sous-tâches, le parent est dans le champ 'parent'
-                    if 'parent' in issue['fields'] and issue['fields']['parent']:
-                        parent_key = issue['fields']['parent']['key']
-                    
-                    # Pour les stories/tasks, le parent est l'epic
-                    elif 'customfield_10014' in issue['fields'] and issue['fields']['customfield_10014']:
-                        parent_key = issue['fields']['customfield_10014']
-                    
-                    # Pour les epics, on cherche un lien vers un autre epic
-                    elif issue_type == 'epic' and 'issuelinks' in issue['fields']:
-                        for link in issue['fields']['issuelinks']:
-                            # On cherche les liens de type "is part of" ou similaire
-                            if 'inwardIssue' in link and link.get('type', {}).get('name', '').lower() in ['is part of', 'belongs to', 'implements']:
-                                parent_key = link['inwardIssue']['key']
-                                break
-                    
-                    # Si aucun parent n'est trouvé et que ce n'est pas un projet
-                    if parent_key is None and issue_type != 'project':
-                        # Pour les epics sans parent, on met le projet comme parent
-                        if issue_type == 'epic':
-                            parent_key = issue['fields']['project']['key']
-                        # Pour les autres types, on essaie de trouver l'epic parent via une requête supplémentaire
-                        else:
-                            try:
-                                epic_response = requests.get(
-                                    f"{self.base_url}/rest/agile/1.0/issue/{issue['key']}/epic",
-                                    headers=self.headers
-                                )
-                                if epic_response.status_code == 200:
-                                    epic_data = epic_response.json()
-                                    if 'key' in epic_data:
-                                        parent_key = epic_data['key']
-                                    else:
-                                        parent_key = issue['fields']['project']['key']
-                                else:
-                                    parent_key = issue['fields']['project']['key']
-                            except:
-                                parent_key = issue['fields']['project']['key']
-                    
-                    all_issues.append({
-                        'key': issue['key'],
-                        'title': issue['fields']['summary'],
-                        'type': issue_type,
-                        'parent_key': parent_key,
-                        'status': issue['fields']['status']['name']
-                    })
-                
-                start_at += len(issues)
-                
-                if len(all_issues) >= max_results or len(issues) < 100:
-                    break
-                    
-            return all_issues
+            for issues, _total in self.iter_search_pages(jql, fields, max_results, expand):
+                all_issues.extend(issues)
+            return all_issues[:max_results]
             
         except Exception as e:
             print(f"Erreur lors de la recherche des tickets: {str(e)}")
-            if isinstance(e, requests.exceptions.RequestException):
+            if isinstance(e, requests.exceptions.RequestException) and e.response is not None:
                 print(f"Réponse de l'API: {e.response.text}")
             return []
             
-    def get_issue_hierarchy(self, jql, max_results=1000):
-        """Récupère la hiérarchie complète des tickets selon un JQL.
+    def get_issue_titles(self, issue_keys, chunk_size=100):
+        """Récupère le titre d'un lot de tickets.
+        
+        Les clés sont regroupées en requêtes `key in (...)` de chunk_size
+        clés, envoyées en parallèle et limitées au champ summary. Si Jira
+        plafonne la taille de page sous chunk_size, les pages suivantes de
+        chaque requête sont lues. Les clés inexistantes ou mal formées sont
+        ignorées.
         
         Args:
-            jql: Requête JQL
-            max_results: Nombre maximum de résultats à récupérer
+            issue_keys: Identifiants des tickets
+            chunk_size: Nombre de clés par requête
             
         Returns:
-            list: Liste des tickets avec leur niveau dans la hiérarchie
-        """
-        try:
-            # Récupère tous les tickets
-            issues = self.search_issues(jql, max_results=max_results)
-            if not issues:
-                return []
-                
-            # Construit un dictionnaire des tickets par clé
-            issues_by_key = {issue['key']: issue for issue in issues}
-            
-            # Calcule le niveau de chaque ticket dans la hiérarchie
-            for issue in issues:
-                level = 0
-                current_key = issue['parent_key']
-                
-                # Remonte la hiérarchie jusqu'à la racine
-                while current_key and current_key in issues_by_key:
-                    level += 1
-                    current_key = issues_by_key[current_key]['parent_key']
-                
-                issue['level'] = level
-                
-            return issues
+            dict: Clé du ticket (telle que fournie) -> titre
             
-        except Exception as e:
-            print(f"Erreur lors de la récupération de la hiérarchie: {str(e)}")
-            return []
-
+        Raises:
+            requests.exceptions.RequestException: En cas d'erreur réseau ou HTTP
+        """
+        # Clés normalisées -> clés fournies
+        keys = {}
+        for key in issue_keys:
+            key = key.strip()
+            if ISSUE_KEY_PATTERN.match(key):
+                keys.setdefault(key.upper(), []).append(key)
+        if not keys:
+            return {}
+        
+        unique_keys = list(keys)
+        chunks = [unique_keys[i:i + chunk_size] for i in range(0, len(unique_keys), chunk_size)]
+        fields = FIELD_PROFILES['summary']['fields']
+        
+        def fetch(chunk):
+            jql = "key in ({})".format(', '.join(f'"{key}"' for key in chunk))
+            issues = []
+            while True:
+                # 'warn' : une clé inexistante ne fait pas échouer toute la requête
+                data = self._search_page(jql, fields, [], len(issues), len(chunk) - len(issues),
+                                         validate_query='warn')
+                page = data.get('issues', [])
+                issues.extend(page)
+                if not page or len(issues) >= min(data.get('total', 0), len(chunk)):
+                    return issues
+        
+        titles = {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as executor:
+            for issues in executor.map(fetch, chunks):
+                for issue in issues:
+                    # Un ticket déplacé revient sous sa nouvelle clé : il est ignoré
+                    for key in keys.get(issue['key'].upper(), []):
+                        titles[key] = issue['fields'].get('summary')
+        return titles
+    
     def get_issue_types(self, project_key):
         """
         Récupère les types de tickets disponibles pour un projet.
@@ -273,9 +707,7 @@ class JiraClient:
             list: Liste des types de tickets ou None en cas d'erreur
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/rest/api/2/issue/createmeta/{project_key}/issuetypes"
-            )
+            response = self._request('GET', f"/rest/api/2/issue/createmeta/{project_key}/issuetypes")
             
             if not response.ok:
                 error_details = response.json() if response.text else "Pas de détails d'erreur"
@@ -319,11 +751,7 @@ class JiraClient:
             print(f"Données envoyées à Jira : {data}")  # Debug
             
             # Crée la sous-tâche
-            response = requests.post(
-                f"{self.base_url}/rest/api/2/issue",
-                headers=self.headers,
-                json=data
-            )
+            response = self._request('POST', "/rest/api/2/issue", json=data)
             
             if not response.ok:
                 error_details = response.json() if response.text else "Pas de détails d'erreur"
@@ -351,14 +779,14 @@ class JiraClient:
             search_jql = jql if jql else "labels is not EMPTY"
             
             # Récupère les tickets avec leurs étiquettes
-            response = requests.get(
-                f"{self.base_url}/rest/api/2/search",
+            response = self._request(
+                'GET',
+                "/rest/api/2/search",
                 params={
                     "jql": search_jql,
                     "maxResults": 100,  # Augmente pour avoir plus d'étiquettes
-                    "fields": "labels"
-                },
-                headers=self.headers
+                    "fields": ",".join(FIELD_PROFILES['labels']['fields'])
+                }
             )
             
             if not response.ok:
@@ -0,0 +1,153 @@
+"""Hiérarchie des tickets Jira : niveau, racine et chemin de chaque ticket.
+
+Les tickets sont reliés par leur parent_key. Seuls les parents présents dans
+l'ensemble des tickets comptent : une lignée s'arrête au premier parent
+absent (par exemple la clé du projet, parent des epics).
+"""
+from collections import deque
+
+# Nombre de titres utilisés par un chemin projet/epic/fonctionnalité
+PATH_DEPTH = 3
+
+
+def format_path(issue, path_parts):
+    """Formate le chemin projet/epic/fonctionnalité d'un ticket.
+
+    Args:
+        issue: Ticket concerné
+        path_parts: Titres des ancêtres connus, de la racine jusqu'au ticket
+                    (seuls les trois premiers sont utilisés)
+
+    Returns:
+        str: Chemin du ticket ou None si path_parts est vide
+    """
+    # Si on n'a pas de chemin du tout
+    if not path_parts:
+        return None
+
+    # Si c'est une fonctionnalité (ni projet, ni epic)
+    if issue['type'].lower() not in ['project', 'epic']:
+        if len(path_parts) >= 3:
+            return f"{path_parts[0]}/{path_parts[1]}/{path_parts[2]}"
+        elif len(path_parts) == 2:
+            return f"{path_parts[0]}/{path_parts[1]}/"
+        else:
+            return f"{path_parts[0]}//"
+
+    # Si c'est un epic
+    elif issue['type'].lower() == 'epic':
+        if len(path_parts) >= 2:
+            return f"{path_parts[0]}/{path_parts[1]}//"
+        else:
+            return f"{path_parts[0]}//"
+
+    # Si c'est un projet
+    else:  # project
+        return f"{path_parts[0]}//"
+
+
+class IssueHierarchy:
+    """Calcule en une passe le niveau, la racine et le chemin des tickets.
+
+    Chaque ticket n'est visité qu'une fois : ses informations sont déduites
+    de celles de son parent, déjà calculées (mémoïsation). Un cycle de
+    parents est détecté et coupé : le dernier ticket atteint avant de
+    reboucler en devient la racine, et le cycle est noté dans self.cycles.
+    """
+
+    def __init__(self, issues):
+        """Construit la hiérarchie.
+
+        Args:
+            issues: Tickets (dicts avec au moins key, parent_key, title et type)
+        """
+        self.issues = {issue['key']: issue for issue in issues}
+        self.children = {}  # Clé du parent -> clés des enfants
+        self.levels = {}  # Clé -> nombre d'ancêtres présents
+        self.roots = {}  # Clé -> clé de l'ancêtre le plus haut
+        self.heads = {}  # Clé -> premiers titres de la lignée (au plus PATH_DEPTH)
+        self.cycles = []  # Cycles détectés (listes de clés)
+
+        issues_by_key, children = self.issues, self.children
+        levels, roots, heads = self.levels, self.roots, self.heads
+        for key, issue in issues_by_key.items():
+            parent_key = issue.get('parent_key')
+            if parent_key not in issues_by_key:
+                if key not in levels:
+                    levels[key] = 0
+                    roots[key] = key
+                    heads[key] = (issue['title'],)
+                continue
+            children.setdefault(parent_key, []).append(key)
+            if key in levels:
+                continue
+            if parent_key in levels:
+                # Cas courant (parents listés avant leurs enfants) : pas de remontée
+                levels[key] = levels[parent_key] + 1
+                roots[key] = roots[parent_key]
+                head = heads[parent_key]
+                heads[key] = head if len(head) >= PATH_DEPTH else head + (issue['title'],)
+            else:
+                self._compute(key)
+
+    def _compute(self, key):
+        """Calcule un ticket et ses ancêtres non encore calculés."""
+        # Remonte jusqu'à un ticket déjà calculé ou jusqu'à une racine
+        chain = []
+        in_chain = set()
+        current = key
+        while current in self.issues and current not in self.levels:
+            if current in in_chain:
+                # Cycle : le ticket fermant la boucle devient une racine
+                cycle = chain[chain.index(current):]
+                self.cycles.append(cycle)
+                break
+            chain.append(current)
+            in_chain.add(current)
+            current = self.issues[current].get('parent_key')
+
+        # Redescend la chaîne en déduisant chaque ticket de son parent
+        for index in range(len(chain) - 1, -1, -1):
+            child = chain[index]
+            parent_key = self.issues[child].get('parent_key')
+            title = self.issues[child]['title']
+            is_cycle_break = index == len(chain) - 1 and parent_key in in_chain
+            if parent_key in self.levels and not is_cycle_break:
+                self.levels[child] = self.levels[parent_key] + 1
+                self.roots[child] = self.roots[parent_key]
+                head = self.heads[parent_key]
+                self.heads[child] = head if len(head) >= PATH_DEPTH else head + (title,)
+            else:
+                self.levels[child] = 0
+                self.roots[child] = child
+                self.heads[child] = (title,)
+
+    def level(self, key):
+        """Nombre d'ancêtres présents dans la hiérarchie."""
+        return self.levels[key]
+
+    def root(self, key):
+        """Clé de l'ancêtre le plus haut présent dans la hiérarchie."""
+        return self.roots[key]
+
+    def path_parts(self, key):
+        """Premiers titres de la lignée, de la racine vers le ticket."""
+        return self.heads[key]
+
+    def path(self, key):
+        """Chemin projet/epic/fonctionnalité du ticket."""
+        return format_path(self.issues[key], self.heads[key])
+
+    def descendants(self, key):
+        """Clés de tous les descendants d'un ticket (parcours en largeur)."""
+        result = []
+        pending = deque(self.children.get(key, []))
+        seen = {key}
+        while pending:
+            child = pending.popleft()
+            if child in seen:
+                continue
+            seen.add(child)
+            result.append(child)
+            pending.extend(self.children.get(child, []))
+        return result
@@ -0,0 +1,503 @@
+"""Import de la hiérarchie Jira dans les tables jira_paths et jira_subtasks.
+
+L'import fonctionne en flux : les pages de résultats sont traitées dès leur
+arrivée (récupération -> résolution des chemins -> écriture par lots), sans
+attendre la fin de la recherche ni garder tous les tickets en mémoire.
+
+Après un premier import complet, les imports suivants sont incrémentaux :
+seuls les tickets modifiés depuis le dernier import sont demandés à Jira,
+et seuls les chemins de leurs sous-arbres sont recalculés. Un import
+complet est refait périodiquement pour détecter les tickets supprimés.
+"""
+import json
+import re
+from datetime import datetime, timedelta
+from utils.jira_hierarchy import IssueHierarchy, PATH_DEPTH, format_path
+
+# Types de tickets considérés comme des sous-tâches
+SUBTASK_TYPES = ('sous-tâche', 'sub-task')
+
+# Modes d'import
+MODE_ALL = 'all'  # Chemins des tickets et sous-tâches
+MODE_PROJECTS = 'projects'  # Chemins uniquement (table jira_paths)
+MODE_SUBTASKS = 'subtasks'  # Sous-tâches rattachées aux chemins existants
+MODES = (MODE_ALL, MODE_PROJECTS, MODE_SUBTASKS)
+
+# État du dernier import de chaque mode (JSON dans la table settings)
+STATE_SETTING = 'jira_import_state_{mode}'
+# Nombre de jours entre deux imports complets (clé settings 'jira_full_import_days')
+DEFAULT_FULL_IMPORT_DAYS = 7
+# Marge de recouvrement des imports incrémentaux (décalages d'horloge, minutes tronquées)
+DELTA_MARGIN = timedelta(minutes=5)
+
+_ORDER_BY_RE = re.compile(r'\border\s+by\b.*$', re.IGNORECASE | re.DOTALL)
+
+
+def is_subtask(issue):
+    """Indique si un ticket est une sous-tâche."""
+    return issue['type'].lower() in SUBTASK_TYPES
+
+
+def delta_jql(jql, since):
+    """Restreint un JQL aux tickets modifiés depuis une date.
+
+    La clause ORDER BY éventuelle est conservée en fin de requête.
+
+    Args:
+        jql: Requête JQL d'origine
+        since: Date de début (datetime, heure locale)
+
+    Returns:
+        str: Requête JQL complétée de la condition sur updated
+    """
+    condition = f'updated >= "{since.strftime("%Y-%m-%d %H:%M")}"'
+    match = _ORDER_BY_RE.search(jql)
+    where = (jql[:match.start()] if match else jql).strip()
+    order_by = f" {match.group(0).strip()}" if match else ""
+    if where:
+        return f"({where}) AND {condition}{order_by}"
+    return f"{condition}{order_by}"
+
+
+class PathResolver:
+    """Calcule les chemins des tickets au fur et à mesure de leur arrivée.
+
+    Le chemin d'un ticket n'est calculé que lorsque toute sa lignée est
+    connue ; les tickets dont le parent n'est pas encore arrivé sont mis en
+    attente et résolus dès que ce parent l'est. À la fin (finish), les
+    tickets restés orphelins sont résolus avec les ancêtres disponibles,
+    comme le faisait le calcul sur la liste complète.
+    """
+
+    def __init__(self):
+        self.tickets = {}  # Clé -> ticket reçu
+        self.lineages = {}  # Clé -> premiers titres de la lignée (au plus PATH_DEPTH)
+        self.waiting = {}  # Clé du parent attendu -> clés des enfants
+
+    @staticmethod
+    def _is_root(parent_key):
+        """Indique si une clé parent termine la lignée.
+
+        Les epics sans parent sont rattachés à la clé du projet (sans tiret),
+        qui n'est jamais un ticket de la recherche.
+        """
+        return not parent_key or '-' not in parent_key
+
+    def add(self, issue):
+        """Ajoute un ticket.
+
+        Returns:
+            list: Tickets dont le chemin est désormais connu, sous forme de
+                  couples (ticket, titres de la lignée)
+        """
+        self.tickets[issue['key']] = issue
+        parent_key = issue['parent_key']
+        if self._is_root(parent_key) or parent_key in self.lineages:
+            return self._resolve(issue['key'])
+        self.waiting.setdefault(parent_key, []).append(issue['key'])
+        return []
+
+    def _resolve(self, key):
+        """Résout un ticket puis, en cascade, les enfants qui l'attendaient."""
+        resolved = []
+        pending = [key]
+        while pending:
+            key = pending.pop()
+            issue = self.tickets[key]
+            parent_lineage = self.lineages.get(issue['parent_key'], ())
+            if len(parent_lineage) >= PATH_DEPTH:
+                self.lineages[key] = parent_lineage
+            else:
+                self.lineages[key] = parent_lineage + (issue['title'],)
+            resolved.append((issue, self.lineages[key]))
+            pending.extend(self.waiting.pop(key, []))
+        return resolved
+
+    def finish(self):
+        """Résout les tickets dont la lignée est restée incomplète.
+
+        Returns:
+            list: Couples (ticket, titres de la lignée)
+        """
+        if not self.waiting:
+            return []
+        # Un cycle de parents laisse aussi ses tickets en attente : la
+        # hiérarchie le détecte et le coupe
+        hierarchy = IssueHierarchy(self.tickets.values())
+        resolved = []
+        for keys in self.waiting.values():
+            for key in keys:
+                resolved.append((self.tickets[key], hierarchy.path_parts(key)))
+        self.waiting = {}
+        return resolved
+
+
+class HierarchyImporter:
+    """Pipeline d'import : récupération -> résolution des chemins -> écriture.
+
+    Les lignes sont écrites par lots (executemany), chaque lot dans sa propre
+    transaction : les données déjà reçues sont disponibles sans attendre la
+    dernière page. Un import interrompu laisse des tables partielles, que
+    l'import suivant remplace (il est alors complet).
+    """
+
+    def __init__(self, jira, db, mode=MODE_ALL, chunk_size=500, progress=None):
+        """Initialise l'import.
+
+        Args:
+            jira: Client Jira (JiraClient)
+            db: Base de données (Database)
+            mode: MODE_ALL, MODE_PROJECTS ou MODE_SUBTASKS
+            chunk_size: Nombre de lignes écrites par transaction
+            progress: Fonction appelée avec (tickets reçus, total attendu, lignes écrites)
+        """
+        self.jira = jira
+        self.db = db
+        self.mode = mode
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.resolver = PathResolver()
+        self.paths = {}  # Chemin des tickets (hors sous-tâches)
+        self.pending_subtasks = {}  # Clé du parent -> sous-tâches en attente de son chemin
+        self.issue_rows = []
+        self.path_rows = []
+        self.subtask_rows = []
+        self.fetched = 0
+        self.written = 0
+        self.full = True
+        self.cleared = False  # Anciennes données effacées (import complet)
+
+    def run(self, jql, max_results=1000, incremental=True):
+        """Exécute l'import.
+
+        L'import est complet s'il n'y a pas eu d'import précédent, si le JQL
+        a changé, si le dernier import complet est trop ancien ou si
+        incremental vaut False ; sinon seuls les tickets modifiés sont importés.
+
+        Args:
+            jql: Requête JQL
+            max_results: Nombre maximum de tickets à importer
+            incremental: Autorise l'import incrémental
+
+        Returns:
+            tuple: (nombre de tickets reçus, nombre de lignes écrites)
+        """
+        started = datetime.now()
+        state = self._load_state(self.mode)
+        self.full = not incremental or self._needs_full_import(state, jql, started)
+
+        if self.full:
+            self._run_full(jql, max_results)
+        else:
+            since = datetime.fromisoformat(state['last_import']) - DELTA_MARGIN
+            self._run_delta(jql, since, max_results)
+
+        # L'état n'est enregistré qu'après un import réussi
+        self._save_state(self.mode, {
+            'jql': jql,
+            'last_import': started.isoformat(),
+            'last_full_import': started.isoformat() if self.full else state['last_full_import'],
+        })
+
+        return self.fetched, self.written
+
+    def _load_state(self, mode):
+        """Lit l'état du dernier import d'un mode."""
+        value = self.db.get_setting(STATE_SETTING.format(mode=mode))
+        if not value:
+            return None
+        try:
+            return json.loads(value)
+        except ValueError:
+            return None
+
+    def _save_state(self, mode, state):
+        """Enregistre l'état du dernier import d'un mode (None pour l'effacer)."""
+        self.db.save_setting(STATE_SETTING.format(mode=mode), json.dumps(state) if state else '')
+
+    def _reset_other_states(self):
+        """Force un import complet des autres modes.
+
+        Leurs données dépendent des tables que cet import vient de modifier
+        (chemins des parents, hiérarchie des tickets).
+        """
+        for mode in MODES:
+            if mode != self.mode:
+                self._save_state(mode, None)
+
+    def _needs_full_import(self, state, jql, now):
+        """Indique si un import complet est nécessaire."""
+        if not state or state.get('jql') != jql or not state.get('last_full_import'):
+            return True
+        try:
+            days = float(self.db.get_setting('jira_full_import_days', str(DEFAULT_FULL_IMPORT_DAYS)))
+        except ValueError:
+            days = DEFAULT_FULL_IMPORT_DAYS
+        last_full = datetime.fromisoformat(state['last_full_import'])
+        return now - last_full >= timedelta(days=days)
+
+    def _run_full(self, jql, max_results):
+        """Import complet : les tables sont remplacées page par page.
+
+        Les anciennes données ne sont effacées qu'avec l'écriture de la
+        première page reçue : une erreur avant celle-ci (réseau,
+        authentification) ou une recherche vide les laisse intactes.
+        """
+        if self.mode == MODE_SUBTASKS:
+            # Les chemins des parents proviennent d'un import précédent
+            self.db.cursor.execute("SELECT path, ticket_key FROM jira_paths")
+            self.paths = {row[1]: row[0] for row in self.db.cursor.fetchall()}
+
+        for issues, total in self.jira.iter_search_pages(jql, max_results=max_results):
+            for issue in issues:
+                self._consume(issue)
+            self.fetched += len(issues)
+            if not self.cleared:
+                self._flush()
+            else:
+                self._flush_if_needed()
+            self._report(total)
+
+        if not self.cleared:
+            return
+
+        if self.mode != MODE_SUBTASKS:
+            for issue, path_parts in self.resolver.finish():
+                self._store(issue, path_parts)
+        self._flush()
+        self._report(self.fetched)
+
+        # Les autres modes dépendent des tables qui viennent d'être remplacées
+        if self.mode != MODE_SUBTASKS:
+            self._reset_other_states()
+
+    def _run_delta(self, jql, since, max_results):
+        """Import incrémental des tickets modifiés depuis since.
+
+        Les tickets reçus sont mis à jour dans jira_issues, puis les chemins
+        de leurs sous-arbres sont recalculés à partir de cette table. Les
+        tickets supprimés ou sortis du JQL ne sont retirés qu'au prochain
+        import complet.
+        """
+        changed = []
+        for issues, total in self.jira.iter_search_pages(delta_jql(jql, since), max_results=max_results):
+            changed.extend(issues)
+            self.fetched += len(issues)
+            self._report(total)
+
+        if changed:
+            with self.db.transaction():
+                if self.mode == MODE_SUBTASKS:
+                    self._apply_subtasks_delta(changed)
+                else:
+                    self._apply_paths_delta(changed)
+        self._report(self.fetched)
+
+    def _apply_subtasks_delta(self, changed):
+        """Met à jour les sous-tâches modifiées (mode MODE_SUBTASKS)."""
+        subtasks = [issue for issue in changed if is_subtask(issue)]
+        self.db.cursor.executemany(
+            "INSERT OR REPLACE INTO jira_issues (key, parent_key, type, title, status) VALUES (?, ?, ?, ?, ?)",
+            [self._issue_row(issue) for issue in subtasks]
+        )
+        keys = json.dumps([issue['key'] for issue in subtasks])
+        parent_keys = json.dumps([issue['parent_key'] for issue in subtasks])
+        self.db.cursor.execute("""
+            SELECT ticket_key, path FROM jira_paths
+            WHERE ticket_key IN (SELECT value FROM json_each(?))
+        """, (parent_keys,))
+        parent_paths = {row[0]: row[1] for row in self.db.cursor.fetchall()}
+
+        rows = [(parent_paths[issue['parent_key']], issue['title'], issue['key'])
+                for issue in subtasks if issue['parent_key'] in parent_paths]
+        self.db.cursor.execute(
+            "DELETE FROM jira_subtasks WHERE ticket_key IN (SELECT value FROM json_each(?))",
+            (keys,)
+        )
+        self.db.cursor.executemany(
+            "INSERT INTO jira_subtasks (path, title, ticket_key) VALUES (?, ?, ?)",
+            rows
+        )
+        self.written += len(rows)
+
+    def _apply_paths_delta(self, changed):
+        """Met à jour la hiérarchie et les chemins du sous-arbre des tickets modifiés."""
+        self.db.cursor.executemany(
+            "INSERT OR REPLACE INTO jira_issues (key, parent_key, type, title, status) VALUES (?, ?, ?, ?, ?)",
+            [self._issue_row(issue) for issue in changed]
+        )
+
+        # Tickets modifiés et tous leurs descendants
+        changed_keys = {issue['key'] for issue in changed}
+        subtree = self.db.get_issue_subtree(list(changed_keys))
+        affected_json = json.dumps([issue['key'] for issue in subtree])
+
+        self.db.cursor.execute(
+            "SELECT ticket_key, path FROM jira_paths WHERE ticket_key IN (SELECT value FROM json_each(?))",
+            (affected_json,)
+        )
+        old_paths = {row[0]: row[1] for row in self.db.cursor.fetchall()}
+
+        # Chemins recalculés par requête récursive sur jira_issues
+        paths = self.db.get_issue_paths([issue['key'] for issue in subtree])
+
+        path_rows = []
+        subtasks = []
+        for issue in subtree:
+            key = issue['key']
+            if is_subtask(issue):
+                if self.mode == MODE_ALL:
+                    subtasks.append(issue)
+                    continue
+                # Les sous-tâches importées séparément n'ont pas de ligne dans jira_paths
+                if key not in changed_keys and key not in old_paths:
+                    continue
+            path = paths.get(key)
+            if path:
+                self.paths[key] = path
+                path_rows.append((path, key))
+
+        self.db.cursor.execute(
+            "DELETE FROM jira_paths WHERE ticket_key IN (SELECT value FROM json_each(?))",
+            (affected_json,)
+        )
+        self.db.cursor.executemany("INSERT INTO jira_paths (path, ticket_key) VALUES (?, ?)", path_rows)
+        self.written += len(path_rows)
+
+        if self.mode == MODE_ALL:
+            # Chemin des parents hors du sous-arbre : ceux déjà en base
+            missing = [issue['parent_key'] for issue in subtasks if issue['parent_key'] not in self.paths]
+            self.db.cursor.execute(
+                "SELECT ticket_key, path FROM jira_paths WHERE ticket_key IN (SELECT value FROM json_each(?))",
+                (json.dumps(missing),)
+            )
+            self.paths.update({row[0]: row[1] for row in self.db.cursor.fetchall()})
+
+            subtask_rows = [(self.paths[issue['parent_key']], issue['title'], issue['key'])
+                            for issue in subtasks if issue['parent_key'] in self.paths]
+            self.db.cursor.execute(
+                "DELETE FROM jira_subtasks WHERE ticket_key IN (SELECT value FROM json_each(?))",
+                (json.dumps([issue['key'] for issue in subtasks]),)
+            )
+            self.db.cursor.executemany(
+                "INSERT INTO jira_subtasks (path, title, ticket_key) VALUES (?, ?, ?)",
+                subtask_rows
+            )
+            self.written += len(subtask_rows)
+
+        # Des chemins ont changé : les sous-tâches importées séparément doivent être recalculées
+        if any(old_paths.get(key) != path for path, key in path_rows):
+            self._save_state(MODE_SUBTASKS, None)
+
+    @staticmethod
+    def _issue_row(issue):
+        """Ligne de la table jira_issues pour un ticket."""
+        return (issue['key'], issue['parent_key'], issue['type'], issue['title'], issue.get('status'))
+
+    def _clear_tables(self):
+        """Vide les tables remplacées par l'import."""
+        subtask_sql = self.db.SUBTASK_SQL.format(type_column='type')
+        with self.db.transaction():
+            # Le cache des chemins est vidé d'abord : les triggers de jira_issues
+            # n'ont alors rien à invalider ligne par ligne
+            self.db.cursor.execute("DELETE FROM jira_issue_paths")
+            
+            # Chaque mode ne remplace que ses propres tickets dans jira_issues
+            if self.mode == MODE_ALL:
+                self.db.cursor.execute("DELETE FROM jira_issues")
+            elif self.mode == MODE_PROJECTS:
+                self.db.cursor.execute(f"DELETE FROM jira_issues WHERE NOT {subtask_sql}", SUBTASK_TYPES)
+            else:
+                self.db.cursor.execute(f"DELETE FROM jira_issues WHERE {subtask_sql}", SUBTASK_TYPES)
+            
+            if self.mode in (MODE_ALL, MODE_PROJECTS):
+                self.db.cursor.execute("DELETE FROM jira_paths")
+            if self.mode in (MODE_ALL, MODE_SUBTASKS):
+                self.db.cursor.execute("DELETE FROM jira_subtasks")
+
+    def _consume(self, issue):
+        """Traite un ticket reçu."""
+        if self.mode == MODE_SUBTASKS:
+            if not is_subtask(issue):
+                return
+            self.issue_rows.append(self._issue_row(issue))
+            # Seules les sous-tâches dont le parent a un chemin sont importées
+            if issue.get('parent_key') in self.paths:
+                self.subtask_rows.append(
+                    (self.paths[issue['parent_key']], issue['title'], issue['key'])
+                )
+            return
+
+        self.issue_rows.append(self._issue_row(issue))
+        for resolved_issue, path_parts in self.resolver.add(issue):
+            self._store(resolved_issue, path_parts)
+
+    def _store(self, issue, path_parts):
+        """Prépare les lignes d'un ticket dont la lignée est connue."""
+        if self.mode == MODE_ALL and is_subtask(issue):
+            parent_key = issue['parent_key']
+            if parent_key in self.paths:
+                self.subtask_rows.append((self.paths[parent_key], issue['title'], issue['key']))
+            else:
+                # Le parent n'est peut-être pas encore résolu
+                self.pending_subtasks.setdefault(parent_key, []).append(issue)
+            return
+
+        path = format_path(issue, path_parts)
+        if not path:
+            return
+        self.paths[issue['key']] = path
+        self.path_rows.append((path, issue['key']))
+
+        # Sous-tâches qui attendaient le chemin de ce ticket
+        for subtask in self.pending_subtasks.pop(issue['key'], []):
+            self.subtask_rows.append((path, subtask['title'], subtask['key']))
+
+    def _flush_if_needed(self):
+        """Écrit les lignes en attente si un lot est complet."""
+        if len(self.issue_rows) + len(self.path_rows) + len(self.subtask_rows) >= self.chunk_size:
+            self._flush()
+
+    def _flush(self):
+        """Écrit les lignes en attente dans une transaction.
+
+        Au premier appel d'un import complet, les tables sont vidées dans la
+        même transaction que l'écriture des lignes.
+        """
+        if self.cleared and not self.issue_rows and not self.path_rows and not self.subtask_rows:
+            return
+        with self.db.transaction():
+            if not self.cleared:
+                self._clear_tables()
+                # Sans état, un import interrompu sera refait en entier
+                self._save_state(self.mode, None)
+                self.cleared = True
+            if self.issue_rows:
+                self.db.cursor.executemany(
+                    "INSERT OR REPLACE INTO jira_issues (key, parent_key, type, title, status) VALUES (?, ?, ?, ?, ?)",
+                    self.issue_rows
+                )
+            if self.path_rows:
+                self.db.cursor.executemany(
+                    "INSERT INTO jira_paths (path, ticket_key) VALUES (?, ?)",
+                    self.path_rows
+                )
+            if self.subtask_rows:
+                self.db.cursor.executemany(
+                    "INSERT INTO jira_subtasks (path, title, ticket_key) VALUES (?, ?, ?)",
+                    self.subtask_rows
+                )
+        if self.mode == MODE_SUBTASKS:
+            self.written += len(self.subtask_rows)
+        elif self.mode == MODE_PROJECTS:
+            self.written += len(self.path_rows)
+        else:
+            self.written += len(self.path_rows) + len(self.subtask_rows)
+        self.issue_rows = []
+        self.path_rows = []
+        self.subtask_rows = []
+
+    def _report(self, total):
+        """Signale l'avancement."""
+        if self.progress:
+            self.progress(self.fetched, total, self.written)
@@ -0,0 +1,667 @@
+import threading
+
+# Schéma versionné de la base : chaque migration porte un numéro et la
+# version courante est stockée dans PRAGMA user_version. Une base déjà à
+# jour ne coûte donc qu'une lecture de PRAGMA à l'ouverture.
+
+_migrated_paths = set()
+_lock = threading.Lock()
+
+
+def _columns(cursor, table):
+    """Retourne les noms des colonnes d'une table."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    return [col[1] for col in cursor.fetchall()]
+
+
+def _initial_schema(cursor):
+    """Crée les tables de la base de données."""
+    # Table des paramètres
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    """)
+
+    # Table des projets
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS projects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            ticket_prefix TEXT,
+            planner_id TEXT,  -- ID du plan Planner associé
+            planner_name TEXT -- Nom du plan Planner
+        )
+    """)
+
+    # Table des tickets
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tickets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER,
+            ticket_number TEXT NOT NULL,
+            title TEXT,
+            is_active INTEGER DEFAULT 1,
+            FOREIGN KEY (project_id) REFERENCES projects (id),
+            UNIQUE(project_id, ticket_number)
+        )
+    """)
+
+    # Table des entrées
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT NOT NULL,
+            time TEXT NOT NULL,
+            project_id INTEGER,
+            ticket_id INTEGER,
+            ticket_number TEXT,
+            ticket_title TEXT,
+            description TEXT NOT NULL,
+            duration INTEGER NOT NULL,
+            is_synced INTEGER DEFAULT 0,
+            planner_task_id TEXT,  -- ID de la tâche Planner si synchronisée
+            FOREIGN KEY (project_id) REFERENCES projects (id),
+            FOREIGN KEY (ticket_id) REFERENCES tickets (id)
+        )
+    """)
+
+    # Suppression des anciennes tables
+    cursor.execute("DROP TABLE IF EXISTS jira_hierarchy")
+    cursor.execute("DROP TABLE IF EXISTS epic_feature_pairs")
+    cursor.execute("DROP TABLE IF EXISTS features")
+    cursor.execute("DROP TABLE IF EXISTS epics")
+
+    # Création des nouvelles tables simplifiées
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS jira_paths (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path TEXT NOT NULL,  -- Format: "projet/epic/fonctionnalité"
+            ticket_key TEXT NOT NULL,  -- Numéro du ticket Jira
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS jira_subtasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path TEXT NOT NULL,  -- Format: "projet/epic/fonctionnalité"
+            title TEXT NOT NULL,  -- Titre du ticket
+            ticket_key TEXT NOT NULL,  -- Numéro du ticket Jira
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS jira_labels (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Création des index pour optimiser les recherches
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jira_paths_path ON jira_paths(path)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jira_subtasks_path ON jira_subtasks(path)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jira_labels_name ON jira_labels(name)")
+
+    # Ajout des paramètres par défaut
+    cursor.execute("""
+        INSERT OR IGNORE INTO settings (key, value) VALUES
+            ('jira_base_url', NULL),
+            ('jira_token', NULL),
+            ('jira_email', NULL),
+            ('daily_hours', '8'),
+            ('token_expiry', NULL),
+            ('start_time', '08:00'),
+            ('end_time', '18:00'),
+            ('use_sequential_time', '0'),
+            ('ticket_selection_jql', NULL),
+            ('project_selection_jql', NULL),
+            ('db_profile', 'balanced')
+    """)
+
+
+def _planner_columns(cursor):
+    """Ajoute les colonnes Planner aux bases créées avant leur introduction."""
+    if 'planner_id' not in _columns(cursor, 'projects'):
+        cursor.execute("ALTER TABLE projects ADD COLUMN planner_id TEXT")
+        cursor.execute("ALTER TABLE projects ADD COLUMN planner_name TEXT")
+
+    if 'planner_task_id' not in _columns(cursor, 'entries'):
+        cursor.execute("ALTER TABLE entries ADD COLUMN planner_task_id TEXT")
+
+
+def _legacy_tickets_table(cursor):
+    """Convertit l'ancienne table tickets (colonne key) vers la structure actuelle.
+
+    Reprend l'ancien script migrate_db.py.
+    """
+    if 'key' not in _columns(cursor, 'tickets'):
+        return
+
+    # Sauvegarde des données existantes
+    cursor.execute("SELECT id, key, title, is_active, ticket_number FROM tickets")
+    old_tickets = cursor.fetchall()
+
+    cursor.execute("DROP TABLE tickets")
+    cursor.execute("""
+        CREATE TABLE tickets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER,
+            ticket_number TEXT NOT NULL,
+            title TEXT,
+            is_active INTEGER DEFAULT 1,
+            FOREIGN KEY (project_id) REFERENCES projects (id),
+            UNIQUE(project_id, ticket_number)
+        )
+    """)
+
+    # On utilise le ticket_number s'il existe, sinon on utilise la clé
+    cursor.executemany("""
+        INSERT INTO tickets (id, ticket_number, title, is_active)
+        VALUES (?, ?, ?, ?)
+    """, [
+        (old_id, ticket_number if ticket_number else key, title, is_active or 1)
+        for old_id, key, title, is_active, ticket_number in old_tickets
+    ])
+
+
+def _associate_ticket_projects(cursor):
+    """Associe à un projet les tickets qui n'en ont pas.
+
+    Reprend l'ancien script associate_projects.py : un ticket est rattaché au
+    projet dont le nom préfixe son numéro, sinon au premier projet.
+    """
+    cursor.execute("SELECT id, ticket_number FROM tickets WHERE project_id IS NULL")
+    tickets = cursor.fetchall()
+    cursor.execute("SELECT id, name FROM projects")
+    projects = cursor.fetchall()
+
+    if not tickets or not projects:
+        return
+
+    default_project_id = projects[0][0]
+    updates = []
+    for ticket_id, ticket_number in tickets:
+        project_id = default_project_id
+        for proj_id, proj_name in projects:
+            if ticket_number and ticket_number.upper().startswith(proj_name.upper()):
+                project_id = proj_id
+                break
+        updates.append((project_id, ticket_id))
+
+    cursor.executemany("UPDATE tickets SET project_id = ? WHERE id = ?", updates)
+
+
+def _entries_indexes(cursor):
+    """Ajoute les index des chemins d'accès fréquents sur entries et jira_subtasks."""
+    # Entrées d'un jour / d'une période triées par heure, total du jour et
+    # heure séquentielle (index couvrant grâce à duration)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_entries_date_time ON entries(date, time, duration)")
+    # Entrées non synchronisées (index partiel, ne contient que le reliquat à synchroniser)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_entries_unsynced
+        ON entries(date, time) WHERE is_synced = 0
+    """)
+    # Dernier ticket utilisé et tri des tickets par date d'utilisation
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_entries_ticket_date ON entries(ticket_id, date, time)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jira_subtasks_ticket_key ON jira_subtasks(ticket_key)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jira_paths_ticket_key ON jira_paths(ticket_key)")
+    cursor.execute("ANALYZE")
+
+
+# Recalcul complet des agrégats journaliers à partir de la table entries
+REBUILD_DAILY_TOTALS_SQL = """
+    INSERT INTO daily_totals (date, project_id, total_minutes, unsynced_minutes)
+    SELECT date, COALESCE(project_id, 0), SUM(duration),
+           SUM(CASE WHEN COALESCE(is_synced, 0) = 0 THEN duration ELSE 0 END)
+    FROM entries
+    GROUP BY date, COALESCE(project_id, 0)
+"""
+
+
+def _daily_totals(cursor):
+    """Crée la table d'agrégats journaliers maintenue par triggers.
+
+    project_id vaut 0 pour les entrées sans projet (une clé primaire ne peut
+    pas dédoublonner les NULL).
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS daily_totals (
+            date TEXT NOT NULL,
+            project_id INTEGER NOT NULL DEFAULT 0,
+            total_minutes INTEGER NOT NULL DEFAULT 0,
+            unsynced_minutes INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (date, project_id)
+        )
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_daily_totals_unsynced
+        ON daily_totals(unsynced_minutes) WHERE unsynced_minutes > 0
+    """)
+
+    add_new = """
+        INSERT INTO daily_totals (date, project_id, total_minutes, unsynced_minutes)
+        VALUES (NEW.date, COALESCE(NEW.project_id, 0), NEW.duration,
+                CASE WHEN COALESCE(NEW.is_synced, 0) = 0 THEN NEW.duration ELSE 0 END)
+        ON CONFLICT (date, project_id) DO UPDATE SET
+            total_minutes = total_minutes + excluded.total_minutes,
+            unsynced_minutes = unsynced_minutes + excluded.unsynced_minutes;
+    """
+    remove_old = """
+        UPDATE daily_totals SET
+            total_minutes = total_minutes - OLD.duration,
+            unsynced_minutes = unsynced_minutes
+                - CASE WHEN COALESCE(OLD.is_synced, 0) = 0 THEN OLD.duration ELSE 0 END
+        WHERE date = OLD.date AND project_id = COALESCE(OLD.project_id, 0);
+        DELETE FROM daily_totals
+        WHERE date = OLD.date AND project_id = COALESCE(OLD.project_id, 0)
+          AND total_minutes = 0 AND unsynced_minutes = 0;
+    """
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_entries_totals_insert
+        AFTER INSERT ON entries
+        BEGIN {add_new} END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_entries_totals_delete
+        AFTER DELETE ON entries
+        BEGIN {remove_old} END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_entries_totals_update
+        AFTER UPDATE OF date, project_id, duration, is_synced ON entries
+        BEGIN {remove_old} {add_new} END
+    """)
+
+    cursor.execute("DELETE FROM daily_totals")
+    cursor.execute(REBUILD_DAILY_TOTALS_SQL)
+
+
+def _projects_is_active(cursor):
+    """Ajoute la colonne is_active utilisée pour masquer des projets."""
+    if 'is_active' not in _columns(cursor, 'projects'):
+        cursor.execute("ALTER TABLE projects ADD COLUMN is_active INTEGER DEFAULT 1")
+
+
+# Index plein texte de la migration 8 : rowid = id * 2 pour une entrée,
+# id * 2 + 1 pour une sous-tâche Jira (remplacé par la migration 14)
+_SEARCH_INDEX_V8_SQL = [
+    "DELETE FROM search_index",
+    """
+    INSERT INTO search_index (rowid, ticket_key, title, body)
+    SELECT e.id * 2, COALESCE(e.ticket_number, t.ticket_number), e.ticket_title, e.description
+    FROM entries e
+    LEFT JOIN tickets t ON t.id = e.ticket_id
+    """,
+    """
+    INSERT INTO search_index (rowid, ticket_key, title, body)
+    SELECT id * 2 + 1, ticket_key, title, path
+    FROM jira_subtasks
+    """,
+]
+
+
+def _search_index(cursor):
+    """Crée l'index plein texte FTS5 sur les entrées et les sous-tâches Jira."""
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+            ticket_key, title, body,
+            tokenize = "unicode61 remove_diacritics 2",
+            prefix = '2 3'
+        )
+    """)
+
+    entry_values = """
+        (NEW.id * 2,
+         COALESCE(NEW.ticket_number, (SELECT ticket_number FROM tickets WHERE id = NEW.ticket_id)),
+         NEW.ticket_title, NEW.description)
+    """
+    subtask_values = "(NEW.id * 2 + 1, NEW.ticket_key, NEW.title, NEW.path)"
+    insert_sql = "INSERT INTO search_index (rowid, ticket_key, title, body) VALUES"
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_entries_search_insert AFTER INSERT ON entries
+        BEGIN {insert_sql} {entry_values}; END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_entries_search_delete AFTER DELETE ON entries
+        BEGIN DELETE FROM search_index WHERE rowid = OLD.id * 2; END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_entries_search_update
+        AFTER UPDATE OF ticket_id, ticket_number, ticket_title, description ON entries
+        BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 2;
+            {insert_sql} {entry_values};
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_subtasks_search_insert AFTER INSERT ON jira_subtasks
+        BEGIN {insert_sql} {subtask_values}; END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_subtasks_search_delete AFTER DELETE ON jira_subtasks
+        BEGIN DELETE FROM search_index WHERE rowid = OLD.id * 2 + 1; END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_subtasks_search_update AFTER UPDATE ON jira_subtasks
+        BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 2 + 1;
+            {insert_sql} {subtask_values};
+        END
+    """)
+
+    for statement in _SEARCH_INDEX_V8_SQL:
+        cursor.execute(statement)
+
+
+def _jira_issues(cursor):
+    """Crée la table des tickets Jira importés (relation parent-enfant).
+
+    Elle conserve la hiérarchie entre deux imports, ce qui permet de ne
+    recalculer que les chemins touchés par un import incrémental.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS jira_issues (
+            key TEXT PRIMARY KEY,
+            parent_key TEXT,
+            type TEXT,
+            title TEXT,
+            status TEXT
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jira_issues_parent_key ON jira_issues(parent_key)")
+
+
+def _jira_issue_paths(cursor):
+    """Crée le cache des chemins calculés à partir de jira_issues.
+
+    Le cache est vidé par trigger dès qu'un ticket est ajouté, supprimé,
+    renommé ou change de parent : les chemins sont alors recalculés (par
+    requête récursive) à la lecture suivante.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS jira_issue_paths (
+            key TEXT PRIMARY KEY,
+            path TEXT
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_jira_issues_paths_insert AFTER INSERT ON jira_issues
+        BEGIN
+            DELETE FROM jira_issue_paths;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_jira_issues_paths_delete AFTER DELETE ON jira_issues
+        BEGIN
+            DELETE FROM jira_issue_paths;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_jira_issues_paths_update
+        AFTER UPDATE OF parent_key, title, type ON jira_issues
+        BEGIN
+            DELETE FROM jira_issue_paths;
+        END
+    """)
+
+
+def _sync_outbox(cursor):
+    """Crée la file d'envoi persistante des worklogs.
+
+    Chaque entrée à synchroniser y passe par les états pending -> in_flight
+    -> done (ou failed après trop d'échecs). L'identifiant du worklog créé
+    est conservé : un envoi interrompu peut ainsi être vérifié auprès de
+    Jira au lieu d'être renvoyé.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sync_outbox (
+            entry_id INTEGER PRIMARY KEY,
+            ticket_number TEXT NOT NULL,
+            state TEXT NOT NULL DEFAULT 'pending'
+                CHECK (state IN ('pending', 'in_flight', 'done', 'failed')),
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            worklog_id TEXT,
+            next_attempt_at TEXT,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sync_outbox_state ON sync_outbox(state, next_attempt_at)")
+    # Une entrée supprimée n'a plus rien à envoyer
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_entries_outbox_delete AFTER DELETE ON entries
+        BEGIN
+            DELETE FROM sync_outbox WHERE entry_id = old.id;
+        END
+    """)
+
+
+def _jira_issue_cache(cursor):
+    """Crée le cache persistant des détails de tickets Jira (get_issue_details).
+
+    data vaut NULL pour un ticket inexistant (cache négatif des 404). etag
+    et last_modified permettent de revalider une entrée expirée par une
+    requête conditionnelle.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS jira_issue_cache (
+            key TEXT PRIMARY KEY,
+            data TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            expires_at REAL NOT NULL
+        )
+    """)
+
+
+# Suppression du chemin en cache d'un ticket et de tous ses descendants
+# ({key} : NEW.key ou OLD.key). UNION arrête le parcours en cas de cycle.
+INVALIDATE_ISSUE_PATHS_SQL = """
+    DELETE FROM jira_issue_paths WHERE key IN (
+        WITH RECURSIVE subtree(key) AS (
+            SELECT {key}
+            UNION
+            SELECT i.key FROM jira_issues i JOIN subtree s ON i.parent_key = s.key
+        )
+        SELECT key FROM subtree
+    );
+"""
+
+
+def _jira_issue_paths_subtree_triggers(cursor):
+    """Limite l'invalidation du cache des chemins au sous-arbre modifié.
+
+    Les triggers de la migration 10 vidaient tout jira_issue_paths à chaque
+    ligne écrite. Seuls le ticket touché et ses descendants sont maintenant
+    retirés du cache, et une mise à jour n'invalide rien si le parent, le
+    titre et le type sont inchangés (changement de statut par exemple).
+    Un ticket ajouté invalide aussi ses descendants déjà présents, dont le
+    chemin s'arrêtait à lui. Les triggers ne font rien quand le cache est
+    vide (import complet, voir HierarchyImporter._clear_tables).
+    """
+    for trigger in ('insert', 'delete', 'update'):
+        cursor.execute(f"DROP TRIGGER IF EXISTS trg_jira_issues_paths_{trigger}")
+    cursor.execute(f"""
+        CREATE TRIGGER trg_jira_issues_paths_insert AFTER INSERT ON jira_issues
+        WHEN EXISTS (SELECT 1 FROM jira_issue_paths)
+        BEGIN
+            {INVALIDATE_ISSUE_PATHS_SQL.format(key='NEW.key')}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER trg_jira_issues_paths_delete AFTER DELETE ON jira_issues
+        WHEN EXISTS (SELECT 1 FROM jira_issue_paths)
+        BEGIN
+            {INVALIDATE_ISSUE_PATHS_SQL.format(key='OLD.key')}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER trg_jira_issues_paths_update
+        AFTER UPDATE OF parent_key, title, type ON jira_issues
+        WHEN (OLD.parent_key IS NOT NEW.parent_key
+              OR OLD.title IS NOT NEW.title
+              OR OLD.type IS NOT NEW.type)
+         AND EXISTS (SELECT 1 FROM jira_issue_paths)
+        BEGIN
+            {INVALIDATE_ISSUE_PATHS_SQL.format(key='NEW.key')}
+        END
+    """)
+
+
+# Index plein texte, un par type de résultat (rowid = id de la ligne indexée)
+REBUILD_SEARCH_INDEX_SQL = [
+    "DELETE FROM entries_search",
+    """
+    INSERT INTO entries_search (rowid, ticket_key, title, body)
+    SELECT e.id, COALESCE(e.ticket_number, t.ticket_number), e.ticket_title, e.description
+    FROM entries e
+    LEFT JOIN tickets t ON t.id = e.ticket_id
+    """,
+    "DELETE FROM subtasks_search",
+    """
+    INSERT INTO subtasks_search (rowid, ticket_key, title, body)
+    SELECT id, ticket_key, title, path
+    FROM jira_subtasks
+    """,
+]
+
+
+def _search_index_per_kind(cursor):
+    """Sépare l'index plein texte en un index par type de résultat.
+
+    L'index commun de la migration 8 filtrait le type après coup
+    (rowid % 2) : une recherche de sous-tâches parcourait aussi toutes les
+    entrées. Les index de préfixes vont maintenant de 1 à 6 caractères,
+    pour qu'un début de mot soit lu directement dans l'index au lieu de
+    fusionner les listes de tous les mots qui commencent ainsi.
+    """
+    cursor.execute("DROP TABLE IF EXISTS search_index")
+    for table in ('entries', 'subtasks'):
+        for trigger in ('insert', 'delete', 'update'):
+            cursor.execute(f"DROP TRIGGER IF EXISTS trg_{table}_search_{trigger}")
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {table}_search USING fts5(
+                ticket_key, title, body,
+                tokenize = "unicode61 remove_diacritics 2",
+                prefix = '1 2 3 4 5 6'
+            )
+        """)
+
+    entry_values = """
+        (NEW.id,
+         COALESCE(NEW.ticket_number, (SELECT ticket_number FROM tickets WHERE id = NEW.ticket_id)),
+         NEW.ticket_title, NEW.description)
+    """
+    cursor.execute(f"""
+        CREATE TRIGGER trg_entries_search_insert AFTER INSERT ON entries
+        BEGIN INSERT INTO entries_search (rowid, ticket_key, title, body) VALUES {entry_values}; END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER trg_entries_search_delete AFTER DELETE ON entries
+        BEGIN DELETE FROM entries_search WHERE rowid = OLD.id; END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER trg_entries_search_update
+        AFTER UPDATE OF ticket_id, ticket_number, ticket_title, description ON entries
+        BEGIN
+            DELETE FROM entries_search WHERE rowid = OLD.id;
+            INSERT INTO entries_search (rowid, ticket_key, title, body) VALUES {entry_values};
+        END
+    """)
+
+    subtask_values = "(NEW.id, NEW.ticket_key, NEW.title, NEW.path)"
+    cursor.execute(f"""
+        CREATE TRIGGER trg_subtasks_search_insert AFTER INSERT ON jira_subtasks
+        BEGIN INSERT INTO subtasks_search (rowid, ticket_key, title, body) VALUES {subtask_values}; END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER trg_subtasks_search_delete AFTER DELETE ON jira_subtasks
+        BEGIN DELETE FROM subtasks_search WHERE rowid = OLD.id; END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER trg_subtasks_search_update AFTER UPDATE ON jira_subtasks
+        BEGIN
+            DELETE FROM subtasks_search WHERE rowid = OLD.id;
+            INSERT INTO subtasks_search (rowid, ticket_key, title, body) VALUES {subtask_values};
+        END
+    """)
+
+    for statement in REBUILD_SEARCH_INDEX_SQL:
+        cursor.execute(statement)
+
+
+# Liste ordonnée des migrations : (version, description, fonction)
+MIGRATIONS = [
+    (1, "Schéma initial", _initial_schema),
+    (2, "Colonnes Planner", _planner_columns),
+    (3, "Ancienne structure de la table tickets", _legacy_tickets_table),
+    (4, "Association des tickets sans projet", _associate_ticket_projects),
+    (5, "Index des entrées et des sous-tâches", _entries_indexes),
+    (6, "Agrégats journaliers des durées", _daily_totals),
+    (7, "Colonne is_active des projets", _projects_is_active),
+    (8, "Index plein texte des entrées et sous-tâches", _search_index),
+    (9, "Table des tickets Jira importés", _jira_issues),
+    (10, "Cache des chemins des tickets Jira", _jira_issue_paths),
+    (11, "File d'envoi des worklogs", _sync_outbox),
+    (12, "Cache des détails des tickets Jira", _jira_issue_cache),
+    (13, "Invalidation du cache des chemins par sous-arbre", _jira_issue_paths_subtree_triggers),
+    (14, "Index plein texte séparé par type de résultat", _search_index_per_kind),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    """Retourne la version du schéma enregistrée dans la base."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """Applique les migrations manquantes.
+
+    Chaque migration s'exécute dans sa propre transaction, avec la mise à
+    jour de user_version : une migration interrompue est entièrement annulée.
+
+    Args:
+        conn: Connexion SQLite
+
+    Returns:
+        int: Version du schéma après migration
+    """
+    current = get_schema_version(conn)
+    if current >= SCHEMA_VERSION:
+        return current
+
+    cursor = conn.cursor()
+    for version, description, step in MIGRATIONS:
+        if version <= current:
+            continue
+        try:
+            cursor.execute("BEGIN")
+            step(cursor)
+            cursor.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise RuntimeError(f"Échec de la migration {version} ({description}) : {str(e)}") from e
+        current = version
+    return current
+
+
+def ensure_schema(conn, db_path):
+    """Met le schéma à jour une seule fois par processus et par fichier.
+
+    Args:
+        conn: Connexion SQLite
+        db_path: Chemin du fichier de base de données
+    """
+    if db_path in _migrated_paths:
+        return
+    with _lock:
+        if db_path not in _migrated_paths:
+            migrate(conn)
+            _migrated_paths.add(db_path)
@@ -0,0 +1,222 @@
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+# Débits par défaut du trafic Jira (requêtes par seconde) et nombre maximal
+# de requêtes simultanées, partagés par tous les clients d'une même instance
+DEFAULT_READ_RATE = 20
+DEFAULT_WRITE_RATE = 5
+DEFAULT_MAX_CONCURRENT = 8
+
+# Ralentissement adaptatif : le débit est divisé par SLOWDOWN_FACTOR à chaque
+# 429, sans descendre sous MIN_RATE_RATIO fois le débit nominal, puis remonte
+# de RECOVERY_STEP fois le débit nominal par requête réussie
+SLOWDOWN_FACTOR = 2
+MIN_RATE_RATIO = 0.05
+RECOVERY_STEP = 0.02
+
+# Requêtes POST qui ne font que lire : recherche JQL et lecture groupée de
+# tickets passent leurs critères dans le corps de la requête
+READ_POST_PATHS = re.compile(
+    r'^/rest/api/\d+/(search(/jql|/approximate-count)?|issue/bulkfetch|jql/match)/?$'
+)
+
+
+class RateLimiter:
+    """Limiteur de débit à seau de jetons, partagé entre threads.
+
+    Le seau se remplit de `rate` jetons par seconde, jusqu'à `burst` jetons.
+    Chaque requête consomme un jeton ; acquire() attend qu'un jeton soit
+    disponible. throttled() réduit le débit (et peut suspendre le seau) quand
+    le serveur signale une surcharge ; succeeded() le ramène progressivement
+    au débit nominal.
+    """
+
+    def __init__(self, rate, burst=None):
+        """Initialise le limiteur.
+
+        Args:
+            rate: Nombre de requêtes autorisées par seconde
+            burst: Nombre de requêtes pouvant partir d'un coup (rate par défaut)
+        """
+        self.base_rate = float(rate)
+        self.rate = self.base_rate
+        self.burst = float(burst if burst is not None else max(1, rate))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+        # Métriques
+        self.acquired = 0
+        self.throttle_count = 0
+        self.total_wait = 0.0
+
+    def _refill(self, now):
+        """Ajoute les jetons accumulés depuis la dernière mise à jour."""
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Attend puis consomme un jeton.
+
+        Returns:
+            float: Temps d'attente en secondes
+        """
+        start = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    waited = now - start
+                    self.acquired += 1
+                    self.total_wait += waited
+                    return waited
+                wait = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(wait)
+
+    def throttled(self, pause=None):
+        """Signale une surcharge du serveur (réponse 429).
+
+        Args:
+            pause: Délai en secondes pendant lequel aucune requête ne doit partir
+                   (en-tête Retry-After), le cas échéant
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.base_rate * MIN_RATE_RATIO, self.rate / SLOWDOWN_FACTOR)
+            self._tokens = min(self._tokens, 1)
+            if pause:
+                self._paused_until = max(self._paused_until, now + pause)
+            self.throttle_count += 1
+
+    def succeeded(self):
+        """Signale une requête acceptée : le débit remonte vers le débit nominal."""
+        if self.rate >= self.base_rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = min(self.base_rate, self.rate + self.base_rate * RECOVERY_STEP)
+
+    def metrics(self):
+        """Métriques du limiteur.
+
+        Returns:
+            dict: rate, base_rate, acquired, throttled, total_wait, average_wait
+        """
+        with self._lock:
+            return {
+                'rate': self.rate,
+                'base_rate': self.base_rate,
+                'acquired': self.acquired,
+                'throttled': self.throttle_count,
+                'total_wait': self.total_wait,
+                'average_wait': self.total_wait / self.acquired if self.acquired else 0.0,
+            }
+
+
+class JiraRateLimiter:
+    """Limiteur commun à tout le trafic d'un processus vers une instance Jira.
+
+    Les lectures (GET, HEAD, OPTIONS et recherches envoyées en POST) et les
+    écritures ont chacune leur seau de jetons ; un sémaphore borne en plus le nombre de requêtes simultanées,
+    tous clients confondus. Une instance est partagée par URL de base.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    READ_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+    def __init__(self, read_rate=DEFAULT_READ_RATE, write_rate=DEFAULT_WRITE_RATE,
+                 max_concurrent=DEFAULT_MAX_CONCURRENT):
+        """Initialise le limiteur.
+
+        Args:
+            read_rate: Lectures autorisées par seconde
+            write_rate: Écritures autorisées par seconde
+            max_concurrent: Nombre maximal de requêtes simultanées
+        """
+        self.read = RateLimiter(read_rate)
+        self.write = RateLimiter(write_rate)
+        self.max_concurrent = max_concurrent
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    @classmethod
+    def for_host(cls, base_url):
+        """Renvoie le limiteur partagé d'une instance Jira (créé au premier appel)."""
+        with cls._instances_lock:
+            limiter = cls._instances.get(base_url)
+            if limiter is None:
+                limiter = cls()
+                cls._instances[base_url] = limiter
+            return limiter
+
+    def is_read(self, method, path=None):
+        """Indique si une requête ne fait que lire.
+
+        Args:
+            method: Méthode HTTP
+            path: Chemin de l'API (ex: /rest/api/3/search) ; une recherche
+                  envoyée en POST compte comme une lecture
+        """
+        method = method.upper()
+        if method in self.READ_METHODS:
+            return True
+        return method == 'POST' and path is not None and bool(READ_POST_PATHS.match(path))
+
+    def bucket(self, method, path=None):
+        """Seau de jetons correspondant à une requête (méthode et chemin)."""
+        return self.read if self.is_read(method, path) else self.write
+
+    @contextmanager
+    def slot(self, method, path=None):
+        """Attend un jeton et une place libre pour envoyer une requête.
+
+        Exemple:
+            with limiter.slot('POST', '/rest/api/3/search'):
+                response = session.post(url, json=payload)
+        """
+        self.bucket(method, path).acquire()
+        self._slots.acquire()
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    def throttled(self, method, pause=None, path=None):
+        """Signale une réponse 429 : ralentit le seau de la requête."""
+        self.bucket(method, path).throttled(pause)
+
+    def succeeded(self, method, path=None):
+        """Signale une requête acceptée."""
+        self.bucket(method, path).succeeded()
+
+    def metrics(self):
+        """Métriques des deux seaux et de la concurrence.
+
+        Returns:
+            dict: {'read': {...}, 'write': {...}, 'in_flight', 'peak_in_flight', 'max_concurrent'}
+        """
+        with self._lock:
+            in_flight, peak = self.in_flight, self.peak_in_flight
+        return {
+            'read': self.read.metrics(),
+            'write': self.write.metrics(),
+            'in_flight': in_flight,
+            'peak_in_flight': peak,
+            'max_concurrent': self.max_concurrent,
+        }
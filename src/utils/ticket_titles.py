@@ -0,0 +1,45 @@
+"""Rafraîchissement en masse des titres des tickets depuis Jira."""
+import time
+
+# Date (timestamp) du dernier rafraîchissement complet
+REFRESH_SETTING = 'jira_titles_refreshed_at'
+# Intervalle minimal entre deux rafraîchissements automatiques (secondes)
+REFRESH_INTERVAL = 24 * 3600
+
+
+def refresh_due(db):
+    """Indique si le rafraîchissement automatique doit être lancé."""
+    try:
+        last = float(db.get_setting(REFRESH_SETTING, '0') or 0)
+    except ValueError:
+        last = 0
+    return time.time() - last >= REFRESH_INTERVAL
+
+
+def refresh_ticket_titles(jira, db, chunk_size=100):
+    """Met à jour le titre de tous les tickets actifs.
+
+    Les titres sont lus par lots (JiraClient.get_issue_titles) puis seuls
+    ceux qui ont changé sont écrits, dans une seule transaction.
+
+    Args:
+        jira: Client Jira (JiraClient)
+        db: Base de données (Database)
+        chunk_size: Nombre de tickets par requête Jira
+
+    Returns:
+        tuple: (tickets vérifiés, titres mis à jour)
+    """
+    tickets = db.get_active_tickets()
+    titles = jira.get_issue_titles([ticket['ticket_number'] for ticket in tickets], chunk_size)
+
+    changes = []
+    for ticket in tickets:
+        title = titles.get(ticket['ticket_number'])
+        if title and title != ticket['title']:
+            changes.append((ticket['id'], title))
+    if changes:
+        db.update_ticket_titles(changes)
+
+    db.save_setting(REFRESH_SETTING, str(time.time()))
+    return len(tickets), len(changes)
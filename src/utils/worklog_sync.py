@@ -0,0 +1,431 @@
+"""Synchronisation des entrées avec les worklogs Jira.
+
+Les envois passent par la file persistante sync_outbox : chaque élément est
+réservé (état in_flight) avant l'appel à Jira puis marqué envoyé avec
+l'identifiant du worklog créé. Chaque worklog porte la propriété
+OUTBOX_PROPERTY avec l'ID de son entrée, ce qui permet de retrouver, après
+un arrêt brutal, les envois interrompus qui ont tout de même abouti.
+
+En mode regroupement, les entrées d'un même ticket et d'un même jour
+partent dans un seul worklog dont l'identifiant est associé à chacune.
+"""
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+
+from utils.jira_client import WORKLOG_UTC_OFFSET
+
+# Nombre de worklogs envoyés en parallèle (le débit est borné par le
+# limiteur de trafic du client Jira)
+DEFAULT_MAX_WORKERS = 4
+
+# Propriété Jira attachée aux worklogs créés par l'application
+OUTBOX_PROPERTY = 'logtracker'
+# Nombre de tentatives avant l'abandon d'un élément
+MAX_ATTEMPTS = 8
+# Délai avant la première nouvelle tentative, doublé à chaque échec (secondes)
+RETRY_BASE_DELAY = 60
+RETRY_MAX_DELAY = 6 * 3600
+# Délai au-delà duquel un élément in_flight est considéré comme interrompu
+# (secondes) : plus long qu'un envoi, nouvelles tentatives HTTP comprises
+IN_FLIGHT_LEASE = 10 * 60
+# Erreurs HTTP 4xx qui méritent tout de même une nouvelle tentative
+RETRYABLE_CLIENT_STATUSES = {408, 429}
+# Paramètre activant la recherche des worklogs déjà présents dans Jira
+RECONCILE_SETTING = 'jira_reconcile_worklogs'
+# Paramètre activant le regroupement des entrées par ticket et par jour
+COALESCE_SETTING = 'jira_coalesce_worklogs'
+
+
+def entry_comment(entry):
+    """Commentaire du worklog d'une entrée (titre du ticket puis description)."""
+    description = entry.get('description') or ''
+    if entry.get('ticket_title'):
+        description = f"{entry['ticket_title']}\n{description}"
+    return description
+
+
+def entry_started(entry):
+    """Date et heure de début d'une entrée (datetime)."""
+    return datetime.strptime(f"{entry['date']} {entry['time']}", "%Y-%m-%d %H:%M")
+
+
+def group_comment(entries):
+    """Commentaire du worklog regroupant plusieurs entrées d'un même ticket.
+
+    Le titre du ticket n'apparaît qu'une fois, suivi des descriptions dans
+    l'ordre chronologique.
+    """
+    if len(entries) == 1:
+        return entry_comment(entries[0])
+    ordered = sorted(entries, key=entry_started)
+    lines = [entry['description'] for entry in ordered if entry.get('description')]
+    title = next((entry['ticket_title'] for entry in ordered if entry.get('ticket_title')), None)
+    if title:
+        lines.insert(0, title)
+    return "\n".join(lines)
+
+
+def group_entries(entries, coalesce):
+    """Répartit les entrées en worklogs à envoyer.
+
+    Args:
+        entries: Entrées à envoyer
+        coalesce: Regroupe les entrées par (ticket, jour) si True
+
+    Returns:
+        list: Listes d'entrées, une par worklog
+    """
+    if not coalesce:
+        return [[entry] for entry in entries]
+    groups = {}
+    for entry in entries:
+        groups.setdefault((entry['ticket_number'], entry['date']), []).append(entry)
+    return list(groups.values())
+
+
+def retry_delay(attempts):
+    """Délai avant une nouvelle tentative, None si l'élément doit être abandonné.
+
+    Args:
+        attempts: Nombre de tentatives déjà effectuées
+    """
+    if attempts >= MAX_ATTEMPTS:
+        return None
+    return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** max(0, attempts - 1))
+
+
+def is_permanent_error(error):
+    """Indique si une erreur d'envoi ne se résoudra pas en réessayant.
+
+    Les erreurs 4xx (ticket inexistant, droits insuffisants, données
+    refusées...) sont définitives, sauf 408 et 429.
+    """
+    response = getattr(error, 'response', None)
+    if response is None:
+        return False
+    status = response.status_code
+    return 400 <= status < 500 and status not in RETRYABLE_CLIENT_STATUSES
+
+
+def worklog_entry_ids(worklog):
+    """IDs des entrées à l'origine d'un worklog Jira (liste vide s'il n'a pas été créé par l'application)."""
+    for prop in worklog.get('properties') or []:
+        if prop.get('key') == OUTBOX_PROPERTY:
+            value = prop.get('value') or {}
+            if 'entry_ids' in value:
+                return list(value['entry_ids'])
+            if value.get('entry_id') is not None:
+                return [value['entry_id']]
+    return []
+
+
+def worklog_key(worklog):
+    """Début (à la minute, avec fuseau) et durée en secondes d'un worklog Jira.
+
+    Returns:
+        tuple: (début, durée) ou None si le début est illisible
+    """
+    try:
+        started = datetime.strptime(worklog.get('started') or '', '%Y-%m-%dT%H:%M:%S.%f%z')
+    except ValueError:
+        return None
+    return started.replace(second=0, microsecond=0), worklog.get('timeSpentSeconds')
+
+
+def group_key(entries):
+    """Début et durée en secondes du worklog envoyé pour un groupe d'entrées (comme worklog_key)."""
+    offset = datetime.strptime(WORKLOG_UTC_OFFSET, '%z').tzinfo
+    started = min(entry_started(entry) for entry in entries).replace(tzinfo=offset)
+    return started, sum(int(entry['duration']) for entry in entries) * 60
+
+
+def same_user(user, other):
+    """Indique si deux utilisateurs Jira sont identiques (accountId sur Cloud, name sur Server)."""
+    if not user or not other:
+        return False
+    for field in ('accountId', 'key', 'name'):
+        if user.get(field) and other.get(field):
+            return user[field] == other[field]
+    return False
+
+
+def worklog_matches(worklog, entry):
+    """Indique si un worklog correspond à une entrée (début, durée et commentaire)."""
+    return (worklog_key(worklog) == group_key([entry])
+            and (worklog.get('comment') or '') == entry_comment(entry))
+
+
+class WorklogSyncEngine:
+    """Envoie les worklogs des entrées placées dans la file sync_outbox.
+
+    Les envois partent en parallèle (au plus max_workers à la fois) et
+    passent par un limiteur de débit commun. Avec coalesce, les entrées
+    d'un même ticket et d'un même jour sont regroupées en un seul worklog
+    (durées additionnées, descriptions concaténées). Un élément n'est réservé qu'au
+    moment de son envoi : une annulation laisse les autres dans la file,
+    et un échec temporaire les y remet avec un délai croissant.
+    """
+
+    def __init__(self, jira, db, max_workers=DEFAULT_MAX_WORKERS, progress=None,
+                 coalesce=False):
+        """Initialise le moteur.
+
+        Args:
+            jira: Client Jira (JiraClient)
+            db: Base de données (Database)
+            max_workers: Nombre maximal d'envois simultanés
+            progress: Fonction appelée avec (éléments traités, total)
+            coalesce: Regroupe les entrées par ticket et par jour
+        """
+        self.jira = jira
+        self.db = db
+        self.max_workers = max_workers
+        self.progress = progress
+        self.coalesce = coalesce
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Demande l'arrêt : les envois déjà partis se terminent, les autres restent dans la file."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        """Indique si l'arrêt a été demandé."""
+        return self._cancelled.is_set()
+
+    def _post(self, group):
+        """Envoie le worklog d'un groupe d'entrées (exécuté dans un thread du pool).
+
+        Returns:
+            str: Identifiant du worklog créé
+        """
+        return self.jira.create_worklog(
+            group[0]['ticket_number'],
+            sum(int(entry['duration']) for entry in group),
+            group_comment(group),
+            min(entry_started(entry) for entry in group),
+            properties={OUTBOX_PROPERTY: {'entry_ids': [entry['id'] for entry in group]}}
+        )
+
+    def run(self, entries, reconcile=False):
+        """Place des entrées dans la file puis envoie tout ce qui est prêt.
+
+        Args:
+            entries: Entrées telles que renvoyées par Database.get_unsynchronized_entries
+            reconcile: Cherche d'abord dans Jira les worklogs déjà présents
+
+        Returns:
+            tuple: (identifiants synchronisés, messages d'erreur)
+        """
+        synced_ids = []
+
+        # Les entrées sans ticket n'ont rien à envoyer
+        without_ticket = [entry['id'] for entry in entries if not entry.get('ticket_number')]
+        if without_ticket:
+            self.db.mark_entries_as_synced(without_ticket)
+            synced_ids.extend(without_ticket)
+
+        self.db.enqueue_sync([entry['id'] for entry in entries if entry.get('ticket_number')])
+
+        if reconcile and not self.cancelled:
+            synced_ids.extend(self.reconcile(self.db.get_due_sync_items()))
+
+        drained_ids, errors = self.drain()
+        return synced_ids + drained_ids, errors
+
+    def drain(self):
+        """Envoie les éléments de la file dont la prochaine tentative est due.
+
+        Returns:
+            tuple: (identifiants synchronisés, messages d'erreur)
+        """
+        synced_ids = []
+        errors = []
+        entries = self.db.get_due_sync_items()
+        groups = deque(group_entries(entries, self.coalesce))
+        total = len(entries)
+        done = 0
+        self._report(done, total)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            running = {}
+            while groups or running:
+                # Réserve et lance de nouveaux envois tant qu'il reste de la place
+                while groups and len(running) < self.max_workers and not self.cancelled:
+                    group = groups.popleft()
+                    claimed = [entry for entry in group if self.db.claim_sync_item(entry['id'])]
+                    # Les entrées non réservées sont déjà prises en charge ailleurs
+                    done += len(group) - len(claimed)
+                    if claimed:
+                        running[executor.submit(self._post, claimed)] = claimed
+                if self.cancelled:
+                    groups.clear()
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    group = running.pop(future)
+                    try:
+                        worklog_id = future.result()
+                    except Exception as e:
+                        errors.append(self._fail(group, e))
+                    else:
+                        # Marquées synchronisées dès que leur worklog est accepté
+                        ids = [entry['id'] for entry in group]
+                        self.db.complete_sync_items(ids, worklog_id)
+                        synced_ids.extend(ids)
+                    done += len(group)
+                    self._report(done, total)
+        finally:
+            executor.shutdown(wait=True)
+
+        return synced_ids, errors
+
+    def _fail(self, group, error):
+        """Remet un groupe en file (ou l'abandonne) après un échec et renvoie le message d'erreur."""
+        attempts = max(entry.get('attempts', 0) for entry in group) + 1
+        delay = None if is_permanent_error(error) else retry_delay(attempts)
+        for entry in group:
+            self.db.fail_sync_item(entry['id'], str(error), delay)
+        ticket_number = group[0]['ticket_number']
+        if delay is None:
+            return f"Échec définitif de la synchronisation du ticket {ticket_number} : {str(error)}"
+        return (f"Erreur lors de la synchronisation du ticket {ticket_number}, "
+                f"nouvelle tentative dans {delay // 60} min : {str(error)}")
+
+    def reconcile(self, entries):
+        """Marque envoyées les entrées dont le worklog existe déjà dans Jira.
+
+        Utile après une réinstallation ou la restauration d'une sauvegarde :
+        seul is_synced gardait la trace des envois. Un worklog correspond à
+        une entrée s'il a été saisi par l'utilisateur connecté avec le même
+        début (à la minute) et la même durée, ou s'il porte la propriété
+        OUTBOX_PROPERTY de l'entrée. En mode regroupement, un worklog peut
+        aussi correspondre à toutes les entrées d'un ticket pour un jour.
+        Chaque worklog ne sert qu'une fois.
+
+        Args:
+            entries: Éléments en attente (Database.get_due_sync_items)
+
+        Returns:
+            list: IDs des entrées marquées envoyées
+        """
+        by_ticket = {}
+        for entry in entries:
+            by_ticket.setdefault(entry['ticket_number'], []).append(entry)
+        if not by_ticket:
+            return []
+
+        myself = self.jira.get_myself()
+        worklogs_by_ticket = self.jira.get_worklogs_for_issues(list(by_ticket))
+
+        reconciled = []
+        for ticket, ticket_entries in by_ticket.items():
+            # Ticket illisible : ses entrées seront envoyées normalement
+            if ticket not in worklogs_by_ticket:
+                continue
+            worklogs = [worklog for worklog in worklogs_by_ticket[ticket]
+                        if same_user(worklog.get('author'), myself)]
+            by_entry = {}
+            by_key = {}
+            for worklog in worklogs:
+                for entry_id in worklog_entry_ids(worklog):
+                    by_entry[entry_id] = worklog
+                by_key.setdefault(worklog_key(worklog), []).append(worklog)
+
+            # Les worklogs portant la propriété sont réservés à leurs entrées
+            used = {id(worklog) for worklog in by_entry.values()}
+
+            def take_by_key(key):
+                for worklog in by_key.get(key, []):
+                    if id(worklog) not in used:
+                        used.add(id(worklog))
+                        return worklog
+                return None
+
+            remaining = []
+            for entry in ticket_entries:
+                worklog = by_entry.get(entry['id']) or take_by_key(group_key([entry]))
+                if worklog is not None:
+                    self.db.complete_sync_item(entry['id'], str(worklog.get('id', '')))
+                    reconciled.append(entry['id'])
+                else:
+                    remaining.append(entry)
+
+            if self.coalesce:
+                for group in group_entries(remaining, True):
+                    worklog = take_by_key(group_key(group))
+                    if worklog is not None:
+                        ids = [entry['id'] for entry in group]
+                        self.db.complete_sync_items(ids, str(worklog.get('id', '')))
+                        reconciled.extend(ids)
+        return reconciled
+
+    def recover(self, entry_ids=None, lease=IN_FLIGHT_LEASE):
+        """Traite les envois interrompus (éléments restés in_flight).
+
+        Les worklogs des tickets concernés sont relus : un envoi retrouvé
+        est marqué envoyé, les autres sont remis en file. Seuls les
+        éléments réservés depuis plus de lease secondes sont repris : un
+        élément plus récent peut être en cours d'envoi dans un autre thread
+        (SyncThread pendant le vidage d'arrière-plan).
+
+        Args:
+            entry_ids: Limite la reprise à ces entrées (toutes par défaut)
+            lease: Âge minimal en secondes d'une réservation reprise
+
+        Returns:
+            list: IDs des entrées qui n'ont pas pu être vérifiées (Jira injoignable)
+        """
+        items = self.db.get_in_flight_sync_items(older_than=lease)
+        if entry_ids is not None:
+            wanted = set(entry_ids)
+            items = [item for item in items if item['id'] in wanted]
+        if not items:
+            return []
+
+        by_ticket = {}
+        for item in items:
+            by_ticket.setdefault(item['ticket_number'], []).append(item)
+
+        def fetch(ticket_number):
+            return self.jira.get_worklogs(ticket_number, expand_properties=True)
+
+        unresolved = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(fetch, ticket): ticket for ticket in by_ticket}
+            for future, ticket in futures.items():
+                try:
+                    worklogs = future.result()
+                except Exception as e:
+                    print(f"Erreur lors de la vérification des worklogs du ticket {ticket}: {str(e)}")
+                    unresolved.extend(item['id'] for item in by_ticket[ticket])
+                    continue
+
+                by_entry = {}
+                matched = set()
+                for worklog in worklogs:
+                    for entry_id in worklog_entry_ids(worklog):
+                        by_entry[entry_id] = worklog
+                for item in by_ticket[ticket]:
+                    worklog = by_entry.get(item['id'])
+                    if worklog is None:
+                        # Propriété absente : se rabat sur le contenu du worklog
+                        worklog = next((w for w in worklogs
+                                        if not worklog_entry_ids(w) and id(w) not in matched
+                                        and worklog_matches(w, item)), None)
+                    if worklog is not None:
+                        matched.add(id(worklog))
+                        self.db.complete_sync_item(item['id'], str(worklog.get('id', '')))
+                    else:
+                        self.db.reset_sync_item(item['id'])
+        return unresolved
+
+    def _report(self, done, total):
+        """Signale l'avancement."""
+        if self.progress:
+            self.progress(done, total)
@@ -0,0 +1,41 @@
+"""Latence par appel : connexion persistante contre connexion par appel (user-001).
+
+    python -m pytest tests/benchmarks/bench_db_connection.py -s
+"""
+from datetime import date
+
+import pytest
+
+from benchutil import measure, report
+from synthetic import populate_history
+
+pytest.importorskip("PyQt6")
+from utils.database import Database  # noqa: E402
+
+REPEAT = 300
+
+
+@pytest.mark.parametrize('entries', [10000, 100000])
+def test_per_call_latency(tmp_path, entries):
+    db = Database(str(tmp_path / 'logtracker.db'))
+    days = populate_history(db, entries=entries)
+    day = date.fromisoformat(days[-1])
+
+    calls = {
+        'get_entries_for_day': lambda: db.get_entries_for_day(day),
+        'get_total_minutes_for_day': lambda: db.get_total_minutes_for_day(day.isoformat()),
+        'get_unsynced_minutes': db.get_unsynced_minutes,
+    }
+
+    rows = [("appel", "connexion par appel (ms)", "connexion persistante (ms)")]
+    for name, call in calls.items():
+        def per_call_connection():
+            # Ancien fonctionnement : ouverture puis fermeture à chaque appel
+            db.close()
+            call()
+        before = measure(per_call_connection, REPEAT)
+        after = measure(call, REPEAT)
+        rows.append((name, f"{before:.3f}", f"{after:.3f}"))
+        assert after < before
+    report(f"Latence par appel, {entries} entrées", rows)
+    db.close()
@@ -0,0 +1,82 @@
+"""Résolution des epics lors d'un import : une requête séquentielle par ticket
+contre lots parallèles mémorisés (user-012).
+
+    python -m pytest tests/benchmarks/bench_jira_epics.py -s
+"""
+import time
+
+import pytest
+
+from benchutil import report
+from stubjira import EPIC_ROUTE, SEARCH_ROUTE, StubJira, epic_route, search_route
+from synthetic import jira_issues
+
+requests = pytest.importorskip("requests")
+from utils.jira_client import JiraClient  # noqa: E402
+from utils.rate_limiter import JiraRateLimiter  # noqa: E402
+
+ISSUES = 1000
+IMPORTS = 2  # Import complet puis réimport (ou import d'un autre mode)
+LATENCY = 0.005  # Latence ajoutée par le serveur de test à chaque réponse (s)
+
+
+def legacy_search(base_url):
+    """Ancien fonctionnement : pages séquentielles, epic cherché ticket par ticket."""
+    parents = {}
+    start_at = 0
+    while True:
+        data = requests.post(f"{base_url}/rest/api/3/search",
+                             json={'jql': 'project = PROJ', 'startAt': start_at, 'maxResults': 100}).json()
+        for issue in data['issues']:
+            fields = issue['fields']
+            if fields.get('parent'):
+                parents[issue['key']] = fields['parent']['key']
+            elif fields.get('customfield_10014'):
+                parents[issue['key']] = fields['customfield_10014']
+            elif fields['issuetype']['name'].lower() == 'epic':
+                parents[issue['key']] = fields['project']['key']
+            else:
+                response = requests.get(f"{base_url}/rest/agile/1.0/issue/{issue['key']}/epic")
+                if response.status_code == 200 and 'key' in response.json():
+                    parents[issue['key']] = response.json()['key']
+                else:
+                    parents[issue['key']] = fields['project']['key']
+        start_at += len(data['issues'])
+        if len(data['issues']) < 100:
+            return parents
+
+
+def test_epic_lookups_1000_issues():
+    issues, agile_epics = jira_issues(ISSUES)
+    routes = {**search_route(issues), **epic_route(agile_epics)}
+
+    with StubJira(routes, latency=LATENCY) as jira:
+        start = time.perf_counter()
+        for _ in range(IMPORTS):
+            legacy = legacy_search(jira.url)
+        before = time.perf_counter() - start
+        before_requests = jira.count(EPIC_ROUTE), jira.count(SEARCH_ROUTE)
+
+    with StubJira(routes, latency=LATENCY) as jira:
+        client = JiraClient(jira.url, 'token', 'moi@example.com',
+                            rate_limiter=JiraRateLimiter(read_rate=1e6, write_rate=1e6))
+        start = time.perf_counter()
+        for _ in range(IMPORTS):
+            parsed = client.search_issues('project = PROJ', max_results=ISSUES)
+        after = time.perf_counter() - start
+        after_requests = jira.count(EPIC_ROUTE), jira.count(SEARCH_ROUTE)
+        client.close()
+
+    # Les parents obtenus sont identiques
+    assert {issue['key']: issue['parent_key'] for issue in parsed} == legacy
+
+    report(f"{IMPORTS} imports de {ISSUES} tickets, latence du serveur {LATENCY * 1000:.0f} ms", [
+        ("", "requêtes epic", "recherches", "durée (s)"),
+        ("séquentiel, un epic par ticket", *before_requests, f"{before:.2f}"),
+        ("lots parallèles mémorisés", *after_requests, f"{after:.2f}"),
+    ])
+    unlinked = sum(1 for issue in issues
+                   if issue['fields']['issuetype']['name'] == 'Story'
+                   and 'customfield_10014' not in issue['fields'])
+    assert before_requests[0] == IMPORTS * unlinked
+    assert after_requests[0] == unlinked
@@ -0,0 +1,96 @@
+"""Niveau, projet et chemin de 50 000 tickets : remontées de parents contre
+IssueHierarchy (user-018).
+
+    python -m pytest tests/benchmarks/bench_jira_hierarchy.py -s
+
+Avant user-018, chaque ticket était parcouru trois fois jusqu'à sa racine
+(niveau dans get_issue_hierarchy, projet dans get_issue_project, chemin
+dans build_path avec insert(0, ...)), soit O(n·profondeur). Sur une
+hiérarchie projet/epic/story/sous-tâche (profondeur 4), ces remontées sont
+courtes et la passe unique n'est pas plus rapide : seule l'identité des
+sorties y est vérifiée. Le gain apparaît sur des lignées longues (epics
+reliés entre eux par des liens « is part of »).
+"""
+import time
+
+from benchutil import report
+from synthetic import hierarchy_tickets
+from utils.jira_hierarchy import IssueHierarchy, format_path
+
+ISSUES = 50000
+# Lignées longues : CHAINS chaînes de ISSUES // CHAINS tickets
+CHAINS = 1000
+
+
+def legacy(tickets):
+    """Calcul d'avant user-018 : trois remontées par ticket."""
+    tickets_dict = {issue['key']: issue for issue in tickets}
+    result = {}
+    for issue in tickets:
+        level = 0
+        current_key = issue['parent_key']
+        while current_key and current_key in tickets_dict:
+            level += 1
+            current_key = tickets_dict[current_key]['parent_key']
+
+        current = issue
+        while current and current.get('parent_key'):
+            current = tickets_dict.get(current['parent_key'])
+        project = (current or issue)['key']
+
+        path_parts = []
+        current_key = issue['key']
+        while current_key:
+            current = tickets_dict.get(current_key)
+            if not current:
+                break
+            path_parts.insert(0, current['title'])
+            current_key = current['parent_key']
+        result[issue['key']] = (level, project, format_path(issue, path_parts))
+    return result
+
+
+def memoized(tickets):
+    """Une passe mémoïsée d'IssueHierarchy."""
+    hierarchy = IssueHierarchy(tickets)
+    levels, roots, heads = hierarchy.levels, hierarchy.roots, hierarchy.heads
+    return {key: (levels[key], roots[key], format_path(issue, heads[key]))
+            for key, issue in hierarchy.issues.items()}
+
+
+def timed(fn, tickets, repeat=5):
+    """Meilleure durée en millisecondes et résultat."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(tickets)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def deep_tickets():
+    """Epics chaînés les uns aux autres, ISSUES // CHAINS par lignée."""
+    depth = ISSUES // CHAINS
+    return [
+        {'key': f"PROJ-{chain * depth + i + 1}", 'title': f"Epic {chain}.{i}", 'type': 'epic',
+         'parent_key': f"PROJ-{chain * depth + i}" if i else None}
+        for chain in range(CHAINS) for i in range(depth)
+    ]
+
+
+def test_hierarchy_50000_issues():
+    rows = [("", "trois remontées par ticket", "IssueHierarchy")]
+    timings = {}
+    for name, tickets in (("projet/epic/story/sous-tâche", hierarchy_tickets(ISSUES)),
+                          (f"lignées de {ISSUES // CHAINS} epics", deep_tickets())):
+        before_ms, before = timed(legacy, tickets)
+        after_ms, after = timed(memoized, tickets)
+        # Sortie identique (niveaux, projets et chemins)
+        assert after == before
+        rows.append((name, f"{before_ms:.0f}", f"{after_ms:.0f}"))
+        timings[name] = (before_ms, after_ms)
+
+    report(f"Niveau, projet et chemin de {ISSUES} tickets (ms)", rows)
+    before_ms, after_ms = timings[rows[-1][0]]
+    assert after_ms < before_ms
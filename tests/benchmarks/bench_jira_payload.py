@@ -0,0 +1,185 @@
+"""Taille et temps d'analyse des réponses de recherche, avec et sans
+expand=names,schema,transitions (user-014).
+
+    python -m pytest tests/benchmarks/bench_jira_payload.py -s
+
+Les 5 000 tickets sont générés avec les objets complets que renvoie Jira
+(issuetype, status, project avec leurs URL et icônes). Le serveur de test
+ajoute transitions, names et schema quand ils sont demandés.
+"""
+import json
+import time
+
+import pytest
+
+from benchutil import report
+from stubjira import SEARCH_ROUTE, StubJira
+from synthetic import jira_issues
+
+requests = pytest.importorskip("requests")
+from utils.jira_client import FIELD_PROFILES, JiraClient  # noqa: E402
+from utils.rate_limiter import JiraRateLimiter  # noqa: E402
+
+ISSUES = 5000
+PAGE = 100
+BASE = 'https://example.atlassian.net'
+
+# Requête d'avant user-014
+LEGACY_FIELDS = ['key', 'summary', 'issuetype', 'parent', 'customfield_10014',
+                 'project', 'issuelinks', 'status']
+LEGACY_EXPAND = ['names', 'schema', 'transitions']
+
+STATUSES = {
+    'To Do': ('10000', 'new', 'blue-gray'),
+    'In Progress': ('3', 'indeterminate', 'yellow'),
+    'Done': ('10001', 'done', 'green'),
+}
+TYPES = {'Epic': ('10000', 1), 'Story': ('10001', 0), 'Sub-task': ('10003', -1)}
+
+
+def status_object(name):
+    status_id, category, color = STATUSES[name]
+    return {
+        'self': f"{BASE}/rest/api/3/status/{status_id}",
+        'description': '',
+        'iconUrl': f"{BASE}/",
+        'name': name,
+        'id': status_id,
+        'statusCategory': {
+            'self': f"{BASE}/rest/api/3/statuscategory/{category}",
+            'id': len(category),
+            'key': category,
+            'colorName': color,
+            'name': name,
+        },
+    }
+
+
+def recorded_issue(issue, number):
+    """Ticket au format complet de Jira (objets imbriqués, URL, icônes)."""
+    fields = issue['fields']
+    type_name = fields['issuetype']['name']
+    type_id, level = TYPES[type_name]
+    fields = {
+        **fields,
+        'issuetype': {
+            'self': f"{BASE}/rest/api/3/issuetype/{type_id}",
+            'id': type_id,
+            'description': f"Type de ticket {type_name}",
+            'iconUrl': f"{BASE}/rest/api/2/universal_avatar/view/type/issuetype/avatar/{type_id}?size=medium",
+            'name': type_name,
+            'subtask': level < 0,
+            'avatarId': 10300 + level,
+            'hierarchyLevel': level,
+        },
+        'project': {
+            'self': f"{BASE}/rest/api/3/project/10000",
+            'id': '10000',
+            'key': fields['project']['key'],
+            'name': 'Projet',
+            'projectTypeKey': 'software',
+            'simplified': False,
+            'avatarUrls': {size: f"{BASE}/rest/api/3/universal_avatar/view/type/project/avatar/10400?size={label}"
+                           for size, label in (('48x48', 'large'), ('24x24', 'small'),
+                                               ('16x16', 'xsmall'), ('32x32', 'medium'))},
+        },
+        'status': status_object(fields['status']['name']),
+    }
+    if 'parent' in fields:
+        fields['parent'] = {**fields['parent'], 'id': str(20000 + number),
+                            'self': f"{BASE}/rest/api/3/issue/{20000 + number}"}
+    return {
+        'expand': 'operations,versionedRepresentations,editmeta,changelog,renderedFields',
+        'id': str(10000 + number),
+        'self': f"{BASE}/rest/api/3/issue/{10000 + number}",
+        'key': issue['key'],
+        'fields': fields,
+    }
+
+
+def transitions():
+    return [
+        {
+            'id': str(11 * (i + 1)),
+            'name': name,
+            'to': status_object(name),
+            'hasScreen': False,
+            'isGlobal': True,
+            'isInitial': False,
+            'isAvailable': True,
+            'isConditional': False,
+            'isLooped': False,
+        }
+        for i, name in enumerate(STATUSES)
+    ]
+
+
+def search_with_expand(issues):
+    """Route de recherche qui honore fields et expand comme Jira."""
+    def search(match, query, body):
+        start = body.get('startAt', 0)
+        size = min(body.get('maxResults', 50), PAGE)
+        requested = set(body.get('fields') or [])
+        expand = set(body.get('expand') or [])
+        page = []
+        for issue in issues[start:start + size]:
+            issue = {**issue, 'fields': {name: value for name, value in issue['fields'].items()
+                                         if name in requested}}
+            if 'transitions' in expand:
+                issue['transitions'] = transitions()
+            page.append(issue)
+        data = {'expand': 'schema,names', 'startAt': start, 'maxResults': size,
+                'total': len(issues), 'issues': page}
+        if 'names' in expand:
+            data['names'] = {name: name.capitalize() for name in requested if name != 'key'}
+        if 'schema' in expand:
+            data['schema'] = {name: {'type': 'any', 'system': name} for name in requested if name != 'key'}
+        return 200, data
+    return {('POST', SEARCH_ROUTE): search}
+
+
+def record(url, fields, expand):
+    """Récupère les pages brutes d'une recherche complète."""
+    pages = []
+    for start in range(0, ISSUES, PAGE):
+        payload = {'jql': 'project = PROJ', 'fields': fields, 'startAt': start, 'maxResults': PAGE}
+        if expand:
+            payload['expand'] = expand
+        response = requests.post(f"{url}/rest/api/3/search", json=payload)
+        response.raise_for_status()
+        pages.append(response.content)
+    return pages
+
+
+def test_search_payload_5000_issues():
+    issues, _ = jira_issues(ISSUES, unlinked_ratio=0)
+    issues = [recorded_issue(issue, number) for number, issue in enumerate(issues)]
+    profile = FIELD_PROFILES['hierarchy']
+    client = JiraClient(BASE, 'token', 'moi@example.com',
+                        rate_limiter=JiraRateLimiter(read_rate=1e6, write_rate=1e6))
+
+    with StubJira(search_with_expand(issues)) as jira:
+        before_pages = record(jira.url, LEGACY_FIELDS, LEGACY_EXPAND)
+        after_pages = record(jira.url, profile['fields'], profile['expand'])
+
+    def parse(pages):
+        start = time.perf_counter()
+        parsed = []
+        for page in pages:
+            parsed.extend(client._parse_issues(json.loads(page)['issues']))
+        return parsed, (time.perf_counter() - start) * 1000
+
+    before, before_ms = parse(before_pages)
+    after, after_ms = parse(after_pages)
+    # Le résultat de l'analyse est identique
+    assert before == after and len(after) == ISSUES
+
+    before_bytes = sum(len(page) for page in before_pages)
+    after_bytes = sum(len(page) for page in after_pages)
+    report(f"Recherche de {ISSUES} tickets ({ISSUES // PAGE} pages)", [
+        ("", "octets reçus", "analyse JSON + parents (ms)"),
+        ("expand=names,schema,transitions", f"{before_bytes:,}", f"{before_ms:.0f}"),
+        ("profil 'hierarchy'", f"{after_bytes:,}", f"{after_ms:.0f}"),
+    ])
+    assert after_bytes < before_bytes
+    client.close()
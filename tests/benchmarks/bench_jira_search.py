@@ -0,0 +1,44 @@
+"""Recherche JQL de plusieurs milliers de tickets : pages séquentielles contre
+pages parallèles (user-013).
+
+    python -m pytest tests/benchmarks/bench_jira_search.py -s
+"""
+import time
+
+import pytest
+
+from benchutil import report
+from stubjira import SEARCH_ROUTE, StubJira, search_route
+from synthetic import jira_issues
+
+pytest.importorskip("requests")
+from utils.jira_client import JiraClient  # noqa: E402
+from utils.rate_limiter import JiraRateLimiter  # noqa: E402
+
+ISSUES = 5000
+LATENCY = 0.05  # Latence ajoutée par le serveur de test à chaque page (s)
+
+
+@pytest.mark.parametrize('max_results', [ISSUES, 4321])
+def test_search_wall_time(max_results):
+    # Toutes les stories ont un epic link : seule la recherche est mesurée
+    issues, _ = jira_issues(ISSUES, unlinked_ratio=0)
+    expected = [issue['key'] for issue in issues[:max_results]]
+
+    rows = [("", "pages", "durée (s)")]
+    durations = {}
+    for label, workers in (("séquentiel", 1), ("parallèle (8 requêtes)", 8)):
+        with StubJira(search_route(issues), latency=LATENCY) as jira:
+            client = JiraClient(jira.url, 'token', 'moi@example.com', max_workers=workers,
+                                rate_limiter=JiraRateLimiter(read_rate=1e6, write_rate=1e6))
+            start = time.perf_counter()
+            parsed = client.search_issues('project = PROJ', max_results=max_results)
+            durations[workers] = time.perf_counter() - start
+            client.close()
+            rows.append((label, jira.count(SEARCH_ROUTE), f"{durations[workers]:.2f}"))
+
+        # Résultats dans l'ordre de startAt, tronqués à max_results
+        assert [issue['key'] for issue in parsed] == expected
+
+    report(f"Recherche de {max_results} tickets sur {ISSUES}, latence {LATENCY * 1000:.0f} ms par page", rows)
+    assert durations[8] < durations[1] / 3
@@ -0,0 +1,66 @@
+"""Envoi de worklogs : requests.post par appel contre session partagée (user-011).
+
+    python -m pytest tests/benchmarks/bench_jira_session.py -s
+
+Le serveur de test est en HTTP : seule la poignée de main TCP est évitée.
+Contre Jira (HTTPS), chaque nouvelle connexion coûte en plus une
+négociation TLS.
+"""
+import time
+from datetime import datetime
+
+import pytest
+
+from benchutil import report
+from stubjira import StubJira
+
+requests = pytest.importorskip("requests")
+from utils.jira_client import JiraClient  # noqa: E402
+from utils.rate_limiter import JiraRateLimiter  # noqa: E402
+
+POSTS = 1000
+WORKLOG_ROUTE = r'/rest/api/2/issue/([^/]+)/worklog'
+
+
+def created(match, query, body):
+    return 201, {'id': '1', 'issueId': match.group(1), 'timeSpent': body['timeSpent']}
+
+
+def test_worklog_posts_reuse_connections():
+    started = datetime(2026, 1, 5, 9, 0)
+
+    # Ancien fonctionnement : requests.post au niveau du module, une connexion par appel
+    with StubJira({('POST', WORKLOG_ROUTE): created}) as jira:
+        headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+        start = time.perf_counter()
+        for i in range(POSTS):
+            response = requests.post(
+                f"{jira.url}/rest/api/2/issue/PROJ-{i}/worklog",
+                headers=headers,
+                json={'timeSpent': '1h', 'comment': 'Revue',
+                      'started': started.strftime('%Y-%m-%dT%H:%M:%S.000+0100')}
+            )
+            response.raise_for_status()
+        before = time.perf_counter() - start
+        before_connections = jira.connections
+        assert jira.count(WORKLOG_ROUTE) == POSTS
+
+    # Session partagée de JiraClient (limiteur de débit neutralisé pour la mesure)
+    with StubJira({('POST', WORKLOG_ROUTE): created}) as jira:
+        limiter = JiraRateLimiter(read_rate=1e6, write_rate=1e6)
+        client = JiraClient(jira.url, 'token', 'moi@example.com', rate_limiter=limiter)
+        start = time.perf_counter()
+        for i in range(POSTS):
+            assert client.add_worklog(f'PROJ-{i}', 60, 'Revue', started)
+        after = time.perf_counter() - start
+        after_connections = jira.connections
+        assert jira.count(WORKLOG_ROUTE) == POSTS
+        client.close()
+
+    report(f"{POSTS} worklogs envoyés au serveur de test", [
+        ("", "connexions TCP", "durée (s)"),
+        ("requests.post par appel", before_connections, f"{before:.2f}"),
+        ("session partagée", after_connections, f"{after:.2f}"),
+    ])
+    assert before_connections == POSTS
+    assert after_connections == 1
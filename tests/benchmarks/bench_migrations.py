@@ -0,0 +1,39 @@
+"""Coût d'ouverture d'une base : schéma à jour contre migration complète (user-003).
+
+    python -m pytest tests/benchmarks/bench_migrations.py -s
+"""
+import sqlite3
+
+from benchutil import measure, report
+from utils.migrations import migrate
+
+REPEAT = 200
+
+
+def test_startup_cost(tmp_path):
+    counter = iter(range(REPEAT + 1))
+
+    def fresh_database():
+        # Nouvelle base : toutes les migrations s'exécutent
+        conn = sqlite3.connect(str(tmp_path / f"fresh_{next(counter)}.db"))
+        migrate(conn)
+        conn.close()
+
+    current_path = str(tmp_path / "current.db")
+    conn = sqlite3.connect(current_path)
+    migrate(conn)
+    conn.close()
+
+    def current_database():
+        # Base à jour : une lecture de PRAGMA user_version
+        conn = sqlite3.connect(current_path)
+        migrate(conn)
+        conn.close()
+
+    full = measure(fresh_database, REPEAT)
+    current = measure(current_database, REPEAT)
+    report("Ouverture d'une base (ms)", [
+        ("migration complète", f"{full:.3f}"),
+        ("base déjà à jour", f"{current:.3f}"),
+    ])
+    assert current < full
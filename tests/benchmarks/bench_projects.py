@@ -0,0 +1,60 @@
+"""Chargement de l'arbre projets/tickets : une requête contre N+1 (user-008).
+
+    python -m pytest tests/benchmarks/bench_projects.py -s
+"""
+import pytest
+
+from benchutil import measure, report
+from synthetic import populate_history
+
+pytest.importorskip("PyQt6")
+from utils.database import Database  # noqa: E402
+
+REPEAT = 5
+
+# Requête de tickets d'avant user-008 : jointure avec toutes les entrées du
+# ticket et tri sur la concaténation date/heure
+LEGACY_TICKETS_SQL = """
+    SELECT DISTINCT t.ticket_number, t.title, COALESCE(t.is_active, 1) as is_active
+    FROM tickets t
+    LEFT JOIN entries e ON e.ticket_id = t.id
+    WHERE t.project_id = ? AND COALESCE(t.is_active, 1) = 1
+    GROUP BY t.ticket_number
+    ORDER BY MAX(e.date || ' ' || e.time) DESC NULLS LAST
+"""
+
+
+def test_all_projects_500x50(tmp_path):
+    db = Database(str(tmp_path / 'logtracker.db'))
+    populate_history(db, entries=50000, projects=500, tickets_per_project=50)
+
+    def legacy():
+        # Ancien fonctionnement : une connexion et une requête par projet
+        projects = db.get_projects()
+        tickets = []
+        for project in projects:
+            db.close()
+            tickets.append(db.conn.execute(LEGACY_TICKETS_SQL, (project['id'],)).fetchall())
+        return tickets
+
+    def n_plus_one():
+        # Une requête par projet, sur la connexion persistante
+        projects = db.get_projects()
+        return [db.get_project_tickets(project['id']) for project in projects]
+
+    single = db.get_all_projects()
+    assert len(single) == 500
+    assert sum(len(project['tickets']) for project in single) == 500 * 50
+    assert [project['tickets'] for project in single] == [
+        db.get_project_tickets(project['id']) for project in single]
+
+    before = measure(legacy, REPEAT)
+    per_project = measure(n_plus_one, REPEAT)
+    after = measure(db.get_all_projects, REPEAT)
+    report("get_all_projects, 500 projets x 50 tickets (ms)", [
+        ("avant user-008 (connexion + MAX par projet)", f"{before:.1f}"),
+        ("une requête par projet, connexion persistante", f"{per_project:.1f}"),
+        ("requête unique", f"{after:.1f}"),
+    ])
+    assert after < before
+    db.close()
@@ -0,0 +1,67 @@
+"""Recherche plein texte sur 100 000 entrées et 20 000 sous-tâches (user-009).
+
+    python -m pytest tests/benchmarks/bench_search.py -s
+
+Compare l'index commun classé par bm25 (migration 8, type filtré par
+rowid % 2) aux index par type de la migration 14, lus dans l'ordre des
+rowid puis classés sur SEARCH_WINDOW lignes.
+"""
+import re
+
+from benchutil import measure, report
+from synthetic import populate_history
+from utils.database import Database
+from utils.migrations import _SEARCH_INDEX_V8_SQL
+
+REPEAT = 5
+# Préfixes courants et rares, comme saisis lettre par lettre
+QUERIES = ["t", "tr", "travail", "ticket 12", "sous", "fonctionnalite 12", "prj3", "1234", "zzz"]
+
+
+def legacy_search(db, query, limit, kinds=None):
+    """Database.search d'avant la migration 14."""
+    match = " ".join(f'"{term}"*' for term in re.findall(r"\w+", query))
+    kind_filter = ""
+    if kinds == ['entry']:
+        kind_filter = " AND rowid % 2 = 0"
+    elif kinds == ['subtask']:
+        kind_filter = " AND rowid % 2 = 1"
+    db.cursor.execute(f"""
+        SELECT rowid, ticket_key, title, body
+        FROM search_index
+        WHERE search_index MATCH ?{kind_filter}
+        ORDER BY rank
+        LIMIT ?
+    """, (match, limit))
+    return db.cursor.fetchall()
+
+
+def test_search_100k_entries_20k_subtasks(tmp_path):
+    db = Database(str(tmp_path / "search.db"))
+    populate_history(db, entries=100000, subtasks=20000)
+    with db.transaction():
+        db.cursor.execute("""
+            CREATE VIRTUAL TABLE search_index USING fts5(
+                ticket_key, title, body,
+                tokenize = "unicode61 remove_diacritics 2",
+                prefix = '2 3'
+            )
+        """)
+        for statement in _SEARCH_INDEX_V8_SQL[1:]:
+            db.cursor.execute(statement)
+
+    rows = [("requête", "bm25, 50", "fenêtre, 50", "sous-tâches bm25, 20000", "sous-tâches fenêtre, 200")]
+    worst = 0.0
+    for query in QUERIES:
+        before = measure(lambda: legacy_search(db, query, 50), REPEAT)
+        # Le dialogue demandait autant de résultats que de sous-tâches affichées
+        dialog_before = measure(lambda: legacy_search(db, query, 20000, ['subtask']), REPEAT)
+        after = measure(lambda: db.search(query, limit=50), REPEAT)
+        dialog_after = measure(lambda: db.search(query, limit=200, kinds=['subtask']), REPEAT)
+        worst = max(worst, after, dialog_after)
+        rows.append((query, f"{before:.1f}", f"{after:.1f}", f"{dialog_before:.1f}", f"{dialog_after:.1f}"))
+    report("Recherche plein texte (ms par requête)", rows)
+    db.close()
+
+    # Objectif de la demande : quelques millisecondes quel que soit le préfixe
+    assert worst < 10
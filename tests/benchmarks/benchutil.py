@@ -0,0 +1,18 @@
+"""Outils communs des benchmarks (lancer pytest avec -s pour voir les résultats)."""
+import time
+
+
+def measure(fn, repeat):
+    """Durée moyenne d'un appel en millisecondes."""
+    fn()  # Échauffement (cache de pages, connexion...)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def report(title, rows):
+    """Affiche un tableau de résultats (lancer pytest avec -s)."""
+    print(f"\n{title}")
+    for row in rows:
+        print("  " + " | ".join(str(cell) for cell in row))
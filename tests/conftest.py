@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+# Les tests d'interface tournent sans affichage ; à fixer avant tout import de PyQt
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+# Les modules de l'application s'importent depuis src/ (comme dans qt_main.py)
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Chemin d'un fichier de base vide, propre au test."""
+    return str(tmp_path / 'logtracker.db')
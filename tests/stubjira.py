@@ -0,0 +1,214 @@
+"""Serveur HTTP local imitant les routes Jira utilisées par les benchmarks."""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SEARCH_ROUTE = r'/rest/api/3/search'
+EPIC_ROUTE = r'/rest/agile/1.0/issue/([^/]+)/epic'
+
+
+class StubJira:
+    """Serveur Jira factice, lancé dans un thread.
+
+    Chaque route associe une méthode et une expression régulière sur le
+    chemin à une fonction handler(match, query, body) qui renvoie
+    (status, payload) ou (status, payload, headers). Le serveur compte les
+    connexions TCP ouvertes et les requêtes reçues par route, et peut
+    ajouter une latence fixe à chaque réponse.
+
+    Exemple:
+        with StubJira({('POST', r'/rest/api/2/issue/[^/]+/worklog'): created}) as jira:
+            requests.post(jira.url + '/rest/api/2/issue/PROJ-1/worklog', json={})
+            jira.connections  # 1
+    """
+
+    def __init__(self, routes, latency=0.0):
+        self.routes = [(method, re.compile(pattern + '$'), handler)
+                       for (method, pattern), handler in routes.items()]
+        self.latency = latency
+        self.connections = 0
+        self.requests = {}
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def count(self, pattern):
+        """Nombre de requêtes reçues sur une route (motif passé au constructeur)."""
+        with self._lock:
+            return self.requests.get(pattern, 0)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 : la connexion reste ouverte entre deux requêtes (keep-alive)
+            protocol_version = 'HTTP/1.1'
+            # En-têtes et corps partent en deux écritures : sans TCP_NODELAY,
+            # l'ACK retardé du client ajouterait ~40 ms à chaque réponse
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def _dispatch(self, method):
+                url = urlsplit(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                for route_method, pattern, handler in stub.routes:
+                    match = pattern.match(url.path)
+                    if route_method == method and match:
+                        with stub._lock:
+                            stub.requests[pattern.pattern[:-1]] = stub.requests.get(pattern.pattern[:-1], 0) + 1
+                        result = handler(match, parse_qs(url.query), body)
+                        break
+                else:
+                    result = (404, {'errorMessages': ['Route inconnue du serveur de test']})
+                status, payload = result[:2]
+                headers = result[2] if len(result) > 2 else {}
+
+                if stub.latency:
+                    time.sleep(stub.latency)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+                with stub._lock:
+                    stub.bytes_sent += len(data)
+
+            def do_GET(self):
+                self._dispatch('GET')
+
+            def do_POST(self):
+                self._dispatch('POST')
+
+            def do_PUT(self):
+                self._dispatch('PUT')
+
+        return Handler
+
+
+def search_route(issues, page_limit=100):
+    """Route POST /rest/api/3/search servant une liste de tickets page par page.
+
+    Comme Jira, la taille de page demandée est plafonnée à page_limit.
+    """
+    def search(match, query, body):
+        start = body.get('startAt', 0)
+        size = min(body.get('maxResults', 50), page_limit)
+        return 200, {
+            'startAt': start,
+            'maxResults': size,
+            'total': len(issues),
+            'issues': issues[start:start + size],
+        }
+    return {('POST', SEARCH_ROUTE): search}
+
+
+def epic_route(agile_epics):
+    """Route GET /rest/agile/1.0/issue/{clé}/epic : 200 avec l'epic, 404 sans epic."""
+    def epic(match, query, body):
+        epic_key = agile_epics.get(match.group(1))
+        if epic_key is None:
+            return 404, {'errorMessages': ["Le ticket n'appartient à aucun epic"]}
+        return 200, {'key': epic_key}
+    return {('GET', EPIC_ROUTE): epic}
+
+
+
+WORKLOG_ROUTE = r'/rest/api/2/issue/([^/]+)/worklog'
+MYSELF_ROUTE = r'/rest/api/2/myself'
+
+
+class WorklogStore:
+    """Worklogs d'une instance Jira factice, créés et relus via worklog_routes.
+
+    Exemple:
+        store = WorklogStore()
+        with StubJira(store.routes(), latency=0.01) as jira:
+            ...
+        store.worklogs['PROJ-1']  # worklogs créés sur le ticket
+    """
+
+    ME = {'accountId': 'moi', 'name': 'moi', 'emailAddress': 'moi@example.com'}
+
+    def __init__(self, fail=None):
+        """
+        Args:
+            fail: Fonction (ticket, corps) -> statut HTTP d'erreur ou None, appelée à chaque création
+        """
+        self.worklogs = {}
+        self.fail = fail
+        self._next_id = 10000
+        self._lock = threading.Lock()
+
+    def add(self, ticket, started, seconds, comment='', author=None, properties=None):
+        """Ajoute un worklog existant (début au format Jira, ex: 2026-01-05T09:00:00.000+0100)."""
+        with self._lock:
+            self._next_id += 1
+            worklog = {
+                'id': str(self._next_id),
+                'author': author or self.ME,
+                'started': started,
+                'timeSpentSeconds': seconds,
+                'comment': comment,
+                'properties': properties or [],
+            }
+            self.worklogs.setdefault(ticket, []).append(worklog)
+            return worklog
+
+    def routes(self):
+        """Routes de création et de lecture des worklogs, et de l'utilisateur connecté."""
+        def create(match, query, body):
+            ticket = match.group(1)
+            status = self.fail(ticket, body) if self.fail else None
+            if status:
+                return status, {'errorMessages': [f"Erreur {status}"]}
+            worklog = self.add(ticket, body['started'], time_spent_seconds(body['timeSpent']),
+                               body.get('comment', ''), properties=body.get('properties'))
+            return 201, {'id': worklog['id']}
+
+        def read(match, query, body):
+            worklogs = self.worklogs.get(match.group(1), [])
+            if 'properties' not in query.get('expand', []):
+                worklogs = [{k: v for k, v in worklog.items() if k != 'properties'} for worklog in worklogs]
+            return 200, {'startAt': 0, 'maxResults': len(worklogs), 'total': len(worklogs),
+                         'worklogs': worklogs}
+
+        return {
+            ('POST', WORKLOG_ROUTE): create,
+            ('GET', WORKLOG_ROUTE): read,
+            ('GET', MYSELF_ROUTE): lambda match, query, body: (200, self.ME),
+        }
+
+
+def time_spent_seconds(time_spent):
+    """Durée Jira (ex: '1h 30m') en secondes."""
+    units = {'h': 3600, 'm': 60}
+    return sum(int(part[:-1]) * units[part[-1]] for part in time_spent.split())
@@ -0,0 +1,162 @@
+"""Génération d'un historique synthétique pour les tests et benchmarks."""
+import random
+from datetime import date, timedelta
+
+# Dernier jour de l'historique généré
+LAST_DAY = date(2026, 1, 1)
+
+
+def populate_history(db, entries=10000, years=3, projects=20, tickets_per_project=25,
+                     subtasks=0, seed=42):
+    """Remplit une base avec des projets, tickets, entrées et sous-tâches.
+
+    Les entrées sont réparties sur `years` années de jours ouvrés ; environ
+    une sur dix n'est pas synchronisée.
+
+    Args:
+        db: Base de données (Database)
+        entries: Nombre d'entrées
+        years: Profondeur de l'historique en années
+        projects: Nombre de projets
+        tickets_per_project: Nombre de tickets par projet
+        subtasks: Nombre de sous-tâches Jira (jira_subtasks)
+        seed: Graine du générateur pseudo-aléatoire
+
+    Returns:
+        list: Dates (ISO) des jours générés, du plus ancien au plus récent
+    """
+    rng = random.Random(seed)
+    days = []
+    day = LAST_DAY - timedelta(days=365 * years)
+    while day <= LAST_DAY:
+        if day.weekday() < 5:
+            days.append(day.isoformat())
+        day += timedelta(days=1)
+
+    with db.transaction():
+        cursor = db.cursor
+        cursor.executemany("INSERT INTO projects (name) VALUES (?)",
+                           [(f"PRJ{p}",) for p in range(projects)])
+        cursor.execute("SELECT id, name FROM projects")
+        project_ids = [row[0] for row in cursor.fetchall()]
+        cursor.executemany(
+            "INSERT INTO tickets (project_id, ticket_number, title) VALUES (?, ?, ?)",
+            [(project_id, f"PRJ{p}-{t}", f"Ticket {t} du projet {p}")
+             for p, project_id in enumerate(project_ids) for t in range(tickets_per_project)]
+        )
+        cursor.execute("SELECT id, project_id FROM tickets")
+        tickets = [(row[0], row[1]) for row in cursor.fetchall()]
+
+        rows = []
+        for i in range(entries):
+            ticket_id, project_id = rng.choice(tickets)
+            rows.append((
+                days[i * len(days) // entries],
+                f"{8 + (i % 10):02d}:{rng.randrange(0, 60, 5):02d}",
+                project_id,
+                ticket_id,
+                f"Titre {ticket_id}",
+                f"Travail {i} sur le ticket {ticket_id}",
+                rng.choice((15, 30, 45, 60, 90)),
+                0 if rng.random() < 0.1 else 1,
+            ))
+        cursor.executemany("""
+            INSERT INTO entries (date, time, project_id, ticket_id, ticket_title,
+                                 description, duration, is_synced)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+
+        cursor.executemany(
+            "INSERT INTO jira_subtasks (path, title, ticket_key) VALUES (?, ?, ?)",
+            [(f"Projet {i % 20}/Epic {i % 200}/Fonctionnalité {i % 2000}", f"Sous-tâche {i}", f"SUB-{i}")
+             for i in range(subtasks)]
+        )
+    db.cursor.execute("ANALYZE")
+    return days
+
+
+def jira_issues(count=1000, project='PROJ', unlinked_ratio=0.6, seed=42):
+    """Génère des tickets tels que renvoyés par la recherche Jira (profil 'hierarchy').
+
+    Un ticket sur dix est un epic, la moitié sont des stories et le reste des
+    sous-tâches de ces stories. Une partie des stories (unlinked_ratio) n'a
+    ni parent ni epic link : leur epic n'est connu que de l'API agile.
+
+    Args:
+        count: Nombre de tickets
+        project: Clé du projet
+        unlinked_ratio: Part des stories sans parent ni epic link
+        seed: Graine du générateur pseudo-aléatoire
+
+    Returns:
+        tuple: (tickets, epics agiles) où epics agiles associe la clé des
+               stories sans lien qui ont un epic à la clé de cet epic
+    """
+    rng = random.Random(seed)
+    epics = max(1, count // 10)
+    stories = max(1, count // 2)
+    issues = []
+    agile_epics = {}
+
+    def issue(number, issue_type, **fields):
+        return {
+            'key': f"{project}-{number}",
+            'fields': {
+                'summary': f"{issue_type} {number}",
+                'issuetype': {'name': issue_type},
+                'project': {'key': project},
+                'issuelinks': [],
+                'status': {'name': rng.choice(('To Do', 'In Progress', 'Done'))},
+                **fields
+            }
+        }
+
+    for number in range(1, epics + 1):
+        issues.append(issue(number, 'Epic'))
+    for number in range(epics + 1, epics + stories + 1):
+        epic_key = f"{project}-{rng.randint(1, epics)}"
+        if rng.random() < unlinked_ratio:
+            issues.append(issue(number, 'Story'))
+            # Deux stories sans lien sur trois ont un epic côté API agile
+            if number % 3:
+                agile_epics[f"{project}-{number}"] = epic_key
+        else:
+            issues.append(issue(number, 'Story', customfield_10014=epic_key))
+    for number in range(epics + stories + 1, count + 1):
+        parent = f"{project}-{rng.randint(epics + 1, epics + stories)}"
+        issues.append(issue(number, 'Sub-task', parent={'key': parent}))
+    return issues, agile_epics
+
+
+def hierarchy_tickets(count=1000, project='PROJ', seed=42):
+    """Génère des tickets analysés (key, title, type, parent_key) sous un projet.
+
+    Reprend la répartition de jira_issues : le projet est la racine des
+    epics, les stories pointent vers leur epic (lien direct ou API agile)
+    et les sous-tâches vers leur story. Une story sans lien sur trois n'a
+    pas d'epic : elle est sa propre racine.
+
+    Args:
+        count: Nombre de tickets (hors projet)
+        project: Clé du projet
+        seed: Graine du générateur pseudo-aléatoire
+
+    Returns:
+        list: Tickets, le projet en premier
+    """
+    issues, agile_epics = jira_issues(count, project=project, seed=seed)
+    tickets = [{'key': project, 'title': f"Projet {project}", 'type': 'project', 'parent_key': None}]
+    for issue in issues:
+        fields = issue['fields']
+        issue_type = fields['issuetype']['name'].lower()
+        if fields.get('parent'):
+            parent_key = fields['parent']['key']
+        elif fields.get('customfield_10014'):
+            parent_key = fields['customfield_10014']
+        elif issue_type == 'epic':
+            parent_key = project
+        else:
+            parent_key = agile_epics.get(issue['key'])
+        tickets.append({'key': issue['key'], 'title': fields['summary'],
+                        'type': issue_type, 'parent_key': parent_key})
+    return tickets
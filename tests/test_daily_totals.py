@@ -0,0 +1,109 @@
+import random
+
+import pytest
+
+from utils.database import Database
+
+
+@pytest.fixture
+def db(db_path):
+    db = Database(db_path)
+    with db.transaction():
+        db.cursor.executemany("INSERT INTO projects (name) VALUES (?)", [("A",), ("B",)])
+    yield db
+    db.close()
+
+
+def totals(db):
+    db.cursor.execute("SELECT date, project_id, total_minutes, unsynced_minutes FROM daily_totals ORDER BY 1, 2")
+    return [tuple(row) for row in db.cursor.fetchall()]
+
+
+def insert(db, date, project_id, duration, is_synced=0):
+    with db.transaction():
+        db.cursor.execute("""
+            INSERT INTO entries (date, time, project_id, description, duration, is_synced)
+            VALUES (?, '09:00', ?, 'Travail', ?, ?)
+        """, (date, project_id, duration, is_synced))
+        return db.cursor.lastrowid
+
+
+def execute(db, sql, params=()):
+    with db.transaction():
+        db.cursor.execute(sql, params)
+
+
+def test_insert_update_delete_keep_totals(db):
+    first = insert(db, '2026-01-05', 1, 30)
+    second = insert(db, '2026-01-05', 1, 45, is_synced=1)
+    orphan = insert(db, '2026-01-05', None, 15)
+    assert totals(db) == [('2026-01-05', 0, 15, 15), ('2026-01-05', 1, 75, 30)]
+    assert db.get_total_minutes_for_day('2026-01-05') == 90
+    assert db.get_unsynced_minutes() == 45
+
+    # Synchronisation : seules les minutes non synchronisées changent
+    db.mark_entries_as_synced([first])
+    assert totals(db) == [('2026-01-05', 0, 15, 15), ('2026-01-05', 1, 75, 0)]
+    execute(db, "UPDATE entries SET is_synced = 0 WHERE id = ?", (second,))
+    assert totals(db) == [('2026-01-05', 0, 15, 15), ('2026-01-05', 1, 75, 45)]
+
+    # Changement de durée, de jour et de projet
+    execute(db, "UPDATE entries SET duration = 60 WHERE id = ?", (first,))
+    execute(db, "UPDATE entries SET date = '2026-01-06', project_id = 2 WHERE id = ?", (second,))
+    assert totals(db) == [('2026-01-05', 0, 15, 15), ('2026-01-05', 1, 60, 0), ('2026-01-06', 2, 45, 45)]
+
+    # Colonne non suivie : agrégats inchangés
+    execute(db, "UPDATE entries SET description = 'Revue' WHERE id = ?", (first,))
+
+    # Les lignes vidées disparaissent
+    execute(db, "DELETE FROM entries WHERE id IN (?, ?)", (orphan, second))
+    assert totals(db) == [('2026-01-05', 1, 60, 0)]
+    assert db.check_daily_totals() == []
+
+
+def test_random_changes_stay_consistent(db):
+    rng = random.Random(7)
+    days = ['2026-01-05', '2026-01-06', '2026-01-07']
+    ids = []
+    for step in range(300):
+        action = rng.random()
+        if action < 0.4 or not ids:
+            ids.append(insert(db, rng.choice(days), rng.choice((1, 2, None)),
+                              rng.choice((15, 30, 60)), rng.randint(0, 1)))
+        elif action < 0.85:
+            column, value = rng.choice([
+                ('duration', rng.choice((5, 15, 90))),
+                ('date', rng.choice(days)),
+                ('project_id', rng.choice((1, 2, None))),
+                ('is_synced', rng.randint(0, 1)),
+            ])
+            execute(db, f"UPDATE entries SET {column} = ? WHERE id = ?", (value, rng.choice(ids)))
+        else:
+            execute(db, "DELETE FROM entries WHERE id = ?", (ids.pop(rng.randrange(len(ids))),))
+        assert db.check_daily_totals() == [], f"écart après l'étape {step}"
+    # Aucune ligne vide ne subsiste
+    assert all(total or unsynced for _, _, total, unsynced in totals(db))
+
+
+def test_check_reports_and_repairs_drift(db):
+    insert(db, '2026-01-05', 1, 30)
+    insert(db, '2026-01-06', 2, 60, is_synced=1)
+    expected = totals(db)
+
+    # Agrégats faussés hors des triggers (ex: base modifiée par un autre outil)
+    execute(db, "UPDATE daily_totals SET total_minutes = 999 WHERE date = '2026-01-05'")
+    execute(db, "DELETE FROM daily_totals WHERE date = '2026-01-06'")
+    execute(db, "INSERT INTO daily_totals VALUES ('2026-01-07', 1, 10, 10)")
+
+    mismatches = db.check_daily_totals()
+    assert sorted((m['date'], m['project_id'], m['total_minutes'], m['expected_total']) for m in mismatches) == [
+        ('2026-01-05', 1, 999, 30),
+        ('2026-01-06', 2, None, 60),
+        ('2026-01-07', 1, 10, None),
+    ]
+    # Sans repair, rien n'est modifié
+    assert len(totals(db)) == 2
+
+    assert len(db.check_daily_totals(repair=True)) == 3
+    assert totals(db) == expected
+    assert db.check_daily_totals() == []
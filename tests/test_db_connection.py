@@ -0,0 +1,95 @@
+import sqlite3
+
+import pytest
+
+from utils.db_connection import ConnectionManager
+
+
+@pytest.fixture
+def manager(db_path):
+    manager = ConnectionManager(db_path)
+    conn = manager.get_connection()
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.commit()
+    yield manager
+    manager.close()
+
+
+def values(manager):
+    return [row[0] for row in manager.get_connection().execute("SELECT x FROM t ORDER BY x")]
+
+
+def test_transaction_commits_outermost_block(manager):
+    with manager.transaction() as conn:
+        conn.execute("INSERT INTO t VALUES (1)")
+        with manager.transaction():
+            conn.execute("INSERT INTO t VALUES (2)")
+    assert values(manager) == [1, 2]
+    assert not manager.get_connection().in_transaction
+
+
+def test_failed_inner_block_is_rolled_back_alone(manager):
+    with manager.transaction() as conn:
+        conn.execute("INSERT INTO t VALUES (1)")
+        with pytest.raises(ValueError):
+            with manager.transaction():
+                conn.execute("INSERT INTO t VALUES (2)")
+                raise ValueError
+        conn.execute("INSERT INTO t VALUES (3)")
+    assert values(manager) == [1, 3]
+
+
+def test_inner_block_does_not_commit_outer_transaction(manager):
+    with pytest.raises(ValueError):
+        with manager.transaction() as conn:
+            # Le premier bloc imbriqué ne doit pas devenir la transaction externe
+            with manager.transaction():
+                conn.execute("INSERT INTO t VALUES (1)")
+            raise ValueError
+    assert values(manager) == []
+
+
+def test_failed_commit_rolls_back(manager, monkeypatch):
+    conn = manager.get_connection()
+
+    class FailingCommit(sqlite3.Connection):
+        def commit(self):
+            raise sqlite3.OperationalError("database is locked")
+
+    failing = sqlite3.connect(manager.db_path, factory=FailingCommit)
+    monkeypatch.setattr(manager._local, 'conn', failing)
+    with pytest.raises(sqlite3.OperationalError):
+        with manager.transaction() as conn:
+            conn.execute("INSERT INTO t VALUES (1)")
+    assert not failing.in_transaction
+    failing.close()
+    monkeypatch.undo()
+    assert values(manager) == []
+
+
+def test_on_commit_runs_after_the_outermost_commit(manager):
+    calls = []
+    with manager.transaction() as conn:
+        with manager.transaction():
+            conn.execute("INSERT INTO t VALUES (1)")
+            manager.on_commit(lambda: calls.append(values(manager)))
+        assert calls == []
+    assert calls == [[1]]
+    # Hors transaction : appel immédiat
+    manager.on_commit(lambda: calls.append('direct'))
+    assert calls == [[1], 'direct']
+
+
+def test_on_commit_dropped_with_rolled_back_block(manager):
+    calls = []
+    with pytest.raises(ValueError):
+        with manager.transaction():
+            manager.on_commit(lambda: calls.append('outer'))
+            raise ValueError
+    with manager.transaction():
+        manager.on_commit(lambda: calls.append('kept'))
+        with pytest.raises(ValueError):
+            with manager.transaction():
+                manager.on_commit(lambda: calls.append('inner'))
+                raise ValueError
+    assert calls == ['kept']
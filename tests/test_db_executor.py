@@ -0,0 +1,132 @@
+import threading
+import time
+from datetime import date
+
+import pytest
+
+pytest.importorskip("pytestqt")
+from PyQt6.QtCore import QTimer  # noqa: E402
+from PyQt6.QtWidgets import QDialog  # noqa: E402
+
+from ui.entry_dialog import EntryDialog  # noqa: E402
+from utils.database import Database  # noqa: E402
+
+DELAY = 0.5
+
+# Accès à la base de la fenêtre de saisie, ralentis par le test
+SLOW_METHODS = [
+    'get_project_suggestions',
+    'get_total_minutes_for_day',
+    'get_sequential_time',
+    'get_tickets_for_project_name',
+    'get_ticket_info_for_project_name',
+    'save_entry',
+]
+
+
+@pytest.fixture
+def db(db_path):
+    db = Database(db_path)
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def slow_db(db, monkeypatch):
+    """Base dont les requêtes de la fenêtre de saisie prennent DELAY secondes.
+
+    Renvoie aussi la liste des threads ayant exécuté ces requêtes.
+    """
+    threads = []
+
+    def slow(method):
+        def wrapper(self, *args, **kwargs):
+            threads.append(threading.current_thread())
+            time.sleep(DELAY)
+            return method(self, *args, **kwargs)
+        return wrapper
+
+    for name in SLOW_METHODS:
+        monkeypatch.setattr(Database, name, slow(getattr(Database, name)))
+    db.save_setting('use_sequential_time', '1')
+    return db, threads
+
+
+class Ticker:
+    """Compte les tours de boucle d'événements pendant une attente."""
+
+    def __init__(self, interval=10):
+        self.ticks = 0
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.tick)
+        self.timer.start(interval)
+
+    def tick(self):
+        self.ticks += 1
+
+
+def test_submit_keeps_event_loop_running(qtbot, db):
+    def slow_query():
+        time.sleep(DELAY)
+        return db.get_total_minutes_for_day('2026-01-01')
+
+    ticker = Ticker()
+    start = time.monotonic()
+    task = db.submit(slow_query)
+    assert time.monotonic() - start < 0.05
+
+    with qtbot.waitSignal(task.finished, timeout=5000) as blocker:
+        pass
+    assert blocker.args == [0]
+    # Le timer a continué de tourner pendant la requête
+    assert ticker.ticks >= 10
+
+
+def test_cancelled_tasks_do_not_run_or_emit(qtbot, db):
+    ran = []
+    started = threading.Event()
+
+    def slow_query():
+        started.set()
+        time.sleep(0.2)
+        ran.append('en cours')
+
+    running = db.submit(slow_query)
+    queued = db.submit(lambda: ran.append('en file'))
+    running.finished.connect(lambda _result: ran.append('livré'))
+    qtbot.waitUntil(started.is_set)
+    running.cancel()
+    queued.cancel()
+
+    with qtbot.waitSignal(db.submit(lambda: None).finished):
+        pass
+    # La tâche en cours se termine sans être livrée ; la tâche en file n'est pas exécutée
+    assert ran == ['en cours']
+
+
+def test_entry_dialog_does_not_block_on_slow_queries(qtbot, slow_db):
+    db, threads = slow_db
+    ticker = Ticker()
+
+    start = time.monotonic()
+    dialog = EntryDialog(db=db)
+    qtbot.addWidget(dialog)
+    assert time.monotonic() - start < DELAY / 2
+
+    # Sélection d'un projet et d'un ticket, puis validation
+    dialog.project_input.setText("PRJ")
+    dialog.ticket_input.setText("PRJ-1")
+    dialog.on_ticket_selected("PRJ-1")
+    dialog.description_input.setPlainText("Revue")
+    start = time.monotonic()
+    dialog.accept()
+    assert time.monotonic() - start < DELAY / 2
+
+    qtbot.waitUntil(lambda: dialog.result() == QDialog.DialogCode.Accepted, timeout=10000)
+    assert ticker.ticks >= 10
+    assert threads and threading.main_thread() not in threads
+
+    entries = db.get_entries_for_day(date.today())
+    assert [entry['description'] for entry in entries] == ["Revue"]
+    project = db.get_project_by_name("PRJ")
+    assert db.get_ticket_info(project['id'], "PRJ-1")[0] == entries[0]['ticket_id']
@@ -0,0 +1,76 @@
+import threading
+
+import pytest
+
+from utils.db_connection import ConnectionManager, PRAGMA_PROFILES
+from utils.migrations import ensure_schema
+
+
+@pytest.fixture(params=sorted(PRAGMA_PROFILES))
+def manager(request, db_path):
+    """Gestionnaire de connexions d'une base dont le profil est celui du paramètre."""
+    manager = ConnectionManager(db_path)
+    conn = manager.get_connection()
+    ensure_schema(conn, db_path)
+    conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('db_profile', ?)", (request.param,))
+    conn.execute("INSERT INTO projects (name) VALUES ('P')")
+    conn.commit()
+    # Rouvre la connexion pour qu'elle applique le profil enregistré
+    manager.close()
+    yield manager
+    manager.close()
+
+
+def test_profile_applied(manager):
+    conn = manager.get_connection()
+    profile = conn.execute("SELECT value FROM settings WHERE key = 'db_profile'").fetchone()[0]
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0].upper() == PRAGMA_PROFILES[profile]['journal_mode']
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == PRAGMA_PROFILES[profile]['busy_timeout']
+
+
+def test_reads_do_not_block_on_open_write_transaction(manager):
+    write_started = threading.Event()
+    reads_done = threading.Event()
+    errors = []
+    read_counts = []
+
+    def writer():
+        try:
+            conn = manager.get_connection()
+            # Verrou exclusif : état d'un import dont les écritures débordent
+            # du cache ou en cours de validation
+            conn.execute("BEGIN EXCLUSIVE")
+            conn.execute("INSERT INTO projects (name) VALUES ('Q')")
+            write_started.set()
+            # La transaction reste ouverte tant que le lecteur n'a pas fini
+            if not reads_done.wait(10):
+                errors.append("lecteur bloqué")
+            conn.commit()
+        except Exception as e:
+            errors.append(f"écriture : {e}")
+        finally:
+            write_started.set()
+            manager.close()
+
+    def reader():
+        try:
+            write_started.wait(10)
+            conn = manager.get_connection()
+            for _ in range(50):
+                read_counts.append(conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0])
+        except Exception as e:
+            errors.append(f"lecture : {e}")
+        finally:
+            reads_done.set()
+            manager.close()
+
+    threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(15)
+
+    assert errors == []
+    # Le lecteur voit l'état validé, sans l'écriture en cours
+    assert read_counts == [1] * 50
+    assert manager.get_connection().execute("SELECT COUNT(*) FROM projects").fetchone()[0] == 2
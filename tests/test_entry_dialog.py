@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pytestqt")
+pytest.importorskip("requests")
+from stubjira import StubJira  # noqa: E402
+from ui.entry_dialog import EntryDialog  # noqa: E402
+from ui.entry_dialog_v2 import EntryDialogV2  # noqa: E402
+from utils.database import Database  # noqa: E402
+
+ISSUE_ROUTE = r'/rest/api/3/issue/([^/]+)'
+# Latence de Jira : un appel dans le thread de l'interface la bloquerait d'autant
+LATENCY = 0.3
+
+
+@pytest.fixture
+def jira():
+    def issue(match, query, body):
+        key = match.group(1)
+        return 200, {'key': key, 'fields': {'summary': f"Titre de {key}", 'description': ''}}
+
+    with StubJira({('GET', ISSUE_ROUTE): issue}, latency=LATENCY) as stub:
+        yield stub
+
+
+@pytest.fixture
+def db(db_path, jira):
+    db = Database(db_path)
+    db.save_settings({'jira_base_url': jira.url, 'jira_token': 'token', 'jira_email': 'moi@example.com'})
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def open_dialog(qtbot, db):
+    """Ouvre un dialogue de saisie ; la file de la base est vidée avant sa fermeture."""
+    def open_dialog(cls):
+        dialog = cls(db=db)
+        qtbot.addWidget(dialog)
+        drain(qtbot, db)
+        return dialog
+    yield open_dialog
+    drain(qtbot, db)
+
+
+def watch_threads(dialog):
+    """Relève le thread de chaque appel à get_issue_details."""
+    threads = []
+    fetch = dialog.jira_client.get_issue_details
+
+    def get_issue_details(issue_key):
+        threads.append(threading.current_thread())
+        return fetch(issue_key)
+    dialog.jira_client.get_issue_details = get_issue_details
+    return threads
+
+
+def drain(qtbot, db):
+    with qtbot.waitSignal(db.submit(lambda: None).finished):
+        pass
+
+
+def test_title_fetched_off_the_gui_thread(qtbot, db, open_dialog):
+    # Ticket connu, encore sans titre
+    db.add_ticket(db.add_project("Projet"), "PROJ-1", None)
+    dialog = open_dialog(EntryDialog)
+    threads = watch_threads(dialog)
+    dialog.project_input.setText("Projet")
+    qtbot.waitUntil(lambda: dialog.ticket_input.text() == "PROJ-1")
+
+    start = time.perf_counter()
+    dialog.fetch_ticket_title_from_jira("PROJ-1")
+    assert time.perf_counter() - start < LATENCY / 3
+
+    qtbot.waitUntil(lambda: dialog.ticket_title.text() == "Titre de PROJ-1")
+    assert threads and threading.main_thread() not in threads
+    # Le titre est enregistré pour les prochaines saisies
+    drain(qtbot, db)
+    assert db.get_ticket_info_for_project_name("Projet", "PROJ-1")[2] == "Titre de PROJ-1"
+
+
+def test_superseded_title_is_ignored(qtbot, db, open_dialog):
+    dialog = open_dialog(EntryDialog)
+    dialog.project_input.setText("Projet")
+    dialog.ticket_input.setText("PROJ-1")
+    dialog.fetch_ticket_title_from_jira("PROJ-1")
+    # Le ticket change avant la réponse de Jira
+    dialog.ticket_input.setText("PROJ-2")
+    qtbot.waitUntil(lambda: dialog.title_task is None, timeout=2000)
+    drain(qtbot, db)
+    assert dialog.ticket_title.text() != "Titre de PROJ-1"
+
+
+def test_v2_title_fetched_off_the_gui_thread(qtbot, db, open_dialog):
+    dialog = open_dialog(EntryDialogV2)
+    threads = watch_threads(dialog)
+    dialog.ticket_combo.setText("PROJ-3")
+
+    start = time.perf_counter()
+    dialog.fetch_ticket_title_from_jira("PROJ-3")
+    assert time.perf_counter() - start < LATENCY / 3
+
+    qtbot.waitUntil(lambda: dialog.title_input.text() == "Titre de PROJ-3")
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,162 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+requests = pytest.importorskip("requests")
+from utils import issue_cache  # noqa: E402
+from utils.database import Database  # noqa: E402
+from utils.issue_cache import IssueCache, ISSUE_CACHE_TTL, MISSING_ISSUE_TTL  # noqa: E402
+from utils.jira_client import JiraClient  # noqa: E402
+from utils.rate_limiter import JiraRateLimiter  # noqa: E402
+
+BASE_URL = 'https://jira.example.com'
+LAST_MODIFIED = 'Mon, 05 Jan 2026 09:00:00 GMT'
+
+
+class FakeSession:
+    """Session requests factice : handler(method, path, headers) -> (statut, corps, en-têtes)."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+
+    def request(self, method, url, headers=None, **kwargs):
+        path = url[len(BASE_URL):]
+        self.calls.append((method, path, dict(headers or {})))
+        status, payload, response_headers = self.handler(method, path, headers or {})
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(response_headers)
+        response._content = json.dumps(payload).encode() if payload is not None else b''
+        response.url = url
+        return response
+
+    def close(self):
+        pass
+
+
+class Jira:
+    """Tickets servis avec un ETag par version, 304 si l'ETag envoyé est à jour."""
+
+    def __init__(self):
+        self.summaries = {'PROJ-1': 'Export comptable'}
+        self.versions = {'PROJ-1': 1}
+        self.status = None  # Statut d'erreur forcé
+
+    def __call__(self, method, path, headers):
+        key = path.rsplit('/', 1)[-1]
+        if self.status:
+            return self.status, {'errorMessages': ['Erreur']}, {}
+        if key not in self.summaries:
+            return 404, {'errorMessages': ["Le ticket n'existe pas"]}, {}
+        etag = f'"v{self.versions[key]}"'
+        if headers.get('If-None-Match') == etag:
+            return 304, None, {'ETag': etag}
+        return 200, {'key': key, 'fields': {'summary': self.summaries[key], 'description': ''}}, \
+            {'ETag': etag, 'Last-Modified': LAST_MODIFIED}
+
+    def edit(self, key, summary):
+        self.summaries[key] = summary
+        self.versions[key] += 1
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Horloge du cache, avancée à la main."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(issue_cache, 'time', SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def db(db_path):
+    db = Database(db_path)
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def jira():
+    return Jira()
+
+
+def make_client(db, jira, **cache_options):
+    client = JiraClient(BASE_URL, 'token', 'moi@example.com', max_retries=0,
+                        rate_limiter=JiraRateLimiter(read_rate=1e6, write_rate=1e6),
+                        issue_cache=IssueCache(db, **cache_options))
+    client.session = FakeSession(jira)
+    return client
+
+
+def test_fresh_entries_served_without_request(db, jira, clock):
+    client = make_client(db, jira)
+    issue = client.get_issue_details('PROJ-1')
+    assert issue == {'key': 'PROJ-1', 'summary': 'Export comptable', 'description': ''}
+    assert client.get_issue_details('PROJ-1') == issue
+    assert len(client.session.calls) == 1
+
+    # Nouvelle session : le ticket est relu dans la table, sans appel à Jira
+    other = make_client(db, jira)
+    assert other.get_issue_details('PROJ-1') == issue
+    assert other.session.calls == []
+
+
+def test_expired_entry_revalidated_with_etag(db, jira, clock):
+    client = make_client(db, jira)
+    issue = client.get_issue_details('PROJ-1')
+
+    clock[0] += ISSUE_CACHE_TTL + 1
+    assert client.get_issue_details('PROJ-1') == issue
+    method, path, headers = client.session.calls[-1]
+    assert headers == {'If-None-Match': '"v1"', 'If-Modified-Since': LAST_MODIFIED}
+    # Le 304 prolonge l'entrée : pas de nouvel appel avant le prochain TTL
+    assert client.get_issue_details('PROJ-1') == issue
+    assert len(client.session.calls) == 2
+
+    # Ticket modifié dans Jira : nouvelle version et nouvel ETag
+    jira.edit('PROJ-1', 'Export comptable v2')
+    clock[0] += ISSUE_CACHE_TTL + 1
+    assert client.get_issue_details('PROJ-1')['summary'] == 'Export comptable v2'
+    assert db.get_cached_issue('PROJ-1')['etag'] == '"v2"'
+    assert make_client(db, jira).get_issue_details('PROJ-1')['summary'] == 'Export comptable v2'
+
+
+def test_missing_issue_cached_for_a_shorter_time(db, jira, clock):
+    client = make_client(db, jira)
+    assert client.get_issue_details('PROJ-404') is None
+    assert client.get_issue_details('PROJ-404') is None
+    assert len(client.session.calls) == 1
+    assert db.get_cached_issue('PROJ-404')['data'] is None
+
+    # Le cache négatif expire avant celui des tickets existants
+    clock[0] += MISSING_ISSUE_TTL + 1
+    jira.summaries['PROJ-404'] = 'Créé depuis'
+    jira.versions['PROJ-404'] = 1
+    assert client.get_issue_details('PROJ-404')['summary'] == 'Créé depuis'
+    # Rien à revalider pour un ticket inexistant : requête inconditionnelle
+    assert client.session.calls[-1][2] == {}
+
+
+def test_errors_are_not_cached(db, jira, clock):
+    client = make_client(db, jira)
+    jira.status = 500
+    assert client.get_issue_details('PROJ-1') is None
+    assert db.get_cached_issue('PROJ-1') is None
+
+    jira.status = None
+    assert client.get_issue_details('PROJ-1')['summary'] == 'Export comptable'
+    assert len(client.session.calls) == 2
+
+
+def test_memory_lru_falls_back_to_the_table(db, jira, clock):
+    jira.summaries.update({'PROJ-2': 'Deux', 'PROJ-3': 'Trois'})
+    jira.versions.update({'PROJ-2': 1, 'PROJ-3': 1})
+    client = make_client(db, jira, size=2)
+    for key in ('PROJ-1', 'PROJ-2', 'PROJ-3'):
+        client.get_issue_details(key)
+    assert list(client.issue_cache._entries) == ['PROJ-2', 'PROJ-3']
+
+    # Sorti du LRU, encore valide dans la table
+    assert client.get_issue_details('PROJ-1')['summary'] == 'Export comptable'
+    assert len(client.session.calls) == 3
@@ -0,0 +1,53 @@
+import pytest
+
+from utils.database import Database
+
+
+@pytest.fixture
+def db(db_path):
+    db = Database(db_path)
+    with db.transaction():
+        db.cursor.executemany("INSERT INTO projects (name) VALUES (?)", [("A",), ("B",)])
+        # 60 entrées sur seulement quatre couples (date, heure) : les pages
+        # se coupent au milieu de groupes de doublons
+        db.cursor.executemany("""
+            INSERT INTO entries (date, time, project_id, description, duration, is_synced)
+            VALUES (?, ?, ?, ?, 30, ?)
+        """, [(('2026-01-05', '2026-01-06')[i % 2], ('09:00', '14:00')[i % 3 == 0],
+               1 + i % 2 if i % 5 else None, f"Entrée {i}", i % 4 == 0)
+              for i in range(60)])
+    yield db
+    db.close()
+
+
+def expected(db, where="1", params=()):
+    db.cursor.execute(f"SELECT id FROM entries e WHERE {where} ORDER BY date DESC, time DESC, id DESC", params)
+    return [row[0] for row in db.cursor.fetchall()]
+
+
+@pytest.mark.parametrize('page_size', [1, 4, 7, 15, 30, 60, 500])
+def test_pages_cut_inside_duplicate_keys(db, page_size):
+    ids = [entry['id'] for entry in db.iter_entries(page_size=page_size)]
+    # Ni saut ni répétition, dans l'ordre (date, heure, id) décroissant
+    assert len(ids) == len(set(ids)) == 60
+    assert ids == expected(db)
+
+
+@pytest.mark.parametrize('filters, where, params', [
+    ({'project_id': 1}, "project_id = ?", (1,)),
+    ({'is_synced': False}, "is_synced = 0", ()),
+    ({'start_date': '2026-01-06', 'end_date': '2026-01-06'}, "date = ?", ('2026-01-06',)),
+])
+def test_filters_across_pages(db, filters, where, params):
+    ids = [entry['id'] for entry in db.iter_entries(filters, page_size=4)]
+    assert ids == expected(db, where, params)
+    assert ids
+
+
+def test_interleaved_queries_do_not_disturb_paging(db):
+    ids = []
+    for entry in db.iter_entries(page_size=6):
+        ids.append(entry['id'])
+        # Autre requête sur la même connexion entre deux lignes
+        db.get_projects()
+    assert ids == expected(db)
@@ -0,0 +1,74 @@
+import pytest
+
+from stubjira import EPIC_ROUTE, StubJira, epic_route, search_route
+from synthetic import jira_issues
+
+requests = pytest.importorskip("requests")
+from utils.jira_client import JiraClient  # noqa: E402
+from utils.rate_limiter import JiraRateLimiter  # noqa: E402
+
+
+def make_client(jira):
+    return JiraClient(jira.url, 'token', 'moi@example.com', max_retries=0,
+                      rate_limiter=JiraRateLimiter(read_rate=1e6, write_rate=1e6))
+
+
+def expected_parent(issue, agile_epics):
+    fields = issue['fields']
+    if fields.get('parent'):
+        return fields['parent']['key']
+    if fields.get('customfield_10014'):
+        return fields['customfield_10014']
+    return agile_epics.get(issue['key'], fields['project']['key'])
+
+
+def test_parent_keys_and_memoization():
+    issues, agile_epics = jira_issues(300)
+    unlinked = [issue['key'] for issue in issues
+                if issue['fields']['issuetype']['name'] == 'Story'
+                and 'customfield_10014' not in issue['fields']]
+    with StubJira({**search_route(issues), **epic_route(agile_epics)}) as jira:
+        client = make_client(jira)
+        parsed = client.search_issues('project = PROJ')
+        assert {issue['key']: issue['parent_key'] for issue in parsed} == {
+            issue['key']: expected_parent(issue, agile_epics) for issue in issues}
+        assert jira.count(EPIC_ROUTE) == len(unlinked)
+
+        # Les epics (et les absences d'epic) sont mémorisés d'une recherche à l'autre
+        client.search_issues('project = PROJ')
+        assert jira.count(EPIC_ROUTE) == len(unlinked)
+        client.close()
+
+
+@pytest.mark.parametrize('status', [403, 429, 500, 503])
+def test_failed_lookup_falls_back_and_is_not_cached(status, capsys):
+    issues, agile_epics = jira_issues(100)
+    failing = next(issue for issue in issues
+                   if issue['fields']['issuetype']['name'] == 'Story'
+                   and 'customfield_10014' not in issue['fields']
+                   and issue['key'] in agile_epics)
+    broken = {'active': True}
+    epic = epic_route(agile_epics)[('GET', EPIC_ROUTE)]
+
+    def flaky_epic(match, query, body):
+        if broken['active'] and match.group(1) == failing['key']:
+            return status, {'errorMessages': ['Erreur']}
+        return epic(match, query, body)
+
+    with StubJira({**search_route(issues), ('GET', EPIC_ROUTE): flaky_epic}) as jira:
+        client = make_client(jira)
+        # La recherche aboutit : le projet sert de parent au ticket en échec
+        parsed = {issue['key']: issue['parent_key'] for issue in client.search_issues('project = PROJ')}
+        assert len(parsed) == len(issues)
+        assert parsed[failing['key']] == 'PROJ'
+        assert f"epic de {failing['key']}" in capsys.readouterr().out
+        assert failing['key'] not in client._epic_cache
+        assert client._epic_cache
+
+        # Seul le ticket en échec est de nouveau interrogé, et cette fois résolu
+        requested = jira.count(EPIC_ROUTE)
+        broken['active'] = False
+        parsed = {issue['key']: issue['parent_key'] for issue in client.search_issues('project = PROJ')}
+        assert jira.count(EPIC_ROUTE) == requested + 1
+        assert parsed[failing['key']] == agile_epics[failing['key']]
+        client.close()
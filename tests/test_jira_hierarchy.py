@@ -0,0 +1,112 @@
+import hashlib
+import random
+
+import pytest
+
+from synthetic import hierarchy_tickets
+from utils.jira_hierarchy import IssueHierarchy, format_path
+from utils.jira_import import PathResolver
+
+ISSUES = 50000
+
+# Empreinte des chemins produits par l'ancien code (build_path de ConfigDialog)
+# sur hierarchy_tickets(ISSUES) : fige la sortie attendue
+RECORDED_PATHS_SHA256 = '2ed43f8b4c9d76030807dd5f52fdb606add0ff3b798492e66da9675cfb8147fb'
+
+
+def legacy_path(issue, tickets_dict):
+    """ConfigDialog.build_path d'avant user-018."""
+    path_parts = []
+    current_key = issue['key']
+    while current_key:
+        current = tickets_dict.get(current_key)
+        if not current:
+            break
+        path_parts.insert(0, current['title'])
+        current_key = current['parent_key']
+    return format_path(issue, path_parts)
+
+
+def legacy_level(issue, tickets_dict):
+    """Niveau calculé par JiraClient.get_issue_hierarchy d'avant user-018."""
+    level = 0
+    current_key = issue['parent_key']
+    while current_key and current_key in tickets_dict:
+        level += 1
+        current_key = tickets_dict[current_key]['parent_key']
+    return level
+
+
+def legacy_project(issue, tickets_dict):
+    """ConfigDialog.get_issue_project d'avant user-018."""
+    current = issue
+    while current and current.get('parent_key'):
+        current = tickets_dict.get(current['parent_key'])
+    return current if current else issue
+
+
+def digest(paths):
+    return hashlib.sha256("\n".join(paths[key] for key in sorted(paths)).encode()).hexdigest()
+
+
+@pytest.fixture(scope='module')
+def tickets():
+    return hierarchy_tickets(ISSUES)
+
+
+@pytest.mark.parametrize('with_project', [True, False])
+def test_same_output_as_parent_walks(tickets, with_project):
+    # Sans le ticket projet, les epics pointent vers une clé absente (cas de la recherche Jira)
+    if not with_project:
+        tickets = tickets[1:]
+    tickets_dict = {issue['key']: issue for issue in tickets}
+    hierarchy = IssueHierarchy(tickets)
+
+    paths = {issue['key']: hierarchy.path(issue['key']) for issue in tickets}
+    assert paths == {issue['key']: legacy_path(issue, tickets_dict) for issue in tickets}
+    assert all(hierarchy.level(issue['key']) == legacy_level(issue, tickets_dict) for issue in tickets)
+    if with_project:
+        assert digest(paths) == RECORDED_PATHS_SHA256
+        assert all(hierarchy.root(issue['key']) == legacy_project(issue, tickets_dict)['key']
+                   for issue in tickets)
+    assert hierarchy.cycles == []
+
+
+def test_streaming_resolver_matches_parent_walks(tickets):
+    # Ordre d'arrivée quelconque : les enfants précèdent souvent leur parent
+    tickets = tickets[1:]
+    tickets_dict = {issue['key']: issue for issue in tickets}
+    arrival = list(tickets)
+    random.Random(7).shuffle(arrival)
+
+    resolver = PathResolver()
+    resolved = []
+    for issue in arrival:
+        resolved.extend(resolver.add(issue))
+    resolved.extend(resolver.finish())
+
+    paths = {issue['key']: format_path(issue, path_parts) for issue, path_parts in resolved}
+    assert paths == {issue['key']: legacy_path(issue, tickets_dict) for issue in tickets}
+
+
+def test_parent_cycle_terminates():
+    tickets = [
+        {'key': 'A-1', 'title': 'A', 'type': 'epic', 'parent_key': 'A-3'},
+        {'key': 'A-2', 'title': 'B', 'type': 'story', 'parent_key': 'A-1'},
+        {'key': 'A-3', 'title': 'C', 'type': 'story', 'parent_key': 'A-2'},
+        {'key': 'A-4', 'title': 'D', 'type': 'sub-task', 'parent_key': 'A-2'},
+    ]
+    hierarchy = IssueHierarchy(tickets)
+
+    assert [sorted(cycle) for cycle in hierarchy.cycles] == [['A-1', 'A-2', 'A-3']]
+    # Le cycle est coupé au dernier ticket atteint, qui devient la racine
+    assert hierarchy.root('A-1') == 'A-2'
+    assert hierarchy.path('A-1') == 'B/C//'
+    assert hierarchy.path('A-4') == 'B/D/'
+    assert hierarchy.level('A-4') == 1
+    assert sorted(hierarchy.descendants('A-1')) == ['A-2', 'A-3', 'A-4']
+
+    resolver = PathResolver()
+    for issue in tickets:
+        assert resolver.add(issue) == []
+    assert sorted(issue['key'] for issue, _ in resolver.finish()) == ['A-1', 'A-2', 'A-3', 'A-4']
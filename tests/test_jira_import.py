@@ -0,0 +1,93 @@
+import pytest
+
+from synthetic import hierarchy_tickets
+from utils.database import Database
+from utils.jira_import import HierarchyImporter, MODE_ALL, MODE_SUBTASKS, STATE_SETTING
+
+JQL = 'project = PROJ'
+
+
+class FakeJira:
+    """Client Jira renvoyant des pages fixes, puis éventuellement une erreur."""
+
+    def __init__(self, tickets, page_size=20, fail_after=None):
+        self.pages = [tickets[i:i + page_size] for i in range(0, len(tickets), page_size)]
+        self.fail_after = fail_after
+
+    def iter_search_pages(self, jql, max_results=1000):
+        for index, page in enumerate(self.pages):
+            if index == self.fail_after:
+                raise ConnectionError("Jira injoignable")
+            yield page, sum(len(page) for page in self.pages)
+        if self.fail_after == len(self.pages):
+            raise ConnectionError("Jira injoignable")
+
+
+@pytest.fixture
+def db(db_path):
+    db = Database(db_path)
+    yield db
+    db.close()
+
+
+def table_counts(db):
+    return {table: db.cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ('jira_issues', 'jira_paths', 'jira_subtasks')}
+
+
+@pytest.fixture
+def imported(db):
+    """Base contenant un import complet de 100 tickets."""
+    tickets = hierarchy_tickets(100)[1:]
+    HierarchyImporter(FakeJira(tickets), db, MODE_ALL, chunk_size=30).run(JQL)
+    db.save_setting(STATE_SETTING.format(mode=MODE_SUBTASKS), '{"jql": "x"}')
+    # Cache des chemins rempli
+    db.get_issue_paths([ticket['key'] for ticket in tickets])
+    return table_counts(db), db.get_setting(STATE_SETTING.format(mode=MODE_ALL))
+
+
+def test_full_import_fills_tables(db, imported):
+    counts, state = imported
+    assert counts['jira_issues'] == 100
+    assert counts['jira_paths'] + counts['jira_subtasks'] == 100
+    assert state
+
+
+@pytest.mark.parametrize('fake', [
+    FakeJira(hierarchy_tickets(50)[1:], fail_after=0),  # Erreur sur la première page
+    FakeJira([]),                                        # Recherche vide
+], ids=['first-page-error', 'empty-result'])
+def test_existing_rows_survive_until_a_page_arrives(db, imported, fake):
+    counts, state = imported
+    cached = db.cursor.execute("SELECT COUNT(*) FROM jira_issue_paths").fetchone()[0]
+
+    importer = HierarchyImporter(fake, db, MODE_ALL)
+    if fake.fail_after is not None:
+        with pytest.raises(ConnectionError):
+            importer.run(JQL, incremental=False)
+    else:
+        importer.run(JQL, incremental=False)
+
+    assert table_counts(db) == counts
+    assert db.cursor.execute("SELECT COUNT(*) FROM jira_issue_paths").fetchone()[0] == cached
+    # Les états des modes ne sont pas touchés par un import qui n'a rien écrit
+    assert db.get_setting(STATE_SETTING.format(mode=MODE_SUBTASKS)) == '{"jql": "x"}'
+    if fake.fail_after is not None:
+        assert db.get_setting(STATE_SETTING.format(mode=MODE_ALL)) == state
+
+
+def test_interrupted_import_forces_a_full_import(db, imported):
+    tickets = hierarchy_tickets(50)[1:]
+    with pytest.raises(ConnectionError):
+        HierarchyImporter(FakeJira(tickets, fail_after=1), db, MODE_ALL).run(JQL, incremental=False)
+
+    # Les anciennes lignes ont été remplacées par la première page
+    assert table_counts(db)['jira_issues'] == 20
+    assert not db.get_setting(STATE_SETTING.format(mode=MODE_ALL))
+
+    importer = HierarchyImporter(FakeJira(tickets), db, MODE_ALL)
+    importer.run(JQL)
+    assert importer.full
+    assert table_counts(db)['jira_issues'] == 50
+    # L'import complet réussi impose un import complet aux autres modes
+    assert not db.get_setting(STATE_SETTING.format(mode=MODE_SUBTASKS))
@@ -0,0 +1,100 @@
+import sqlite3
+
+import pytest
+
+from utils.migrations import MIGRATIONS, SCHEMA_VERSION, get_schema_version, migrate
+
+
+@pytest.fixture
+def conn(db_path):
+    conn = sqlite3.connect(db_path)
+    yield conn
+    conn.close()
+
+
+def test_migrations_are_numbered_in_order():
+    versions = [version for version, _, _ in MIGRATIONS]
+    assert versions == list(range(1, len(MIGRATIONS) + 1))
+
+
+def test_migrate_new_database(conn):
+    assert migrate(conn) == SCHEMA_VERSION
+    assert get_schema_version(conn) == SCHEMA_VERSION
+
+
+def test_current_database_costs_one_pragma_read(conn):
+    migrate(conn)
+    statements = []
+    conn.set_trace_callback(statements.append)
+    assert migrate(conn) == SCHEMA_VERSION
+    conn.set_trace_callback(None)
+    assert statements == ["PRAGMA user_version"]
+
+
+def test_failed_migration_is_rolled_back(conn, monkeypatch):
+    def failing_step(cursor):
+        cursor.execute("CREATE TABLE partial (x)")
+        raise ValueError("boom")
+
+    migrate(conn)
+    monkeypatch.setattr('utils.migrations.MIGRATIONS',
+                        MIGRATIONS + [(SCHEMA_VERSION + 1, "Échec", failing_step)])
+    monkeypatch.setattr('utils.migrations.SCHEMA_VERSION', SCHEMA_VERSION + 1)
+    with pytest.raises(RuntimeError):
+        migrate(conn)
+    assert get_schema_version(conn) == SCHEMA_VERSION
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'partial'").fetchone() is None
+
+
+@pytest.fixture
+def issues(conn):
+    """Hiérarchie PROJ > EPIC > STORY > SUB, plus un epic voisin OTHER."""
+    migrate(conn)
+    conn.executemany(
+        "INSERT INTO jira_issues (key, parent_key, type, title, status) VALUES (?, ?, ?, ?, ?)",
+        [
+            ("PROJ", None, "project", "Projet", "Open"),
+            ("EPIC", "PROJ", "epic", "Epic", "Open"),
+            ("STORY", "EPIC", "story", "Story", "Open"),
+            ("SUB", "STORY", "sub-task", "Sous-tâche", "Open"),
+            ("OTHER", "PROJ", "epic", "Autre", "Open"),
+        ]
+    )
+    conn.executemany("INSERT INTO jira_issue_paths (key, path) VALUES (?, ?)",
+                     [(key, f"chemin {key}") for key in ("PROJ", "EPIC", "STORY", "SUB", "OTHER")])
+    conn.commit()
+    return conn
+
+
+def cached_keys(conn):
+    return {row[0] for row in conn.execute("SELECT key FROM jira_issue_paths")}
+
+
+def test_status_change_keeps_path_cache(issues):
+    issues.execute("UPDATE jira_issues SET status = 'Done' WHERE key = 'EPIC'")
+    issues.execute("UPDATE jira_issues SET title = 'Epic' WHERE key = 'EPIC'")
+    assert cached_keys(issues) == {"PROJ", "EPIC", "STORY", "SUB", "OTHER"}
+
+
+@pytest.mark.parametrize('statement', [
+    "UPDATE jira_issues SET title = 'Epic renommé' WHERE key = 'EPIC'",
+    "UPDATE jira_issues SET parent_key = 'OTHER' WHERE key = 'EPIC'",
+    "UPDATE jira_issues SET type = 'story' WHERE key = 'EPIC'",
+    "DELETE FROM jira_issues WHERE key = 'EPIC'",
+    "INSERT OR REPLACE INTO jira_issues (key, parent_key, type, title) VALUES ('EPIC', 'PROJ', 'epic', 'Epic')",
+])
+def test_change_invalidates_only_the_subtree(issues, statement):
+    issues.execute(statement)
+    assert cached_keys(issues) == {"PROJ", "OTHER"}
+
+
+def test_new_parent_invalidates_its_existing_children(issues):
+    issues.execute("DELETE FROM jira_issues WHERE key = 'STORY'")
+    issues.execute("INSERT INTO jira_issue_paths (key, path) VALUES ('SUB', 'chemin tronqué')")
+    issues.execute("INSERT INTO jira_issues (key, parent_key, type, title) VALUES ('STORY', 'EPIC', 'story', 'Story')")
+    assert cached_keys(issues) == {"PROJ", "EPIC", "OTHER"}
+
+
+def test_parent_cycle_terminates(issues):
+    issues.execute("UPDATE jira_issues SET parent_key = 'SUB' WHERE key = 'EPIC'")
+    assert cached_keys(issues) == {"PROJ", "OTHER"}
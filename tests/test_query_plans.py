@@ -0,0 +1,75 @@
+"""Aucune requête fréquente ne doit parcourir une table entière (user-004).
+
+Les plans sont obtenus par EXPLAIN QUERY PLAN sur les requêtes réellement
+exécutées par Database, capturées par trace callback, sur un historique
+synthétique de plusieurs années.
+"""
+import json
+import re
+from datetime import date
+
+import pytest
+
+from synthetic import populate_history
+
+pytest.importorskip("PyQt6")
+from utils.database import Database  # noqa: E402
+
+FULL_SCAN = re.compile(r'\bSCAN (\w+)')
+
+
+@pytest.fixture(scope='module')
+def history(tmp_path_factory):
+    db = Database(str(tmp_path_factory.mktemp('plans') / 'logtracker.db'))
+    days = populate_history(db, entries=20000, years=4, subtasks=5000)
+    yield db, days
+    db.close()
+
+
+def full_scans(conn, sql, params=()):
+    """Lignes du plan d'une requête qui parcourent une table sans index."""
+    rows = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+    return [
+        row for row in rows
+        if FULL_SCAN.search(row) and 'USING' not in row
+        and 'VIRTUAL TABLE' not in row and 'CONSTANT ROW' not in row
+    ]
+
+
+def executed_queries(db, call):
+    """Requêtes SELECT exécutées par un appel (SQL avec valeurs intégrées)."""
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        db.conn.set_trace_callback(None)
+    return [sql for sql in statements if sql.lstrip().upper().startswith(('SELECT', 'WITH'))]
+
+
+HOT_QUERIES = {
+    'get_entries_for_day': lambda db, days: db.get_entries_for_day(date.fromisoformat(days[-1])),
+    'get_entries_by_date_range': lambda db, days: db.get_entries_by_date_range(
+        date.fromisoformat(days[-30]), date.fromisoformat(days[-1])),
+    'get_sequential_time': lambda db, days: db.get_sequential_time(days[-1]),
+    'get_unsynchronized_entries': lambda db, days: db.get_unsynchronized_entries(),
+    'get_total_minutes_for_day': lambda db, days: db.get_total_minutes_for_day(days[-1]),
+    'get_unsynced_minutes': lambda db, days: db.get_unsynced_minutes(),
+    'get_last_ticket': lambda db, days: db.get_last_ticket(1),
+    'get_project_tickets': lambda db, days: db.get_project_tickets(1),
+}
+
+
+@pytest.mark.parametrize('name', sorted(HOT_QUERIES))
+def test_hot_query_uses_indexes(history, name):
+    db, days = history
+    queries = executed_queries(db, lambda: HOT_QUERIES[name](db, days))
+    assert queries, f"{name} n'a exécuté aucune requête"
+    for sql in queries:
+        assert full_scans(db.conn, sql) == [], sql
+
+
+def test_subtask_lookup_by_ticket_key_uses_index(history):
+    db, _ = history
+    sql = "SELECT ticket_key, path FROM jira_subtasks WHERE ticket_key IN (SELECT value FROM json_each(?))"
+    assert full_scans(db.conn, sql, (json.dumps(['SUB-1', 'SUB-2']),)) == []
@@ -0,0 +1,97 @@
+import time
+
+import pytest
+
+from stubjira import SEARCH_ROUTE, StubJira, search_route
+from synthetic import jira_issues
+from utils.rate_limiter import JiraRateLimiter, RateLimiter
+
+
+@pytest.mark.parametrize('method, path, read', [
+    ('GET', '/rest/api/3/issue/PROJ-1', True),
+    ('HEAD', None, True),
+    ('POST', '/rest/api/3/search', True),
+    ('POST', '/rest/api/3/search/jql', True),
+    ('POST', '/rest/api/2/search', True),
+    ('POST', '/rest/api/3/issue/bulkfetch', True),
+    ('POST', '/rest/api/2/issue/PROJ-1/worklog', False),
+    ('POST', '/rest/api/2/issue', False),
+    ('POST', None, False),
+    ('PUT', '/rest/api/3/search', False),
+])
+def test_bucket_choice(method, path, read):
+    limiter = JiraRateLimiter()
+    assert limiter.is_read(method, path) is read
+    assert limiter.bucket(method, path) is (limiter.read if read else limiter.write)
+
+
+def test_burst_then_blocking_then_refill():
+    limiter = RateLimiter(rate=20, burst=2)
+    # Le seau plein laisse partir burst requêtes sans attendre
+    assert limiter.acquire() < 0.01
+    assert limiter.acquire() < 0.01
+    # Le seau vide : un jeton toutes les 1/rate secondes
+    assert limiter.acquire() >= 0.04
+
+    time.sleep(0.1)
+    assert limiter.acquire() < 0.01
+    assert limiter.metrics()['acquired'] == 4
+
+
+def test_retry_after_pauses_the_bucket():
+    limiter = RateLimiter(rate=100)
+    limiter.throttled(pause=0.2)
+    assert limiter.rate == 50
+    assert limiter.acquire() >= 0.18
+
+    # Le débit remonte vers le débit nominal à chaque succès
+    for _ in range(30):
+        limiter.succeeded()
+    assert limiter.rate == 100
+
+
+def test_client_honours_retry_after():
+    pytest.importorskip("requests")
+    from utils.jira_client import JiraClient
+
+    issues, _ = jira_issues(50, unlinked_ratio=0)
+    served = search_route(issues)[('POST', SEARCH_ROUTE)]
+    calls = []
+
+    def search(match, query, body):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return 429, {'errorMessages': ['Trop de requêtes']}, {'Retry-After': '0.3'}
+        return served(match, query, body)
+
+    with StubJira({('POST', SEARCH_ROUTE): search}) as jira:
+        limiter = JiraRateLimiter()
+        client = JiraClient(jira.url, 'token', 'moi@example.com', rate_limiter=limiter)
+        assert len(client.search_issues('project = PROJ')) == 50
+        client.close()
+
+    assert calls[1] - calls[0] >= 0.29
+    metrics = limiter.metrics()
+    assert metrics['read']['throttled'] == 1
+    assert metrics['write']['throttled'] == 0
+
+
+def test_search_pages_use_the_read_bucket():
+    pytest.importorskip("requests")
+    from utils.jira_client import JiraClient
+
+    issues, _ = jira_issues(3000, unlinked_ratio=0)
+    with StubJira(search_route(issues)) as jira:
+        # Débits par défaut : 20 lectures et 5 écritures par seconde
+        limiter = JiraRateLimiter()
+        client = JiraClient(jira.url, 'token', 'moi@example.com', rate_limiter=limiter)
+        start = time.perf_counter()
+        assert len(client.search_issues('project = PROJ', max_results=3000)) == 3000
+        elapsed = time.perf_counter() - start
+        client.close()
+
+    metrics = limiter.metrics()
+    assert metrics['read']['acquired'] == 30
+    assert metrics['write']['acquired'] == 0
+    # 30 pages au débit d'écriture prendraient 5 s
+    assert elapsed < 2
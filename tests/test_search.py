@@ -0,0 +1,61 @@
+import pytest
+
+from utils.database import Database
+
+
+@pytest.fixture
+def db(db_path):
+    db = Database(db_path)
+    with db.transaction():
+        db.cursor.executemany(
+            "INSERT INTO jira_subtasks (path, title, ticket_key) VALUES (?, ?, ?)",
+            [
+                ("Sécurité > Audit", "Revue des accès", "SEC-1"),
+                ("Epic > Story", "Audit de sécurité", "PROJ-1234"),
+                ("Epic > Story", "Refonte du menu", "PROJ-88"),
+            ]
+        )
+    db.save_entry("Projet", "PROJ-88", "Refonte du menu", "Maquettes du menu", 30, "2026-01-05", "09:00")
+    db.save_entry("Projet", None, None, "Réunion sécurité", 60, "2026-01-05", "10:00")
+    yield db
+    db.close()
+
+
+def keys(results):
+    return [(result['kind'], result['ticket_key']) for result in results]
+
+
+def test_prefix_without_accents_ranked_by_column(db):
+    # Numéro de ticket > titre > chemin ou description, puis le plus récent
+    assert keys(db.search("secu")) == [
+        ('subtask', 'PROJ-1234'),
+        ('entry', None),
+        ('subtask', 'SEC-1'),
+    ]
+    assert keys(db.search("sec"))[0] == ('subtask', 'SEC-1')
+
+
+def test_all_terms_required(db):
+    assert keys(db.search("menu refonte")) == [('subtask', 'PROJ-88'), ('entry', 'PROJ-88')]
+    assert db.search("menu sécurité") == []
+    # Mots plus longs que les index de préfixes : vérifiés en entier
+    assert keys(db.search("maquettes")) == [('entry', 'PROJ-88')]
+    assert db.search("maquettiste") == []
+    assert db.search("  ") == []
+
+
+def test_kinds_and_limit(db):
+    assert keys(db.search("menu", kinds=['entry'])) == [('entry', 'PROJ-88')]
+    assert keys(db.search("menu", kinds=['subtask'])) == [('subtask', 'PROJ-88')]
+    assert len(db.search("e", limit=2)) == 2
+
+
+def test_triggers_keep_indexes_in_sync(db):
+    db.cursor.execute("UPDATE jira_subtasks SET title = 'Export comptable' WHERE ticket_key = 'PROJ-88'")
+    db.cursor.execute("DELETE FROM entries WHERE description = 'Maquettes du menu'")
+    db.conn.commit()
+    assert db.search("menu") == []
+    assert keys(db.search("comptable")) == [('subtask', 'PROJ-88')]
+
+    db.rebuild_search_index()
+    assert keys(db.search("comptable")) == [('subtask', 'PROJ-88')]
@@ -0,0 +1,88 @@
+import pytest
+
+from utils.database import Database
+
+
+@pytest.fixture
+def db(db_path):
+    db = Database(db_path)
+    yield db
+    db.close()
+
+
+def count_selects(db):
+    """Compte les lectures de la table settings sur la connexion du thread."""
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    return lambda: sum('FROM settings' in statement for statement in statements)
+
+
+def test_settings_read_once_then_served_from_cache(db):
+    db.save_settings({'report_title': '7', 'time_increment': '15'})
+    db.invalidate_settings_cache()
+    selects = count_selects(db)
+    assert db.get_setting('report_title') == '7'
+    assert db.get_setting('time_increment') == '15'
+    assert db.get_setting('absent', 'défaut') == 'défaut'
+    assert selects() == 1
+
+
+def test_cache_shared_by_instances_on_the_same_file(db, db_path, tmp_path):
+    other = Database(db_path)
+    assert other.get_setting('report_title') is None
+    db.save_setting('report_title', '6')
+    assert other.get_setting('report_title') == '6'
+
+    # Base modifiée hors du cache : visible après invalidation, par toutes les instances
+    db.cursor.execute("UPDATE settings SET value = '5' WHERE key = 'report_title'")
+    db.conn.commit()
+    assert other.get_setting('report_title') == '6'
+    other.invalidate_settings_cache()
+    assert db.get_setting('report_title') == '5'
+
+    # Un autre fichier a son propre cache
+    elsewhere = Database(str(tmp_path / 'autre.db'))
+    assert elsewhere.get_setting('report_title') is None
+    elsewhere.close()
+
+
+def test_rolled_back_transaction_leaves_cache_unchanged(db):
+    db.save_setting('jira_base_url', 'https://avant.example.com')
+    other = Database(db.db_path)
+    assert other.get_setting('jira_base_url') == 'https://avant.example.com'
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.save_setting('jira_base_url', 'https://apres.example.com')
+            # Pas encore validé : le cache garde l'ancienne valeur
+            assert other.get_setting('jira_base_url') == 'https://avant.example.com'
+            raise RuntimeError("import interrompu")
+
+    assert db.get_setting('jira_base_url') == 'https://avant.example.com'
+    db.invalidate_settings_cache()
+    assert db.get_setting('jira_base_url') == 'https://avant.example.com'
+
+
+def test_cache_updated_after_outermost_commit(db):
+    assert db.get_setting('a') is None
+    with db.transaction():
+        db.save_settings({'a': '1', 'b': '1'})
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.save_setting('b', '2')
+                raise RuntimeError
+        assert db.get_setting('a') is None
+    assert (db.get_setting('a'), db.get_setting('b')) == ('1', '1')
+    db.invalidate_settings_cache()
+    assert (db.get_setting('a'), db.get_setting('b')) == ('1', '1')
+
+
+def test_cache_not_loaded_from_uncommitted_rows(db):
+    db.invalidate_settings_cache()
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.save_setting('last_export', '2026-01-05')
+            # Lecture dans la transaction : ne doit pas figer la valeur non validée
+            db.get_setting('last_export')
+            raise RuntimeError
+    assert db.get_setting('last_export') is None
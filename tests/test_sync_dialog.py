@@ -0,0 +1,45 @@
+import pytest
+
+pytest.importorskip("pytestqt")
+from ui.sync_dialog import SyncDialog  # noqa: E402
+from utils.database import Database  # noqa: E402
+
+
+@pytest.fixture
+def db(db_path):
+    db = Database(db_path)
+    yield db
+    db.close()
+
+
+def open_dialog(qtbot, db):
+    widget = SyncDialog(db=db)
+    qtbot.addWidget(widget)
+    qtbot.waitUntil(widget.sync_button.isEnabled)
+    with qtbot.waitSignal(db.submit(lambda: None).finished):
+        pass
+    return widget
+
+
+def test_outbox_counts_are_shown(qtbot, db):
+    entry_ids = [db.save_entry("Projet", f"PROJ-{i}", f"Ticket {i}", "Revue", 30, "2026-01-05", f"09:{i}0")
+                 for i in range(4)]
+    db.enqueue_sync(entry_ids)
+    db.fail_sync_item(entry_ids[0], "Erreur 400", retry_in=None)
+    db.fail_sync_item(entry_ids[1], "Erreur 503", retry_in=60)
+    db.claim_sync_item(entry_ids[2])
+
+    widget = open_dialog(qtbot, db)
+
+    assert not widget.outbox_label.isHidden()
+    assert widget.outbox_label.text() == \
+        "File d'envoi : 3 envoi(s) en attente de nouvel essai, 1 envoi(s) en échec"
+
+
+def test_outbox_label_hidden_when_empty(qtbot, db):
+    db.save_entry("Projet", "PROJ-1", "Ticket 1", "Revue", 30, "2026-01-05", "09:00")
+
+    widget = open_dialog(qtbot, db)
+
+    assert widget.outbox_label.isHidden()
+    assert len(widget.entries) == 1
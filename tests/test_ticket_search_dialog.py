@@ -0,0 +1,83 @@
+import pytest
+
+pytest.importorskip("pytestqt")
+from ui.ticket_search_dialog import TicketSearchDialog  # noqa: E402
+from utils.database import Database  # noqa: E402
+
+
+@pytest.fixture
+def dialog(qtbot, db_path):
+    db = Database(db_path)
+    with db.transaction():
+        db.cursor.executemany(
+            "INSERT INTO jira_subtasks (path, title, ticket_key) VALUES (?, ?, ?)",
+            [
+                ("Epic > Story", "Audit de sécurité", "PROJ-1234"),
+                ("Epic > Story", "Refonte du menu", "PROJ-88"),
+                ("Autre > Story", "Export comptable", "OPS-7"),
+            ]
+        )
+    widget = TicketSearchDialog(db=db)
+    qtbot.addWidget(widget)
+    qtbot.waitUntil(lambda: len(widget.all_items) == 3)
+    yield widget
+    db.close()
+
+
+def wait_for_db(qtbot, db):
+    """Attend que les tâches déjà soumises à l'exécuteur aient livré leur résultat."""
+    with qtbot.waitSignal(db.submit(lambda: None).finished):
+        pass
+
+
+def wait_for_search(qtbot, dialog):
+    """Attend la fin du délai de saisie puis le résultat de l'index plein texte."""
+    qtbot.waitUntil(lambda: not dialog.search_timer.isActive())
+    wait_for_db(qtbot, dialog.db)
+
+
+def visible_keys(dialog):
+    return sorted(item.text(0) for item in dialog.all_items if not item.isHidden())
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("", ["OPS-7", "PROJ-1234", "PROJ-88"]),
+    ("proj", ["PROJ-1234", "PROJ-88"]),
+    ("23", ["PROJ-1234"]),          # milieu du numéro, hors de portée du préfixe FTS
+    ("menu refonte", ["PROJ-88"]),  # tous les termes, dans n'importe quel ordre
+    ("ptable", ["OPS-7"]),          # milieu d'un mot du titre
+    ("secu", ["PROJ-1234"]),        # accents ignorés par l'index plein texte
+    ("inconnu", []),
+])
+def test_filter_tickets(qtbot, dialog, text, expected):
+    dialog.search_input.setText(text)
+    wait_for_search(qtbot, dialog)
+    assert visible_keys(dialog) == expected
+
+
+def test_typing_runs_one_index_query(qtbot, dialog, monkeypatch):
+    searched = []
+    search = dialog.db.search
+    monkeypatch.setattr(dialog.db, 'search', lambda text, **kwargs: searched.append((text, kwargs['limit'])) or search(text, **kwargs))
+
+    for length in range(1, len("secu") + 1):
+        dialog.search_input.setText("secu"[:length])
+    wait_for_search(qtbot, dialog)
+
+    # Seule la saisie finale interroge l'index, avec un nombre de résultats borné
+    assert searched == [("secu", dialog.SEARCH_LIMIT)]
+    assert visible_keys(dialog) == ["PROJ-1234"]
+
+
+def test_superseded_query_is_cancelled(qtbot, dialog):
+    dialog.search_input.setText("secu")
+    dialog.search_timer.stop()
+    dialog._search_index()
+    first = dialog.search_task
+    dialog.search_input.setText("menu")
+    dialog.search_timer.stop()
+    dialog._search_index()
+
+    assert first.cancelled
+    wait_for_db(qtbot, dialog.db)
+    assert visible_keys(dialog) == ["PROJ-88"]
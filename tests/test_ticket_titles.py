@@ -0,0 +1,77 @@
+import re
+
+import pytest
+
+pytest.importorskip("requests")
+from stubjira import SEARCH_ROUTE, StubJira  # noqa: E402
+from utils.database import Database  # noqa: E402
+from utils.jira_client import JiraClient  # noqa: E402
+from utils.rate_limiter import JiraRateLimiter  # noqa: E402
+from utils.ticket_titles import REFRESH_SETTING, refresh_ticket_titles  # noqa: E402
+
+# Taille de page maximale du serveur, sous la taille des lots
+PAGE_LIMIT = 40
+
+
+def key_search_route(summaries, page_limit=PAGE_LIMIT):
+    """Route de recherche répondant aux requêtes `key in (...)`, page par page."""
+    def search(match, query, body):
+        keys = re.findall(r'"([^"]+)"', body['jql'])
+        found = [{'key': key, 'fields': {'summary': summaries[key]}} for key in keys if key in summaries]
+        start = body['startAt']
+        size = min(body['maxResults'], page_limit)
+        return 200, {'startAt': start, 'maxResults': size, 'total': len(found),
+                     'issues': found[start:start + size]}
+    return {('POST', SEARCH_ROUTE): search}
+
+
+@pytest.fixture
+def db(db_path):
+    db = Database(db_path)
+    yield db
+    db.close()
+
+
+def make_client(jira):
+    return JiraClient(jira.url, 'token', 'moi@example.com', max_retries=0,
+                      rate_limiter=JiraRateLimiter(read_rate=1e6, write_rate=1e6))
+
+
+def add_tickets(db, count):
+    with db.transaction():
+        db.cursor.execute("INSERT INTO projects (name) VALUES ('PROJ')")
+        project_id = db.cursor.lastrowid
+        db.cursor.executemany("INSERT INTO tickets (project_id, ticket_number, title) VALUES (?, ?, ?)",
+                              [(project_id, f"PROJ-{i}", f"Titre {i}") for i in range(count)])
+
+
+def test_chunks_are_read_page_by_page():
+    summaries = {f"PROJ-{i}": f"Titre {i}" for i in range(250)}
+    with StubJira(key_search_route(summaries)) as jira:
+        client = make_client(jira)
+        keys = list(summaries) + ["PROJ-999", "pas une clé", "proj-3"]
+        titles = client.get_issue_titles(keys, chunk_size=100)
+        client.close()
+        requests = jira.count(SEARCH_ROUTE)
+
+    # Clé inexistante et clé mal formée ignorées ; clé en minuscules rendue telle que fournie
+    assert titles == {**summaries, "proj-3": "Titre 3"}
+    # Lots de 100, 100 et 51 clés (dont une inexistante), pages de 40 tickets
+    assert requests == 3 + 3 + 2
+
+
+def test_refresh_updates_only_changed_titles(db):
+    add_tickets(db, 300)
+    summaries = {f"PROJ-{i}": f"Titre {i}" for i in range(290)}
+    for i in range(0, 290, 3):
+        summaries[f"PROJ-{i}"] = f"Nouveau titre {i}"
+
+    with StubJira(key_search_route(summaries)) as jira:
+        client = make_client(jira)
+        checked, updated = refresh_ticket_titles(client, db, chunk_size=100)
+        client.close()
+
+    assert (checked, updated) == (300, 97)
+    titles = {ticket['ticket_number']: ticket['title'] for ticket in db.get_active_tickets()}
+    assert titles == {**{f"PROJ-{i}": f"Titre {i}" for i in range(300)}, **summaries}
+    assert db.get_setting(REFRESH_SETTING)
@@ -0,0 +1,398 @@
+import time
+from datetime import date, timedelta
+
+import pytest
+
+pytest.importorskip("requests")
+from stubjira import MYSELF_ROUTE, WORKLOG_ROUTE, StubJira, WorklogStore  # noqa: E402
+from utils.database import Database  # noqa: E402
+from utils.jira_client import JiraClient  # noqa: E402
+from utils.rate_limiter import JiraRateLimiter  # noqa: E402
+from utils.worklog_sync import (  # noqa: E402
+    IN_FLIGHT_LEASE, MAX_ATTEMPTS, OUTBOX_PROPERTY, RETRY_BASE_DELAY, RETRY_MAX_DELAY,
+    WorklogSyncEngine, group_comment, group_entries, retry_delay,
+)
+
+# Latence de Jira par requête (secondes)
+LATENCY = 0.03
+FIRST_DAY = date(2026, 1, 1)
+
+
+@pytest.fixture
+def db(db_path):
+    db = Database(db_path)
+    yield db
+    db.close()
+
+
+def add_entries(db, count, tickets=50, per_day=10):
+    """Ajoute count entrées non synchronisées (per_day par jour à partir de 8h, tickets en alternance).
+
+    Returns:
+        list: Les entrées ajoutées, comme get_unsynchronized_entries
+    """
+    with db.transaction():
+        db.cursor.execute("INSERT OR IGNORE INTO projects (name) VALUES ('PROJ')")
+        db.cursor.execute("SELECT id FROM projects WHERE name = 'PROJ'")
+        project_id = db.cursor.fetchone()[0]
+        db.cursor.executemany("INSERT OR IGNORE INTO tickets (project_id, ticket_number, title) VALUES (?, ?, ?)",
+                              [(project_id, f"PROJ-{t}", f"Ticket {t}") for t in range(tickets)])
+        db.cursor.execute("SELECT ticket_number, id FROM tickets")
+        ticket_ids = dict(db.cursor.fetchall())
+        db.cursor.execute("SELECT COALESCE(MAX(id), 0) FROM entries")
+        last_id = db.cursor.fetchone()[0]
+        db.cursor.executemany("""
+            INSERT INTO entries (date, time, project_id, ticket_id, ticket_title, description, duration, is_synced)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+        """, [((FIRST_DAY + timedelta(days=i // per_day)).isoformat(), "{:02d}:{:02d}".format(*divmod(480 + i % per_day * 15, 60)),
+               project_id, ticket_ids[f"PROJ-{i % tickets}"], f"Ticket {i % tickets}", f"Travail {i}", 30)
+              for i in range(count)])
+    return sorted((entry for entry in db.get_unsynchronized_entries() if entry['id'] > last_id),
+                  key=lambda entry: entry['id'])
+
+
+def make_client(jira):
+    return JiraClient(jira.url, 'token', 'moi@example.com', max_retries=0,
+                      rate_limiter=JiraRateLimiter(read_rate=1e6, write_rate=1e6))
+
+
+def outbox_states(db):
+    db.cursor.execute("SELECT state, COUNT(*) FROM sync_outbox GROUP BY state")
+    return dict(db.cursor.fetchall())
+
+
+def outbox_item(db, entry_id):
+    db.cursor.execute("""
+        SELECT state, attempts, last_error, worklog_id,
+               CAST(strftime('%s', next_attempt_at) - strftime('%s', 'now') AS INTEGER)
+        FROM sync_outbox WHERE entry_id = ?
+    """, (entry_id,))
+    return db.cursor.fetchone()
+
+
+def is_synced(db, entry_id):
+    db.cursor.execute("SELECT is_synced FROM entries WHERE id = ?", (entry_id,))
+    return db.cursor.fetchone()[0] == 1
+
+
+def test_500_entries_posted_in_parallel(db):
+    entries = add_entries(db, 500, per_day=20)
+    store = WorklogStore()
+    with StubJira(store.routes(), latency=LATENCY) as jira:
+        client = make_client(jira)
+        progress = []
+        engine = WorklogSyncEngine(client, db, max_workers=8,
+                                   progress=lambda done, total: progress.append(done))
+        start = time.perf_counter()
+        synced_ids, errors = engine.run(entries)
+        elapsed = time.perf_counter() - start
+        client.close()
+        posts = jira.count(WORKLOG_ROUTE)
+
+    assert errors == []
+    assert sorted(synced_ids) == sorted(entry['id'] for entry in entries)
+    assert posts == 500
+    assert db.get_unsynchronized_entries() == []
+    assert outbox_states(db) == {'done': 500}
+    assert progress[-1] == 500
+    # Envoi un par un : au moins 500 × LATENCY secondes
+    assert elapsed < 500 * LATENCY / 2
+
+
+def test_cancel_mid_run_leaves_the_rest_queued(db):
+    entries = add_entries(db, 100)
+    store = WorklogStore()
+    with StubJira(store.routes(), latency=LATENCY) as jira:
+        client = make_client(jira)
+        engine = WorklogSyncEngine(client, db, max_workers=2)
+        engine.progress = lambda done, total: done >= 10 and engine.cancel()
+        synced_ids, errors = engine.run(entries)
+        assert engine.cancelled
+
+        # Les envois partis se terminent, aucun autre ne part
+        assert errors == []
+        assert 10 <= len(synced_ids) < 20
+        assert outbox_states(db) == {'done': len(synced_ids), 'pending': 100 - len(synced_ids)}
+        assert sum(len(worklogs) for worklogs in store.worklogs.values()) == len(synced_ids)
+
+        # Une nouvelle passe envoie le reste, sans doublon
+        synced_later, errors = WorklogSyncEngine(client, db).drain()
+        client.close()
+
+    assert errors == []
+    assert sorted(synced_ids + synced_later) == sorted(entry['id'] for entry in entries)
+    assert outbox_states(db) == {'done': 100}
+    sent = [prop['value']['entry_ids'] for worklogs in store.worklogs.values()
+            for worklog in worklogs for prop in worklog['properties']]
+    assert sorted(id for ids in sent for id in ids) == sorted(entry['id'] for entry in entries)
+
+
+def test_outbox_pending_in_flight_done(db):
+    entry = add_entries(db, 1)[0]
+    db.enqueue_sync([entry['id']])
+    assert outbox_item(db, entry['id'])[:2] == ('pending', 0)
+    assert [item['id'] for item in db.get_due_sync_items()] == [entry['id']]
+
+    assert db.claim_sync_item(entry['id'])
+    assert outbox_item(db, entry['id'])[:2] == ('in_flight', 1)
+    # Un élément réservé ne l'est qu'une fois et n'est plus dû
+    assert not db.claim_sync_item(entry['id'])
+    assert db.get_due_sync_items() == []
+
+    db.complete_sync_item(entry['id'], '10001')
+    assert outbox_item(db, entry['id'])[:4] == ('done', 1, None, '10001')
+    assert is_synced(db, entry['id'])
+    # Une nouvelle mise en file ne renvoie pas un élément déjà envoyé
+    db.enqueue_sync([entry['id']])
+    assert outbox_item(db, entry['id'])[0] == 'done'
+
+
+@pytest.mark.parametrize('attempts, delay', [
+    (1, RETRY_BASE_DELAY),
+    (2, 2 * RETRY_BASE_DELAY),
+    (5, 16 * RETRY_BASE_DELAY),
+    (MAX_ATTEMPTS - 1, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (MAX_ATTEMPTS - 2))),
+    (MAX_ATTEMPTS, None),
+])
+def test_retry_delay_doubles_then_gives_up(attempts, delay):
+    assert retry_delay(attempts) == delay
+    assert all(retry_delay(n) <= RETRY_MAX_DELAY for n in range(1, MAX_ATTEMPTS))
+
+
+def test_temporary_failures_back_off_then_fail(db):
+    entry = add_entries(db, 1)[0]
+    store = WorklogStore(fail=lambda ticket, body: 503)
+    with StubJira(store.routes()) as jira:
+        client = make_client(jira)
+        engine = WorklogSyncEngine(client, db)
+        engine.run([entry])
+        state, attempts, error, _, wait = outbox_item(db, entry['id'])
+        assert (state, attempts) == ('pending', 1)
+        assert '503' in error
+        assert RETRY_BASE_DELAY - 5 <= wait <= RETRY_BASE_DELAY
+        # Pas de nouvel essai avant l'échéance
+        assert engine.drain() == ([], [])
+
+        # Chaque échec double le délai
+        for attempt in range(2, MAX_ATTEMPTS):
+            db.cursor.execute("UPDATE sync_outbox SET next_attempt_at = datetime('now')")
+            db.conn.commit()
+            _, errors = engine.drain()
+            assert len(errors) == 1
+            assert outbox_item(db, entry['id'])[1] == attempt
+            assert outbox_item(db, entry['id'])[4] >= retry_delay(attempt) - 5
+
+        # Dernière tentative : abandon définitif
+        db.cursor.execute("UPDATE sync_outbox SET next_attempt_at = datetime('now')")
+        db.conn.commit()
+        _, errors = engine.drain()
+        assert errors[0].startswith("Échec définitif")
+        assert outbox_item(db, entry['id'])[:2] == ('failed', MAX_ATTEMPTS)
+
+        # Une erreur 4xx est définitive dès la première tentative
+        other = add_entries(db, 1)[0]
+        store.fail = lambda ticket, body: 400
+        engine.run([other])
+        client.close()
+
+    assert outbox_item(db, other['id'])[:2] == ('failed', 1)
+    assert not is_synced(db, entry['id']) and not is_synced(db, other['id'])
+    assert store.worklogs == {}
+
+
+def test_recovery_after_a_crash(db):
+    entries = add_entries(db, 4, tickets=1)
+    sent_with_property, sent_without_property, lost, recent = entries
+    db.enqueue_sync([entry['id'] for entry in entries])
+    for entry in entries:
+        db.claim_sync_item(entry['id'])
+    # Réservations de la session précédente, sauf la dernière
+    db.cursor.execute("UPDATE sync_outbox SET updated_at = datetime('now', ?) WHERE entry_id != ?",
+                      (f"-{IN_FLIGHT_LEASE + 60} seconds", recent['id']))
+    db.conn.commit()
+
+    store = WorklogStore()
+    # Worklogs créés juste avant l'arrêt, dont un sans propriété (ancienne version)
+    with_property = store.add(
+        'PROJ-0', f"{sent_with_property['date']}T{sent_with_property['time']}:00.000+0100", 1800,
+        properties=[{'key': OUTBOX_PROPERTY, 'value': {'entry_ids': [sent_with_property['id']]}}])
+    without_property = store.add(
+        'PROJ-0', f"{sent_without_property['date']}T{sent_without_property['time']}:00.000+0100", 1800,
+        comment=f"Ticket 0\n{sent_without_property['description']}")
+
+    with StubJira(store.routes()) as jira:
+        client = make_client(jira)
+        assert WorklogSyncEngine(client, db).recover() == []
+        client.close()
+
+    assert outbox_item(db, sent_with_property['id'])[:4] == ('done', 1, None, with_property['id'])
+    assert outbox_item(db, sent_without_property['id'])[:4] == ('done', 1, None, without_property['id'])
+    # Envoi perdu : remis en file immédiatement
+    assert outbox_item(db, lost['id'])[0] == 'pending'
+    assert [item['id'] for item in db.get_due_sync_items()] == [lost['id']]
+    # Réservation récente : peut-être en cours d'envoi ailleurs, non reprise
+    assert outbox_item(db, recent['id'])[0] == 'in_flight'
+
+
+def test_recovery_keeps_items_when_jira_is_unreachable(db):
+    entry = add_entries(db, 1)[0]
+    db.enqueue_sync([entry['id']])
+    db.claim_sync_item(entry['id'])
+    store = WorklogStore()
+    with StubJira(store.routes()) as jira:
+        client = make_client(jira)
+    # Serveur arrêté : la vérification échoue
+    assert WorklogSyncEngine(client, db).recover(lease=0) == [entry['id']]
+    client.close()
+    assert outbox_item(db, entry['id'])[0] == 'in_flight'
+
+
+def entry(id, ticket, date, time, description, duration=30, title=None):
+    return {'id': id, 'ticket_number': ticket, 'date': date, 'time': time,
+            'description': description, 'duration': duration, 'ticket_title': title}
+
+
+def test_group_entries_by_ticket_and_day():
+    entries = [
+        entry(1, 'PROJ-1', '2026-01-05', '09:00', 'a'),
+        entry(2, 'PROJ-2', '2026-01-05', '10:00', 'b'),
+        entry(3, 'PROJ-1', '2026-01-05', '14:00', 'c'),
+        entry(4, 'PROJ-1', '2026-01-06', '09:00', 'd'),
+    ]
+    groups = group_entries(entries, coalesce=True)
+    assert [[e['id'] for e in group] for group in groups] == [[1, 3], [2], [4]]
+    # Sans regroupement : un worklog par entrée, dans l'ordre
+    assert [[e['id'] for e in group] for group in group_entries(entries, coalesce=False)] == [[1], [2], [3], [4]]
+    assert group_entries([], coalesce=True) == []
+
+
+def test_group_comment_merges_descriptions_in_order():
+    entries = [
+        entry(1, 'PROJ-1', '2026-01-05', '14:00', 'Relecture', title='Export'),
+        entry(2, 'PROJ-1', '2026-01-05', '09:00', 'Développement', title='Export'),
+        entry(3, 'PROJ-1', '2026-01-05', '11:00', ''),
+    ]
+    # Titre une seule fois, descriptions vides ignorées
+    assert group_comment(entries) == "Export\nDéveloppement\nRelecture"
+    assert group_comment(entries[:1]) == "Export\nRelecture"
+    assert group_comment([entry(1, 'PROJ-1', '2026-01-05', '09:00', 'Seul')]) == "Seul"
+
+
+@pytest.mark.parametrize('coalesce', [True, False], ids=['coalesce', 'one-per-entry'])
+def test_coalesced_sync_posts_one_worklog_per_ticket_and_day(db, coalesce):
+    # 3 tickets, 2 jours, 10 entrées par jour
+    entries = add_entries(db, 20, tickets=3, per_day=10)
+    store = WorklogStore()
+    with StubJira(store.routes()) as jira:
+        client = make_client(jira)
+        synced_ids, errors = WorklogSyncEngine(client, db, coalesce=coalesce).run(entries)
+        client.close()
+        posts = jira.count(WORKLOG_ROUTE)
+
+    assert errors == []
+    assert sorted(synced_ids) == [e['id'] for e in entries]
+    worklogs = [worklog for ticket_worklogs in store.worklogs.values() for worklog in ticket_worklogs]
+    if not coalesce:
+        assert posts == len(worklogs) == 20
+        return
+    assert posts == len(worklogs) == 6
+
+    by_id = {e['id']: e for e in entries}
+    db.cursor.execute("SELECT entry_id, worklog_id FROM sync_outbox")
+    worklog_of = dict(db.cursor.fetchall())
+    for ticket, ticket_worklogs in store.worklogs.items():
+        for worklog in ticket_worklogs:
+            members = [by_id[id] for id in worklog['properties'][0]['value']['entry_ids']]
+            assert {(e['ticket_number'], e['date']) for e in members} == {(ticket, members[0]['date'])}
+            # Durées additionnées, début de la première entrée, descriptions dans l'ordre
+            assert worklog['timeSpentSeconds'] == sum(e['duration'] for e in members) * 60
+            first = min(members, key=lambda e: e['time'])
+            assert worklog['started'] == f"{first['date']}T{first['time']}:00.000+0100"
+            ordered = sorted(members, key=lambda e: e['time'])
+            assert worklog['comment'] == "\n".join([first['ticket_title']] + [e['description'] for e in ordered])
+            # L'identifiant du worklog est associé à chaque entrée du groupe
+            assert {worklog_of[e['id']] for e in members} == {worklog['id']}
+
+
+def started(entry):
+    return f"{entry['date']}T{entry['time']}:00.000+0100"
+
+
+def logtracker(*entry_ids):
+    return [{'key': OUTBOX_PROPERTY, 'value': {'entry_ids': list(entry_ids)}}]
+
+
+def test_reconcile_matches_without_duplicates(db):
+    by_property, by_key, other_author, twin, twin_copy, new = add_entries(db, 6, tickets=1)
+    store = WorklogStore()
+    # Durée modifiée dans Jira depuis l'envoi : la propriété suffit
+    from_app = store.add('PROJ-0', started(by_property), 3600, properties=logtracker(by_property['id']))
+    # Saisi à la main, ou par une version sans propriété
+    manual = store.add('PROJ-0', started(by_key), 1800)
+    store.add('PROJ-0', started(other_author), 1800, author={'accountId': 'collegue'})
+    # Deux entrées identiques, un seul worklog : il ne sert qu'une fois
+    twin_copy.update(date=twin['date'], time=twin['time'])
+    db.cursor.execute("UPDATE entries SET time = ? WHERE id = ?", (twin['time'], twin_copy['id']))
+    db.conn.commit()
+    single = store.add('PROJ-0', started(twin), 1800)
+
+    entries = [by_property, by_key, other_author, twin, twin_copy, new]
+    with StubJira(store.routes()) as jira:
+        client = make_client(jira)
+        synced_ids, errors = WorklogSyncEngine(client, db).run(entries, reconcile=True)
+        client.close()
+
+    assert errors == []
+    assert sorted(synced_ids) == sorted(entry['id'] for entry in entries)
+    db.cursor.execute("SELECT entry_id, worklog_id FROM sync_outbox")
+    worklog_of = dict(db.cursor.fetchall())
+    assert worklog_of[by_property['id']] == from_app['id']
+    assert worklog_of[by_key['id']] == manual['id']
+    assert worklog_of[twin['id']] == single['id']
+
+    # Seules les entrées sans worklog à leur nom sont envoyées
+    posted = [worklog for worklog in store.worklogs['PROJ-0'] if worklog['properties']][1:]
+    assert sorted(id for worklog in posted for id in worklog['properties'][0]['value']['entry_ids']) == \
+        sorted([other_author['id'], twin_copy['id'], new['id']])
+    assert len(set(worklog_of.values())) == 6
+
+
+def test_reconcile_coalesced_group(db):
+    entries = add_entries(db, 3, tickets=1)
+    store = WorklogStore()
+    # Worklog regroupant les trois entrées, envoyé sans propriété
+    group = store.add('PROJ-0', started(entries[0]), 3 * 1800)
+    with StubJira(store.routes()) as jira:
+        client = make_client(jira)
+        engine = WorklogSyncEngine(client, db, coalesce=True)
+        synced_ids, errors = engine.run(entries, reconcile=True)
+        client.close()
+
+    assert (sorted(synced_ids), errors) == ([entry['id'] for entry in entries], [])
+    assert len(store.worklogs['PROJ-0']) == 1
+    db.cursor.execute("SELECT DISTINCT worklog_id FROM sync_outbox")
+    assert [row[0] for row in db.cursor.fetchall()] == [group['id']]
+
+
+def test_reconcile_2000_entries_one_request_per_ticket(db):
+    # Base restaurée : 2 000 entrées sur 300 tickets, déjà toutes dans Jira
+    entries = add_entries(db, 2000, tickets=300, per_day=40)
+    store = WorklogStore()
+    for i, entry in enumerate(entries):
+        properties = logtracker(entry['id']) if i % 2 else None
+        store.add(entry['ticket_number'], started(entry), 1800, properties=properties)
+
+    with StubJira(store.routes()) as jira:
+        client = make_client(jira)
+        synced_ids, errors = WorklogSyncEngine(client, db).run(entries, reconcile=True)
+        client.close()
+        reads = jira.count(WORKLOG_ROUTE)
+        myself = jira.count(MYSELF_ROUTE)
+
+    assert errors == []
+    assert len(synced_ids) == 2000
+    assert outbox_states(db) == {'done': 2000}
+    # Une lecture des worklogs par ticket, l'utilisateur connecté une fois, aucun envoi
+    assert reads == 300
+    assert myself == 1
+    assert sum(len(worklogs) for worklogs in store.worklogs.values()) == 2000